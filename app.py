@@ -19,6 +19,7 @@ from flask_cors import CORS
 
 from scripts.practice_app.data_service import DataService
 from scripts.practice_app.sql_service import SQLService
+from scripts.practice_app.telemetry import QueryTelemetry
 
 app = Flask(__name__)
 CORS(app)
@@ -58,6 +59,7 @@ def get_week_config():
         print(__doc__)
         print("Environment Variables:")
         print("  SQL_WEEK=N    Set week number (default: 4)")
+        print("  SQL_SNAPSHOT_DIR=DIR  Serve tables from a Parquet snapshot")
         print("\nThe app will automatically detect the dataset from exercise metadata.")
         sys.exit(0)
 
@@ -86,9 +88,30 @@ week = get_week_config()
 print(f"🎯 Loading exercises for Week {week}")
 
 data_service = DataService(week=week)
+
+# Query telemetry: one event per execution, written asynchronously to Parquet
+# Disable with SQL_TELEMETRY=0; change location with SQL_TELEMETRY_DIR
+telemetry = None
+if os.environ.get("SQL_TELEMETRY", "1") != "0":
+    telemetry = QueryTelemetry(
+        os.environ.get("SQL_TELEMETRY_DIR", os.path.join(os.getcwd(), "telemetry"))
+    )
+
+# Parquet snapshot to serve tables from (see table_snapshots.py export)
+snapshot_dir = os.environ.get("SQL_SNAPSHOT_DIR")
+
 try:
-    sql_service = SQLService(data_service.get_database_path())
+    sql_service = SQLService(
+        data_service.get_database_path(),
+        telemetry=telemetry,
+        read_only=data_service.using_student_database,
+        snapshot_dir=snapshot_dir,
+    )
     print(f"📊 Connected to database: {data_service.get_current_dataset()}")
+    if snapshot_dir:
+        print(f"🗂️  Serving tables from the Parquet snapshot in {snapshot_dir}")
+    elif data_service.using_student_database:
+        print("📦 Serving the slim read-only student database")
 except Exception as e:
     print(f"❌ Error initializing SQL service: {e}")
     print("")
@@ -202,7 +225,30 @@ def execute_query():
             return jsonify({"error": "No query provided"}), 400
 
         # Execute the query
-        result = sql_service.execute_query(query)
+        result = sql_service.execute_query(query, exercise_id=data.get("exercise_id"))
+        return jsonify(result)
+
+    except Exception as e:
+        return jsonify({"error": f"Server error: {str(e)}"}), 500
+
+
+@app.route("/api/profile", methods=["POST"])
+def profile_query():
+    """Execute a SQL query and return its results with the query profile."""
+    if not sql_service:
+        return jsonify({"error": "SQL service not available"}), 500
+
+    try:
+        data = request.get_json()
+        query = data.get("query", "")
+
+        if not query:
+            return jsonify({"error": "No query provided"}), 400
+
+        # Execute the query with DuckDB profiling enabled
+        result = sql_service.execute_query(
+            query, profile=True, exercise_id=data.get("exercise_id")
+        )
         return jsonify(result)
 
     except Exception as e:
@@ -247,8 +293,11 @@ def score_query():
             ), 400
 
         # Execute both queries
-        user_result = sql_service.execute_query(user_query)
-        solution_result = sql_service.execute_query(solution_query)
+        exercise_id = data.get("exercise_id")
+        user_result = sql_service.execute_query(user_query, exercise_id=exercise_id)
+        solution_result = sql_service.execute_query(
+            solution_query, exercise_id=exercise_id, source="solution"
+        )
 
         # Calculate score if both queries succeeded
         if user_result.get("success") and solution_result.get("success"):
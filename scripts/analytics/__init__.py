@@ -0,0 +1,3 @@
+"""
+Workload analytics package for SQL study group.
+"""
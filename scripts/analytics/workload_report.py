@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Workload Analytics Report
+
+Reads the practice app's query telemetry log and groups executions by query
+fingerprint (literals stripped, identifiers normalized) to show the heaviest
+query shapes per exercise:
+1. Latency percentiles (p50/p95/p99) and total time
+2. Execution frequency and error rate
+3. Tables each query shape reads
+
+Usage:
+    python -m scripts.analytics.workload_report --telemetry-dir telemetry --output workload_report.md
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+from typing import Any, Dict, List, Optional
+
+import duckdb
+
+from scripts.core.query_fingerprint import extract_tables
+
+WORKLOAD_QUERY = """
+SELECT
+    exercise_id,
+    fingerprint,
+    any_value(normalized_query) AS normalized_query,
+    count(*) AS executions,
+    sum(CASE WHEN success THEN 0 ELSE 1 END) AS errors,
+    avg(CASE WHEN success THEN 0.0 ELSE 1.0 END) AS error_rate,
+    quantile_cont(latency_ms, 0.50) AS p50_ms,
+    quantile_cont(latency_ms, 0.95) AS p95_ms,
+    quantile_cont(latency_ms, 0.99) AS p99_ms,
+    max(latency_ms) AS max_ms,
+    sum(latency_ms) AS total_ms,
+    avg(row_count) AS avg_rows,
+    list_distinct(list(error_class) FILTER (WHERE error_class IS NOT NULL)) AS error_classes
+FROM read_parquet(?, union_by_name = true)
+WHERE (? IS NULL OR source = ?)
+GROUP BY exercise_id, fingerprint
+ORDER BY exercise_id NULLS LAST, total_ms DESC
+"""
+
+
+def load_workload(
+    telemetry_dir: str, source: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Aggregate telemetry events by exercise and query fingerprint.
+
+    Args:
+        telemetry_dir: Directory containing the telemetry Parquet files
+        source: Only include events from this source ("student", "solution", ...)
+
+    Returns:
+        List of query shape statistics, heaviest (by total time) first per exercise
+    """
+    files = sorted(glob.glob(os.path.join(telemetry_dir, "*.parquet")))
+    if not files:
+        return []
+
+    with duckdb.connect() as conn:
+        cursor = conn.execute(WORKLOAD_QUERY, [files, source, source])
+        columns = [desc[0] for desc in cursor.description]
+        shapes = [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    for shape in shapes:
+        shape["tables"] = extract_tables(shape["normalized_query"])
+
+    return shapes
+
+
+def group_by_exercise(
+    shapes: List[Dict[str, Any]], top: int = 5
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Keep the heaviest query shapes of each exercise.
+
+    Args:
+        shapes: Statistics returned by load_workload
+        top: Number of query shapes to keep per exercise
+
+    Returns:
+        Mapping of exercise label to its totals and heaviest shapes
+    """
+    report = {}
+    for shape in shapes:
+        exercise_id = shape["exercise_id"]
+        label = f"Exercise {exercise_id}" if exercise_id is not None else "Unassigned"
+        entry = report.setdefault(
+            label,
+            {
+                "executions": 0,
+                "errors": 0,
+                "total_ms": 0.0,
+                "shapes": 0,
+                "heaviest": [],
+            },
+        )
+        entry["executions"] += shape["executions"]
+        entry["errors"] += shape["errors"]
+        entry["total_ms"] += shape["total_ms"] or 0.0
+        entry["shapes"] += 1
+        if len(entry["heaviest"]) < top:
+            entry["heaviest"].append(shape)
+
+    return report
+
+
+def summarize_tables(shapes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Summarize load per table across all query shapes.
+
+    Args:
+        shapes: Statistics returned by load_workload
+
+    Returns:
+        Tables ordered by the total query time spent in shapes that read them
+    """
+    tables = {}
+    fingerprints = {}
+    for shape in shapes:
+        for table in shape["tables"]:
+            entry = tables.setdefault(
+                table, {"table": table, "executions": 0, "total_ms": 0.0, "shapes": 0}
+            )
+            entry["executions"] += shape["executions"]
+            entry["total_ms"] += shape["total_ms"] or 0.0
+            # A shape run in several exercises is still one shape
+            fingerprints.setdefault(table, set()).add(shape["fingerprint"])
+            entry["shapes"] = len(fingerprints[table])
+
+    return sorted(tables.values(), key=lambda t: t["total_ms"], reverse=True)
+
+
+def generate_markdown_report(
+    report: Dict[str, Dict[str, Any]], tables: List[Dict[str, Any]]
+) -> str:
+    """Render the workload report as markdown"""
+    lines = ["# Query Workload Report", ""]
+
+    lines.extend(["## Table Load", ""])
+    lines.append("| Table | Query Shapes | Executions | Total Time (ms) |")
+    lines.append("| --- | --- | --- | --- |")
+    for table in tables:
+        lines.append(
+            f"| {table['table']} | {table['shapes']} | {table['executions']} "
+            f"| {table['total_ms']:.1f} |"
+        )
+    lines.append("")
+
+    for label, entry in report.items():
+        error_rate = entry["errors"] / entry["executions"] if entry["executions"] else 0
+        lines.extend(
+            [
+                f"## {label}",
+                "",
+                f"**Executions:** {entry['executions']} | "
+                f"**Query shapes:** {entry['shapes']} | "
+                f"**Error rate:** {error_rate:.1%} | "
+                f"**Total time:** {entry['total_ms']:.1f} ms",
+                "",
+                "| Fingerprint | Runs | Error Rate | p50 (ms) | p95 (ms) | p99 (ms) "
+                "| Total (ms) | Tables |",
+                "| --- | --- | --- | --- | --- | --- | --- | --- |",
+            ]
+        )
+        for shape in entry["heaviest"]:
+            lines.append(
+                f"| `{shape['fingerprint']}` | {shape['executions']} "
+                f"| {shape['error_rate']:.0%} | {shape['p50_ms']:.1f} "
+                f"| {shape['p95_ms']:.1f} | {shape['p99_ms']:.1f} "
+                f"| {shape['total_ms']:.1f} | {', '.join(shape['tables']) or '-'} |"
+            )
+        lines.append("")
+
+        for shape in entry["heaviest"]:
+            lines.append(f"**`{shape['fingerprint']}`**")
+            if shape["error_classes"]:
+                lines.append(f"Errors: {', '.join(shape['error_classes'])}")
+            lines.extend(["```sql", shape["normalized_query"], "```", ""])
+
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Report the heaviest query shapes per exercise from telemetry"
+    )
+    parser.add_argument(
+        "--telemetry-dir",
+        default="telemetry",
+        help="Directory containing telemetry Parquet files (default: telemetry)",
+    )
+    parser.add_argument(
+        "--output", help="Output file path (.md or .json); prints to stdout if omitted"
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=5,
+        help="Number of query shapes to show per exercise (default: 5)",
+    )
+    parser.add_argument(
+        "--source",
+        help="Only include queries from this source (e.g. student, solution)",
+    )
+
+    args = parser.parse_args()
+
+    shapes = load_workload(args.telemetry_dir, args.source)
+    if not shapes:
+        print(f"❌ No telemetry events found in {args.telemetry_dir}")
+        sys.exit(1)
+
+    report = group_by_exercise(shapes, args.top)
+    tables = summarize_tables(shapes)
+
+    if args.output and args.output.endswith(".json"):
+        with open(args.output, "w") as f:
+            json.dump({"exercises": report, "tables": tables}, f, indent=2, default=str)
+        print(f"✅ Workload report saved to {args.output}")
+        return
+
+    markdown = generate_markdown_report(report, tables)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(markdown)
+        print(f"✅ Workload report saved to {args.output}")
+    else:
+        print(markdown)
+
+    print(
+        f"📊 {sum(s['executions'] for s in shapes)} executions, "
+        f"{len({s['fingerprint'] for s in shapes})} query shapes, "
+        f"{len(report)} exercises"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,629 @@
+"""
+DuckDB-backed dataset profiling for DatasetExplorer.
+
+Computes the same per-column metrics as the pandas analysis in
+``explore_dataset.py`` (null and distinct counts, numeric statistics,
+top values, sample values, duplicate rows) as SQL aggregates running directly
+over an Arrow table, Parquet files or a DuckDB table. Each metric is a
+column-at-a-time scan or hash aggregate, so DuckDB can stream the data and
+spill to disk instead of materializing the dataset in memory.
+
+In approximate mode the expensive exact metrics are replaced by sketches,
+each reported with an error bound:
+- distinct counts: HyperLogLog over 2^HLL_PRECISION registers
+- medians: quantiles of a reservoir sample of RESERVOIR_SIZE values
+- top values: space-saving candidates (approx_top_k) recounted exactly
+- duplicate rows: distinct 64-bit row hashes instead of full-row grouping
+"""
+
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+import duckdb
+
+# View name every source is exposed under
+SOURCE_VIEW = "dataset"
+
+# pandas dtype names for DuckDB types, matching what Arrow -> pandas produces
+_INTEGER_DTYPES = {
+    "TINYINT": "int8",
+    "SMALLINT": "int16",
+    "INTEGER": "int32",
+    "BIGINT": "int64",
+    "UTINYINT": "uint8",
+    "USMALLINT": "uint16",
+    "UINTEGER": "uint32",
+    "UBIGINT": "uint64",
+}
+_FLOAT_DTYPES = {"FLOAT": "float32", "DOUBLE": "float64"}
+_DTYPE_WIDTHS = {
+    "int8": 1,
+    "int16": 2,
+    "int32": 4,
+    "int64": 8,
+    "uint8": 1,
+    "uint16": 2,
+    "uint32": 4,
+    "uint64": 8,
+    "float32": 4,
+    "float64": 8,
+    "bool": 1,
+}
+
+# pandas memory_usage(deep=True) accounting: index size per Series, pointer
+# per object slot and CPython str header per string value
+_INDEX_BYTES = 128
+_POINTER_BYTES = 8
+_STR_OVERHEAD_BYTES = 49
+
+# Approximate mode parameters
+HLL_PRECISION = 14
+RESERVOIR_SIZE = 8192
+# approx_top_k monitors this many counters per requested value
+TOP_K_CAPACITY_RATIO = 3
+# Confidence level of the reported error bounds
+CONFIDENCE = 0.95
+
+# Output aliases that cannot clash with a dataset column; a column named like
+# a plain alias would win its GROUP BY / ORDER BY binding
+_VALUE = "__profile_value"
+_COUNT = "__profile_count"
+_HASH = "__profile_hash"
+_Z_95 = 1.96
+
+
+def quote_identifier(name: str) -> str:
+    """Quote a column or table name for use in DuckDB SQL."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _quote_literal(value: str) -> str:
+    """Quote a string literal for use in DuckDB SQL."""
+    return "'" + value.replace("'", "''") + "'"
+
+
+class DuckDBProfiler:
+    """
+    Profile a dataset with DuckDB SQL aggregates instead of pandas.
+
+    Use one of the ``from_*`` constructors to expose a source as the
+    ``dataset`` view of a private in-memory DuckDB connection.
+    """
+
+    def __init__(
+        self,
+        conn: duckdb.DuckDBPyConnection,
+        max_samples: int = 5,
+        top_values: int = 10,
+        approximate: bool = False,
+    ):
+        """
+        Initialize the profiler on a connection that already has a dataset view.
+
+        Args:
+            conn: DuckDB connection exposing the data as the ``dataset`` view
+            max_samples: Number of sample values reported per column
+            top_values: Number of most frequent values reported for categoricals
+            approximate: Use sketches instead of exact distinct counts, medians,
+                top values and duplicate detection
+        """
+        self.conn = conn
+        self.max_samples = max_samples
+        self.top_values = top_values
+        self.approximate = approximate
+        self.duplicate_error_bound = None
+        self._row_count = None
+        self._columns = None
+        self._memory_bytes = {}
+
+    @staticmethod
+    def _connect(
+        memory_limit: Optional[str] = None, temp_directory: Optional[str] = None
+    ) -> duckdb.DuckDBPyConnection:
+        """Open an in-memory connection, optionally bounding memory use."""
+        conn = duckdb.connect()
+        if memory_limit:
+            conn.execute(f"SET memory_limit = {_quote_literal(memory_limit)}")
+        if temp_directory:
+            conn.execute(f"SET temp_directory = {_quote_literal(temp_directory)}")
+        return conn
+
+    @classmethod
+    def from_arrow(cls, table, memory_limit: Optional[str] = None, **kwargs):
+        """
+        Profile an Arrow table (e.g. a memory-mapped HuggingFace dataset).
+
+        The table is scanned in place; no copy is made. A pandas DataFrame is
+        accepted too and scanned through DuckDB's pandas integration.
+        """
+        conn = cls._connect(memory_limit)
+        conn.register(SOURCE_VIEW, table)
+        return cls(conn, **kwargs)
+
+    @classmethod
+    def from_parquet(cls, path: str, memory_limit: Optional[str] = None, **kwargs):
+        """Profile one or more Parquet files (``path`` may be a glob)."""
+        conn = cls._connect(memory_limit)
+        conn.execute(
+            f"CREATE VIEW {SOURCE_VIEW} AS "
+            f"SELECT * FROM read_parquet({_quote_literal(path)})"
+        )
+        return cls(conn, **kwargs)
+
+    @classmethod
+    def from_table(
+        cls,
+        database_path: str,
+        table_name: str,
+        memory_limit: Optional[str] = None,
+        **kwargs,
+    ):
+        """Profile a table of an existing DuckDB database, attached read-only."""
+        conn = cls._connect(memory_limit)
+        conn.execute(f"ATTACH {_quote_literal(database_path)} AS source (READ_ONLY)")
+        conn.execute(
+            f"CREATE VIEW {SOURCE_VIEW} AS "
+            f"SELECT * FROM source.{quote_identifier(table_name)}"
+        )
+        return cls(conn, **kwargs)
+
+    def close(self):
+        """Close the profiler's connection."""
+        self.conn.close()
+
+    @property
+    def row_count(self) -> int:
+        """Number of rows in the dataset."""
+        if self._row_count is None:
+            self._row_count = self.conn.execute(
+                f"SELECT count(*) FROM {SOURCE_VIEW}"
+            ).fetchone()[0]
+        return self._row_count
+
+    @property
+    def columns(self) -> List[Tuple[str, str]]:
+        """(name, DuckDB type) of each column, in table order."""
+        if self._columns is None:
+            rows = self.conn.execute(f"DESCRIBE {SOURCE_VIEW}").fetchall()
+            self._columns = [(row[0], row[1]) for row in rows]
+        return self._columns
+
+    def analyze_columns(self, verbose: bool = True) -> List[Dict[str, Any]]:
+        """
+        Analyze every column.
+
+        Args:
+            verbose: Print a progress line per column
+
+        Returns:
+            Column analyses in the format of DatasetExplorer._analyze_columns
+        """
+        analyses = []
+        for name, sql_type in self.columns:
+            if verbose:
+                print(f"  📊 Analyzing column: {name}")
+            analyses.append(self.analyze_column(name, sql_type))
+        return analyses
+
+    def analyze_column(self, name: str, sql_type: str) -> Dict[str, Any]:
+        """
+        Analyze a single column with one aggregate scan plus targeted follow-ups.
+
+        Args:
+            name: Column name
+            sql_type: DuckDB type of the column
+
+        Returns:
+            Column analysis dictionary
+        """
+        column = quote_identifier(name)
+        total = self.row_count
+        kind = _type_kind(sql_type)
+
+        aggregates = [
+            f"count({column})",
+            # Distinct counts come from a HyperLogLog sketch in approximate mode
+            "0" if self.approximate else f"count(DISTINCT {column})",
+            self._object_bytes_expression(column) if kind == "object" else "0",
+        ]
+        if kind in ("integer", "float", "boolean"):
+            value = f"CAST({column} AS DOUBLE)"
+            # Approximate medians come from a separate reservoir-sampled scan
+            median = "NULL" if self.approximate else f"median({value})"
+            aggregates.extend(
+                [
+                    f"avg({value})",
+                    f"stddev_samp({value})",
+                    f"min({value})",
+                    f"max({value})",
+                    median,
+                    f"bool_or({value} < 0)",
+                    f"bool_or({value} = 0)",
+                    f"count(*) FILTER (WHERE {value} NOT IN (0, 1))",
+                ]
+            )
+
+        row = self.conn.execute(
+            f"SELECT {', '.join(aggregates)} FROM {SOURCE_VIEW}"
+        ).fetchone()
+        non_null, unique_count, data_bytes = row[0], row[1], row[2] or 0
+        null_count = total - non_null
+
+        error_bounds = {}
+        if self.approximate:
+            unique_count, error_bounds["unique_count"] = self._approx_distinct(
+                column, non_null
+            )
+
+        data_type = _pandas_dtype(sql_type, kind, null_count > 0)
+        is_numeric_dtype = data_type in _DTYPE_WIDTHS
+        if kind != "object":
+            # Fixed-width dtypes; nullable booleans become object pointers
+            data_bytes = _DTYPE_WIDTHS.get(data_type, _POINTER_BYTES) * total
+        self._memory_bytes[name] = data_bytes + _INDEX_BYTES
+
+        numeric = None
+        if kind in ("integer", "float", "boolean"):
+            mean, std, min_value, max_value, median = row[3:8]
+            numeric = {
+                "mean": mean,
+                "std": std,
+                "min": min_value,
+                "max": max_value,
+                "median": median,
+                "has_negatives": bool(row[8]),
+                "has_zeros": bool(row[9]),
+                "binary_only": row[10] == 0,
+            }
+            if self.approximate and is_numeric_dtype:
+                numeric["median"] = self._sampled_median(column)
+                error_bounds["median"] = _reservoir_error_bound(non_null)
+
+        pandas_type = self._classify(
+            data_type, kind, numeric, non_null, unique_count, total
+        )
+
+        statistics = {
+            "count": non_null,
+            "memory_usage_mb": round((data_bytes + _INDEX_BYTES) / (1024 * 1024), 3),
+        }
+        if is_numeric_dtype and numeric is not None:
+            statistics.update(
+                {
+                    key: (float(numeric[key]) if numeric[key] is not None else None)
+                    for key in ("mean", "std", "min", "max", "median")
+                }
+            )
+
+        analysis = {
+            "name": name,
+            "data_type": data_type,
+            "pandas_type": pandas_type,
+            "null_count": null_count,
+            "null_percentage": round((null_count / total) * 100, 2),
+            "unique_count": unique_count,
+            "unique_percentage": round((unique_count / total) * 100, 2),
+            "sample_values": self._sample_values(
+                column, pandas_type, non_null, unique_count
+            ),
+            "statistics": statistics,
+        }
+
+        if pandas_type in ("numeric", "datetime"):
+            if is_numeric_dtype and numeric is not None:
+                analysis.update(
+                    {
+                        "is_integer": data_type.startswith(("int", "uint")),
+                        "has_negatives": numeric["has_negatives"],
+                        "has_zeros": numeric["has_zeros"],
+                        "potential_id_field": self._is_potential_id_field(
+                            column, data_type, numeric, unique_count, total
+                        ),
+                    }
+                )
+            else:
+                analysis["potential_id_field"] = False
+        elif pandas_type == "categorical":
+            if self.approximate:
+                top_values = self._approx_top_values(column, self.top_values)
+                error_bounds["top_values"] = {
+                    "method": "space_saving",
+                    "counts": "exact",
+                    "guaranteed_frequency": round(
+                        non_null / (TOP_K_CAPACITY_RATIO * self.top_values)
+                    ),
+                }
+            else:
+                top_values = self._top_values(column, self.top_values)
+            analysis.update(
+                {
+                    "top_values": dict(top_values),
+                    "category_count": unique_count,
+                    "potential_foreign_key": (
+                        0.001 < unique_count / total < 0.5 and unique_count >= 3
+                    ),
+                }
+            )
+
+        if error_bounds:
+            analysis["error_bounds"] = error_bounds
+
+        return analysis
+
+    def count_duplicates(self) -> int:
+        """
+        Count rows that are exact duplicates of an earlier row.
+
+        In approximate mode rows are reduced to one 64-bit hash each and the
+        distinct hashes are counted, which needs a fraction of the memory of
+        grouping by every column. Hash collisions can only hide duplicates'
+        originals, so the estimate may overcount by the expected number of
+        collisions recorded in duplicate_error_bound.
+        """
+        columns = ", ".join(quote_identifier(name) for name, _ in self.columns)
+        if self.approximate:
+            total, distinct_hashes = self.conn.execute(
+                f"SELECT count(*), count(DISTINCT hash({columns})) FROM {SOURCE_VIEW}"
+            ).fetchone()
+            self.duplicate_error_bound = {
+                "method": "row_hash",
+                "hash_bits": 64,
+                "expected_collisions": total * (total - 1) / 2**65,
+            }
+            return int(total - distinct_hashes)
+
+        result = self.conn.execute(
+            f"SELECT coalesce(sum(n) - count(*), 0) FROM "
+            f"(SELECT count(*) AS n FROM {SOURCE_VIEW} GROUP BY {columns})"
+        ).fetchone()
+        return int(result[0])
+
+    def estimate_memory_mb(self) -> float:
+        """
+        Estimate the dataset's pandas memory footprint from analyzed columns.
+
+        Mirrors ``DataFrame.memory_usage(deep=True).sum()``; call after
+        analyze_columns.
+        """
+        data_bytes = sum(
+            column_bytes - _INDEX_BYTES for column_bytes in self._memory_bytes.values()
+        )
+        return (data_bytes + _INDEX_BYTES) / (1024 * 1024)
+
+    @staticmethod
+    def _object_bytes_expression(column: str) -> str:
+        """SQL estimating the pandas size of an object column in bytes."""
+        # A pointer per row plus a Python object per non-null value
+        return (
+            f"{_POINTER_BYTES} * count(*) "
+            f"+ sum({_STR_OVERHEAD_BYTES} + strlen(CAST({column} AS VARCHAR)))"
+        )
+
+    @staticmethod
+    def _classify(
+        data_type: str,
+        kind: str,
+        numeric: Optional[Dict[str, Any]],
+        non_null: int,
+        unique_count: int,
+        total: int,
+    ) -> str:
+        """Mirror DatasetExplorer._classify_pandas_type from aggregates."""
+        if kind == "boolean" or non_null == 0:
+            return "boolean"
+        if numeric is not None and numeric["binary_only"]:
+            return "boolean"
+        if data_type.startswith("datetime64"):
+            return "datetime"
+        if data_type in _DTYPE_WIDTHS:
+            return "numeric"
+        if data_type == "object":
+            return "categorical" if unique_count / total < 0.1 else "text"
+        return "other"
+
+    def _sample_values(
+        self, column: str, pandas_type: str, non_null: int, unique_count: int
+    ) -> List[str]:
+        """Mirror DatasetExplorer._get_sample_values with deterministic SQL."""
+        if non_null == 0:
+            return ["(all null values)"]
+
+        if unique_count <= self.max_samples:
+            samples = self.conn.execute(
+                f"SELECT DISTINCT {column} AS {_VALUE} FROM {SOURCE_VIEW} "
+                f"WHERE {column} IS NOT NULL ORDER BY 1"
+            ).fetchall()
+            samples = [row[0] for row in samples]
+        elif pandas_type == "categorical":
+            top_values = (
+                self._approx_top_values if self.approximate else self._top_values
+            )
+            samples = [value for value, _ in top_values(column, self.max_samples)]
+        else:
+            # Pseudo-random but reproducible: distinct values ordered by hash,
+            # drawn from a reservoir sample instead of the full column when
+            # approximating
+            source = SOURCE_VIEW
+            if self.approximate:
+                source = (
+                    f"(SELECT {column} FROM "
+                    f"(SELECT {column} FROM {SOURCE_VIEW} WHERE {column} IS NOT NULL) "
+                    f"USING SAMPLE reservoir({RESERVOIR_SIZE} ROWS) REPEATABLE (42))"
+                )
+            samples = self.conn.execute(
+                f"SELECT {column} AS {_VALUE} FROM {source} "
+                f"WHERE {column} IS NOT NULL GROUP BY 1 "
+                f"ORDER BY hash({_VALUE}), {_VALUE} LIMIT {self.max_samples}"
+            ).fetchall()
+            samples = [row[0] for row in samples]
+
+        return [
+            str(val)[:50] + "..." if len(str(val)) > 50 else str(val) for val in samples
+        ]
+
+    def _approx_distinct(
+        self, column: str, non_null: int
+    ) -> Tuple[int, Dict[str, Any]]:
+        """
+        Estimate a column's distinct count with HyperLogLog.
+
+        Each non-null value is hashed; the top HLL_PRECISION bits pick a
+        register and the register keeps the maximum position of the first set
+        bit in the remaining bits. Aggregating needs one small hash table of
+        at most 2^HLL_PRECISION groups regardless of the column's cardinality.
+
+        Returns:
+            Tuple of (estimate, error bound dictionary)
+        """
+        suffix_bits = 64 - HLL_PRECISION
+        registers = self.conn.execute(
+            f"SELECT {_HASH} >> {suffix_bits} AS register, "
+            f"max(CASE WHEN w = 0 THEN {suffix_bits + 1} "
+            f"ELSE {suffix_bits} - CAST(floor(log2(w)) AS INTEGER) END) AS rank "
+            f"FROM (SELECT hash({column}) AS {_HASH}, "
+            f"{_HASH} & ((1::UBIGINT << {suffix_bits}) - 1) AS w "
+            f"FROM {SOURCE_VIEW} WHERE {column} IS NOT NULL) "
+            f"GROUP BY register"
+        ).fetchall()
+
+        estimate = min(_hll_estimate(registers, HLL_PRECISION), non_null)
+        relative_error = 1.04 / math.sqrt(2**HLL_PRECISION)
+        margin = _Z_95 * relative_error * estimate
+        return estimate, {
+            "method": "hyperloglog",
+            "registers": 2**HLL_PRECISION,
+            "relative_standard_error": round(relative_error, 4),
+            "confidence_interval": [
+                max(0, math.floor(estimate - margin)),
+                min(non_null, math.ceil(estimate + margin)),
+            ],
+            "confidence": CONFIDENCE,
+        }
+
+    def _sampled_median(self, column: str) -> Optional[float]:
+        """Median of a uniform reservoir sample of the column's non-null values."""
+        return self.conn.execute(
+            f"SELECT median(CAST({column} AS DOUBLE)) FROM "
+            f"(SELECT {column} FROM {SOURCE_VIEW} WHERE {column} IS NOT NULL) "
+            f"USING SAMPLE reservoir({RESERVOIR_SIZE} ROWS) REPEATABLE (42)"
+        ).fetchone()[0]
+
+    def _approx_top_values(self, column: str, limit: int) -> List[Tuple[Any, int]]:
+        """
+        Most frequent values from a space-saving sketch, with exact counts.
+
+        approx_top_k picks the candidates in one streaming pass; a second
+        filtered pass counts just those candidates exactly.
+        """
+        return self.conn.execute(
+            f"WITH candidates AS ("
+            f"SELECT unnest(approx_top_k({column}, {limit})) AS {_VALUE} "
+            f"FROM {SOURCE_VIEW}) "
+            f"SELECT {column} AS {_VALUE}, count(*) AS {_COUNT} FROM {SOURCE_VIEW} "
+            f"WHERE {column} IN (SELECT {_VALUE} FROM candidates) "
+            f"GROUP BY 1 ORDER BY {_COUNT} DESC, {_VALUE} LIMIT {limit}"
+        ).fetchall()
+
+    def _top_values(self, column: str, limit: int) -> List[Tuple[Any, int]]:
+        """Most frequent non-null values with their counts."""
+        return self.conn.execute(
+            f"SELECT {column} AS {_VALUE}, count(*) AS {_COUNT} FROM {SOURCE_VIEW} "
+            f"WHERE {column} IS NOT NULL GROUP BY 1 "
+            f"ORDER BY {_COUNT} DESC, {_VALUE} LIMIT {limit}"
+        ).fetchall()
+
+    def _is_potential_id_field(
+        self,
+        column: str,
+        data_type: str,
+        numeric: Dict[str, Any],
+        unique_count: int,
+        total: int,
+    ) -> bool:
+        """Mirror DatasetExplorer._is_potential_id_field."""
+        unique_ratio = unique_count / total
+        has_no_negatives = numeric["min"] is not None and numeric["min"] >= 0
+        if not (unique_ratio > 0.9 and has_no_negatives):
+            return False
+        if unique_ratio > 0.98:
+            return True
+        if not data_type.startswith(("int", "uint")):
+            return False
+
+        # Share of consecutive sorted values that differ by exactly one
+        sequential_share = self.conn.execute(
+            f"SELECT avg(CASE WHEN diff = 1 THEN 1.0 ELSE 0.0 END) FROM "
+            f"(SELECT {column} - lag({column}) OVER (ORDER BY {column}) AS diff "
+            f"FROM {SOURCE_VIEW} WHERE {column} IS NOT NULL) WHERE diff IS NOT NULL"
+        ).fetchone()[0]
+        return bool(sequential_share is not None and sequential_share > 0.8)
+
+
+def _hll_estimate(registers: List[Tuple[int, int]], precision: int) -> int:
+    """
+    HyperLogLog cardinality estimate from (register, rank) pairs.
+
+    Uses the standard bias-corrected harmonic mean with linear counting for
+    small cardinalities; no large-range correction is needed for 64-bit
+    hashes.
+    """
+    m = 2**precision
+    alpha = 0.7213 / (1 + 1.079 / m)
+    empty_registers = m - len(registers)
+    harmonic_sum = empty_registers + sum(2.0**-rank for _, rank in registers)
+    estimate = alpha * m * m / harmonic_sum
+
+    if estimate <= 2.5 * m and empty_registers > 0:
+        estimate = m * math.log(m / empty_registers)
+
+    return int(round(estimate))
+
+
+def _reservoir_error_bound(non_null: int) -> Dict[str, Any]:
+    """
+    Error bound of a quantile read from a reservoir sample.
+
+    By the Dvoretzky-Kiefer-Wolfowitz inequality the sample quantile's true
+    rank lies within +/- epsilon of the requested rank with the reported
+    confidence. Columns no larger than the reservoir are exact.
+    """
+    sample_size = min(non_null, RESERVOIR_SIZE)
+    if non_null <= RESERVOIR_SIZE:
+        rank_error = 0.0
+    else:
+        rank_error = math.sqrt(math.log(2 / (1 - CONFIDENCE)) / (2 * sample_size))
+    return {
+        "method": "reservoir_sample",
+        "sample_size": sample_size,
+        "rank_error": round(rank_error, 4),
+        "confidence": CONFIDENCE,
+    }
+
+
+def _type_kind(sql_type: str) -> str:
+    """Group a DuckDB type into the kinds the profiler treats differently."""
+    if sql_type in _INTEGER_DTYPES:
+        return "integer"
+    if sql_type in _FLOAT_DTYPES:
+        return "float"
+    if sql_type == "BOOLEAN":
+        return "boolean"
+    if sql_type.startswith("TIMESTAMP"):
+        return "datetime"
+    return "object"
+
+
+def _pandas_dtype(sql_type: str, kind: str, has_nulls: bool) -> str:
+    """pandas dtype name the column would get when converted from Arrow."""
+    if kind == "integer":
+        # Nullable integers become float64 in pandas
+        return "float64" if has_nulls else _INTEGER_DTYPES[sql_type]
+    if kind == "float":
+        return _FLOAT_DTYPES[sql_type]
+    if kind == "boolean":
+        return "object" if has_nulls else "bool"
+    if kind == "datetime":
+        if "TIME ZONE" in sql_type:
+            return "datetime64[ns, UTC]"
+        return "datetime64[ns]"
+    return "object"
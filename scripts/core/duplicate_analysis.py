@@ -0,0 +1,341 @@
+"""
+Hash-based duplicate and near-duplicate detection in DuckDB.
+
+Exact duplicates are found by grouping 64-bit row hashes; only rows whose
+hash repeats are then grouped by their full values, so the count is exact
+while the data is never materialized in pandas and the large group-by only
+sees the duplicate candidates.
+
+Near duplicates are rows whose text matches after normalization (trimmed,
+collapsed whitespace, lower case) or whose normalized text is similar:
+character shingles are summarized as MinHash signatures and candidate pairs
+come from locality-sensitive hashing over signature bands. Pairs whose
+estimated Jaccard similarity reaches the threshold are merged into clusters.
+
+Clusters can be exported with their rows for review.
+"""
+
+import os
+import random
+from typing import Any, Dict, List, Optional
+
+import duckdb
+
+from scripts.core.duckdb_profiler import SOURCE_VIEW, quote_identifier
+
+# Estimated Jaccard similarity at which two rows are near duplicates
+NEAR_DUPLICATE_THRESHOLD = 0.8
+
+# Characters per shingle of normalized row text
+SHINGLE_SIZE = 5
+
+# LSH banding: BANDS * ROWS_PER_BAND MinHash values per signature
+LSH_BANDS = 8
+LSH_ROWS_PER_BAND = 4
+
+# Seed of the XOR masks that derive the MinHash permutations from one
+# shingle hash, so signatures are reproducible across runs
+MINHASH_SEED = 42
+
+# LSH buckets holding more rows than this are skipped (degenerate texts)
+MAX_BUCKET_ROWS = 1000
+
+# Export formats by file extension
+_EXPORT_FORMATS = {".parquet": "PARQUET", ".csv": "CSV", ".json": "JSON"}
+
+
+class DuplicateAnalyzer:
+    """Exact and near-duplicate row analysis over a DuckDB relation."""
+
+    def __init__(
+        self,
+        conn: duckdb.DuckDBPyConnection,
+        relation: str = SOURCE_VIEW,
+        columns: Optional[List[str]] = None,
+    ):
+        """
+        Initialize the analyzer.
+
+        Args:
+            conn: DuckDB connection the relation is visible in
+            relation: Table or view to analyze
+            columns: Columns that identify a row (default: all)
+        """
+        self.conn = conn
+        self.relation = quote_identifier(relation)
+        if columns is None:
+            columns = [
+                row[0] for row in conn.execute(f"DESCRIBE {self.relation}").fetchall()
+            ]
+        self.columns = columns
+        quoted = ", ".join(quote_identifier(name) for name in columns)
+        self._row_hash = f"hash({quoted})"
+        self._group_columns = quoted
+        # Row text trimmed, with collapsed whitespace and in lower case
+        self._normalized_text = "concat_ws(' | ', {})".format(
+            ", ".join(
+                "lower(regexp_replace(trim(CAST("
+                f"{quote_identifier(name)} AS VARCHAR)), '\\s+', ' ', 'g'))"
+                for name in columns
+            )
+        )
+        self.exact_stats = None
+        self.near_stats = None
+
+    def exact_duplicates(self) -> Dict[str, Any]:
+        """
+        Count rows that exactly duplicate an earlier row.
+
+        Returns:
+            dict: duplicate_records, duplicate_clusters and largest_cluster
+        """
+        self.conn.execute(
+            f"""
+            CREATE OR REPLACE TEMP TABLE _dup_exact AS
+            SELECT row_hash, copies
+            FROM (
+                SELECT {self._row_hash} AS row_hash, count(*) AS copies
+                FROM {self.relation}
+                GROUP BY ALL
+            )
+            WHERE copies > 1
+            """
+        )
+
+        # Hash collisions could merge different rows; group the candidate
+        # rows by their values to count exactly
+        records, clusters, largest = self.conn.execute(
+            f"""
+            SELECT coalesce(sum(n) - count(*), 0),
+                   count(*) FILTER (WHERE n > 1),
+                   coalesce(max(n), 0)
+            FROM (
+                SELECT count(*) AS n
+                FROM {self.relation}
+                WHERE {self._row_hash} IN (SELECT row_hash FROM _dup_exact)
+                GROUP BY {self._group_columns}
+            )
+            """
+        ).fetchone()
+
+        self.exact_stats = {
+            "duplicate_records": int(records),
+            "duplicate_clusters": int(clusters),
+            "largest_cluster": int(largest),
+        }
+        return self.exact_stats
+
+    def near_duplicates(
+        self,
+        threshold: float = NEAR_DUPLICATE_THRESHOLD,
+        shingle_size: int = SHINGLE_SIZE,
+        bands: int = LSH_BANDS,
+        rows_per_band: int = LSH_ROWS_PER_BAND,
+    ) -> Dict[str, Any]:
+        """
+        Cluster rows whose normalized text is identical or similar.
+
+        Args:
+            threshold: Minimum estimated Jaccard similarity of two rows' shingles
+            shingle_size: Characters per shingle
+            bands: LSH bands
+            rows_per_band: MinHash values per band
+
+        Returns:
+            dict: Near-duplicate statistics and the parameters used
+        """
+        num_hashes = bands * rows_per_band
+        self._create_normalized_rows()
+        self._create_signatures(shingle_size, num_hashes)
+
+        candidates = self.conn.execute(
+            f"""
+            WITH band_keys AS (
+                SELECT norm_hash, band,
+                       hash(signature[band * {rows_per_band} + 1 :
+                                      (band + 1) * {rows_per_band}]) AS band_key
+                FROM _dup_signatures, range({bands}) AS b(band)
+            ),
+            buckets AS (
+                SELECT band, band_key
+                FROM band_keys
+                GROUP BY ALL
+                HAVING count(*) BETWEEN 2 AND {MAX_BUCKET_ROWS}
+            ),
+            pairs AS (
+                SELECT DISTINCT a.norm_hash AS left_hash, b.norm_hash AS right_hash
+                FROM band_keys a
+                JOIN buckets USING (band, band_key)
+                JOIN band_keys b USING (band, band_key)
+                WHERE a.norm_hash < b.norm_hash
+            )
+            SELECT p.left_hash, p.right_hash
+            FROM pairs p
+            JOIN _dup_signatures l ON l.norm_hash = p.left_hash
+            JOIN _dup_signatures r ON r.norm_hash = p.right_hash
+            WHERE len(list_filter(list_zip(l.signature, r.signature),
+                                  lambda v: v[1] = v[2])) >= {threshold * num_hashes}
+            """
+        ).fetchall()
+
+        roots = self._merge_pairs(candidates)
+        self.conn.execute(
+            "CREATE OR REPLACE TEMP TABLE _dup_near_members "
+            "(norm_hash UBIGINT, root_hash UBIGINT)"
+        )
+        if roots:
+            self.conn.executemany(
+                "INSERT INTO _dup_near_members VALUES (?, ?)", list(roots.items())
+            )
+
+        # Rows sharing a normalized text form a cluster of their own even
+        # when LSH found no similar text
+        self.conn.execute(
+            """
+            CREATE OR REPLACE TEMP TABLE _dup_near AS
+            SELECT norm_hash, cluster_key, copies
+            FROM (
+                SELECT *, sum(copies) OVER (PARTITION BY cluster_key) AS cluster_rows
+                FROM (
+                    SELECT n.norm_hash, n.copies,
+                           coalesce(m.root_hash, n.norm_hash) AS cluster_key
+                    FROM _dup_normalized n
+                    LEFT JOIN _dup_near_members m USING (norm_hash)
+                )
+            )
+            WHERE cluster_rows > 1
+            """
+        )
+        records, cluster_count, largest = self.conn.execute(
+            """
+            SELECT coalesce(sum(n) - count(*), 0), count(*), coalesce(max(n), 0)
+            FROM (SELECT sum(copies) AS n FROM _dup_near GROUP BY cluster_key)
+            """
+        ).fetchone()
+
+        self.near_stats = {
+            "method": "minhash_lsh",
+            "threshold": threshold,
+            "shingle_size": shingle_size,
+            "num_hashes": num_hashes,
+            "bands": bands,
+            "near_duplicate_records": int(records),
+            "near_duplicate_clusters": int(cluster_count),
+            "largest_cluster": int(largest),
+        }
+        return self.near_stats
+
+    def export_clusters(self, output_path: str) -> int:
+        """
+        Write every row of a duplicate cluster for review.
+
+        Rows are tagged with their cluster and its kind ("exact" or "near");
+        a row can belong to one cluster of each kind. The format follows the
+        file extension (.parquet, .csv or .json).
+
+        Args:
+            output_path: Destination file
+
+        Returns:
+            int: Number of rows written
+        """
+        extension = os.path.splitext(output_path)[1].lower()
+        if extension not in _EXPORT_FORMATS:
+            raise ValueError(
+                f"Unsupported export format '{extension}'. "
+                f"Choose from: {', '.join(_EXPORT_FORMATS)}"
+            )
+        if self.exact_stats is None:
+            self.exact_duplicates()
+
+        selects = [
+            f"""
+            SELECT 'exact' AS cluster_kind,
+                   dense_rank() OVER (ORDER BY s._key) AS cluster_id,
+                   s.* EXCLUDE (_key)
+            FROM (SELECT {self._row_hash} AS _key, * FROM {self.relation}) s
+            JOIN _dup_exact d ON d.row_hash = s._key
+            """
+        ]
+        if self.near_stats is not None:
+            selects.append(
+                f"""
+                SELECT 'near' AS cluster_kind,
+                       dense_rank() OVER (ORDER BY d.cluster_key) AS cluster_id,
+                       s.* EXCLUDE (_key)
+                FROM (SELECT hash({self._normalized_text}) AS _key, *
+                      FROM {self.relation}) s
+                JOIN _dup_near d ON d.norm_hash = s._key
+                """
+            )
+
+        self.conn.execute(
+            f"CREATE OR REPLACE TEMP TABLE _dup_export AS {' UNION ALL '.join(selects)}"
+        )
+        try:
+            row_count = self.conn.execute(
+                "SELECT count(*) FROM _dup_export"
+            ).fetchone()[0]
+            escaped_path = output_path.replace("'", "''")
+            self.conn.execute(
+                "COPY (SELECT * FROM _dup_export ORDER BY cluster_kind, cluster_id) "
+                f"TO '{escaped_path}' (FORMAT {_EXPORT_FORMATS[extension]})"
+            )
+        finally:
+            self.conn.execute("DROP TABLE _dup_export")
+        return int(row_count)
+
+    def _create_normalized_rows(self) -> None:
+        """Group rows by the hash of their normalized text."""
+        self.conn.execute(
+            f"""
+            CREATE OR REPLACE TEMP TABLE _dup_normalized AS
+            SELECT hash(text) AS norm_hash, count(*) AS copies, any_value(text) AS text
+            FROM (SELECT {self._normalized_text} AS text FROM {self.relation})
+            GROUP BY ALL
+            """
+        )
+
+    def _create_signatures(self, shingle_size: int, num_hashes: int) -> None:
+        """MinHash signature of the shingles of each distinct normalized text."""
+        # Each shingle is hashed once; XOR with a random mask permutes the
+        # hash space, which is much cheaper than rehashing per permutation
+        rng = random.Random(MINHASH_SEED)
+        minimums = ", ".join(
+            f"min(xor(h, {rng.getrandbits(64)}::UBIGINT))" for _ in range(num_hashes)
+        )
+        self.conn.execute(
+            f"""
+            CREATE OR REPLACE TEMP TABLE _dup_signatures AS
+            SELECT norm_hash, list_value({minimums}) AS signature
+            FROM (
+                SELECT norm_hash, hash(substring(text, i, {shingle_size})) AS h
+                FROM (
+                    SELECT norm_hash, text,
+                           unnest(range(1, greatest(
+                               length(text) - {shingle_size} + 1, 1) + 1)) AS i
+                    FROM _dup_normalized
+                )
+            )
+            GROUP BY norm_hash
+            """
+        )
+
+    @staticmethod
+    def _merge_pairs(pairs: List[tuple]) -> Dict[int, int]:
+        """Union-find over similar pairs; maps each member to its cluster root."""
+        parent = {}
+
+        def find(item):
+            parent.setdefault(item, item)
+            while parent[item] != item:
+                parent[item] = parent[parent[item]]
+                item = parent[item]
+            return item
+
+        for left, right in pairs:
+            left_root, right_root = find(left), find(right)
+            if left_root != right_root:
+                parent[max(left_root, right_root)] = min(left_root, right_root)
+
+        return {item: find(item) for item in parent}
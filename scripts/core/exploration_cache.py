@@ -0,0 +1,200 @@
+"""
+Content-addressed cache of dataset exploration results.
+
+A cache entry is keyed by a fingerprint of the dataset's content (HF
+revision, split and schema hash, or a hash of local files) combined with the
+analysis options. Each analysis section is stored with the version of the
+code that produced it, so only sections whose code changed are recomputed.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Dict, List, Optional
+
+# Bytes read at a time when hashing local files
+_HASH_CHUNK_BYTES = 1024 * 1024
+
+
+def _sha256_json(value: Any) -> str:
+    """Stable SHA-256 of a JSON-serializable value."""
+    encoded = json.dumps(value, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def hash_files(paths: List[str]) -> str:
+    """
+    Hash the names and contents of local files.
+
+    Args:
+        paths: Files to hash; order does not matter
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        digest.update(os.path.basename(path).encode("utf-8"))
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(_HASH_CHUNK_BYTES), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint_hf_dataset(dataset_name: str, split: str) -> Optional[Dict[str, Any]]:
+    """
+    Fingerprint a HuggingFace dataset without downloading its data.
+
+    Args:
+        dataset_name: HuggingFace dataset identifier
+        split: Dataset split
+
+    Returns:
+        Fingerprint parts, or None if the hub cannot be reached
+    """
+    try:
+        from huggingface_hub import HfApi
+
+        from datasets import load_dataset_builder
+
+        revision = HfApi().dataset_info(dataset_name).sha
+        features = load_dataset_builder(dataset_name).info.features
+        schema = features.to_dict() if features is not None else None
+    except Exception as e:
+        print(f"⚠️  Could not fingerprint {dataset_name}: {e}")
+        return None
+
+    return {
+        "source": "huggingface",
+        "dataset": dataset_name,
+        "revision": revision,
+        "split": split,
+        "schema_hash": _sha256_json(schema),
+    }
+
+
+def fingerprint_parquet(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Fingerprint Parquet files by content.
+
+    Args:
+        path: Parquet file path or glob
+
+    Returns:
+        Fingerprint parts, or None if no files match
+    """
+    files = glob.glob(path)
+    if not files:
+        return None
+    return {"source": "parquet", "files_hash": hash_files(files)}
+
+
+def fingerprint_duckdb_table(
+    database_path: str, table_name: str
+) -> Optional[Dict[str, Any]]:
+    """
+    Fingerprint a table of a DuckDB database by the database file's content.
+
+    Args:
+        database_path: Path to the DuckDB database
+        table_name: Table being profiled
+
+    Returns:
+        Fingerprint parts, or None if the database does not exist
+    """
+    if not os.path.exists(database_path):
+        return None
+    return {
+        "source": "duckdb",
+        "table": table_name,
+        "files_hash": hash_files([database_path]),
+    }
+
+
+class ExplorationCache:
+    """Directory of cached analysis sections, one JSON file per cache key."""
+
+    def __init__(self, cache_dir: str):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the cache entries (created on demand)
+        """
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def make_key(fingerprint: Dict[str, Any], options: Dict[str, Any]) -> str:
+        """
+        Derive the cache key for a dataset fingerprint and analysis options.
+
+        Args:
+            fingerprint: Parts returned by one of the fingerprint_* functions
+            options: Analysis options that change results (engine, mode, ...)
+
+        Returns:
+            Hex cache key
+        """
+        return _sha256_json({"fingerprint": fingerprint, "options": options})[:32]
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def load(self, key: str, versions: Dict[str, int]) -> Dict[str, Any]:
+        """
+        Load the cached sections still produced by the current code versions.
+
+        Args:
+            key: Cache key
+            versions: Current analysis code version of each section
+
+        Returns:
+            Mapping of section name to cached result; stale sections are omitted
+        """
+        try:
+            with open(self._entry_path(key), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        return {
+            name: section["result"]
+            for name, section in entry.get("sections", {}).items()
+            if versions.get(name) == section.get("version")
+        }
+
+    def store(
+        self,
+        key: str,
+        fingerprint: Dict[str, Any],
+        sections: Dict[str, Any],
+        versions: Dict[str, int],
+    ) -> None:
+        """
+        Store analysis sections, replacing any previous entry atomically.
+
+        Args:
+            key: Cache key
+            fingerprint: Dataset fingerprint the results belong to
+            sections: Mapping of section name to result
+            versions: Analysis code version of each section
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entry = {
+            "fingerprint": fingerprint,
+            "sections": {
+                name: {"version": versions[name], "result": result}
+                for name, result in sections.items()
+            },
+        }
+
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False, default=str)
+            os.replace(temp_path, self._entry_path(key))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
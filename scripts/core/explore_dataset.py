@@ -7,27 +7,104 @@ and provides comprehensive metadata for curriculum planning.
 
 Usage:
     python scripts/core/explore_dataset.py --dataset lukebarousse/data_jobs --output initial_exploration_jobs.json
+    python scripts/core/explore_dataset.py --dataset lukebarousse/data_jobs --engine duckdb --memory-limit 2GB
 """
 
 import argparse
 import json
 import os
 import random
+import shutil
 import sys
+import tempfile
+import time
 import warnings
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import duckdb
 import numpy as np
 import pandas as pd
+import pyarrow as pa
 
 from datasets import load_dataset
 
+# Make the project root importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from scripts.core.duckdb_profiler import SOURCE_VIEW, DuckDBProfiler  # noqa: E402
+from scripts.core.duplicate_analysis import DuplicateAnalyzer  # noqa: E402
+from scripts.core.exploration_cache import (  # noqa: E402
+    ExplorationCache,
+    fingerprint_duckdb_table,
+    fingerprint_hf_dataset,
+    fingerprint_parquet,
+)
+from scripts.core.inclusion_dependencies import InclusionDependencyFinder  # noqa: E402
+
 # Suppress warnings for cleaner output
 warnings.filterwarnings("ignore")
 
+# Seed for all sampling; sample values are drawn per column from
+# RandomState(RANDOM_SEED + column position) so parallel runs match serial ones
+RANDOM_SEED = 42
+
+# Rows per Arrow record batch when ingesting into DuckDB
+INGEST_BATCH_SIZE = 100_000
+
+
+class ColumnProfile:
+    """
+    Per-column facts computed once and shared by every analysis stage.
+
+    Building the profile hashes the column a single time (value counts of the
+    non-null values); the null mask, distinct count, distinct values and
+    dtype class are all derived from that pass instead of being recomputed by
+    each analysis method.
+    """
+
+    def __init__(self, series: pd.Series):
+        """
+        Profile a column.
+
+        Args:
+            series: Column to profile
+        """
+        self.series = series
+        self.length = len(series)
+        self.null_mask = series.isnull()
+        self.null_count = int(self.null_mask.sum())
+        self.non_null = series[~self.null_mask]
+
+        # Distinct values in order of first appearance with their counts
+        self.value_counts_unsorted = self.non_null.value_counts(sort=False)
+        self.unique_count = len(self.value_counts_unsorted)
+
+        self.is_bool = pd.api.types.is_bool_dtype(series)
+        self.is_datetime = pd.api.types.is_datetime64_any_dtype(series)
+        self.is_numeric = pd.api.types.is_numeric_dtype(series)
+        self.is_integer = pd.api.types.is_integer_dtype(series)
+        self._value_counts = None
+
+    @property
+    def unique_values(self) -> np.ndarray:
+        """Distinct non-null values in order of first appearance."""
+        return self.value_counts_unsorted.index.to_numpy()
+
+    @property
+    def value_counts(self) -> pd.Series:
+        """Non-null value counts, most frequent first."""
+        if self._value_counts is None:
+            self._value_counts = self.value_counts_unsorted.sort_values(ascending=False)
+        return self._value_counts
+
+    @property
+    def unique_ratio(self) -> float:
+        """Distinct values as a share of all rows (nulls included)."""
+        return self.unique_count / self.length if self.length else 0.0
+
 
 class DatasetExplorer:
     """
@@ -41,8 +118,40 @@ class DatasetExplorer:
     - Educational suitability for SQL exercises
     """
 
+    ENGINES = ("pandas", "duckdb")
+
+    # Version of the code producing each analysis section, in report order.
+    # Bump a section's version when its computation changes so cached results
+    # for it (and for the sections derived from it) are recomputed.
+    ANALYSIS_VERSIONS = {
+        "metadata": 1,
+        "columns": 1,
+        "data_quality": 2,
+        "relationships": 2,
+        "educational_assessment": 1,
+    }
+
+    # Sections computed from other sections
+    SECTION_INPUTS = {
+        "data_quality": ("columns",),
+        "relationships": ("columns",),
+        "educational_assessment": ("metadata", "columns"),
+    }
+
+    # Sections that have to scan the dataset itself
+    DATA_SECTIONS = ("metadata", "columns", "data_quality", "relationships")
+
     def __init__(
-        self, dataset_name: str, split: str = "train", sample_size: int = 1000
+        self,
+        dataset_name: str,
+        split: str = "train",
+        sample_size: int = 1000,
+        engine: str = "pandas",
+        memory_limit: Optional[str] = None,
+        jobs: int = 1,
+        approximate: bool = False,
+        cache_dir: Optional[str] = None,
+        near_duplicates: bool = False,
     ):
         """
         Initialize the dataset explorer.
@@ -51,20 +160,108 @@ class DatasetExplorer:
             dataset_name: HuggingFace dataset identifier (e.g., "lukebarousse/data_jobs")
             split: Dataset split to analyze (default: "train")
             sample_size: Number of sample values to extract per column
+            engine: "pandas" loads the dataset into a DataFrame; "duckdb" profiles
+                it out-of-core with SQL aggregates
+            memory_limit: DuckDB memory limit for the duckdb engine (e.g. "2GB")
+            jobs: Number of processes profiling columns concurrently (pandas
+                engine) or DuckDB threads (duckdb engine)
+            approximate: Profile with sketches (HyperLogLog distincts, sampled
+                medians, space-saving top values, hashed duplicates) and report
+                error bounds; always runs on DuckDB
+            cache_dir: Directory of the content-addressed result cache; None
+                disables caching
+            near_duplicates: Also cluster rows whose text matches after
+                normalizing whitespace and case, or is similar (MinHash/LSH)
         """
+        if engine not in self.ENGINES:
+            raise ValueError(
+                f"Unsupported engine '{engine}'. Choose from: {', '.join(self.ENGINES)}"
+            )
+
         self.dataset_name = dataset_name
         self.split = split
         self.sample_size = sample_size
+        self.engine = engine
+        self.memory_limit = memory_limit
+        self.jobs = max(1, jobs)
+        self.approximate = approximate
+        self.near_duplicates = near_duplicates
         self.df = None
+        self.arrow_table = None
+        self.profiler = None
+        self.duplicates = None
+        self._source_conn = None
+        self._source_error = None
         self.analysis_results = {}
+        self.cache = ExplorationCache(cache_dir) if cache_dir else None
+        self.cache_key = None
+        self.fingerprint = None
+        self._cached_sections = {}
 
         # Set random seeds for deterministic behavior
-        np.random.seed(42)
-        random.seed(42)
+        np.random.seed(RANDOM_SEED)
+        random.seed(RANDOM_SEED)
+
+    def restore_cached_analysis(
+        self,
+        parquet: Optional[str] = None,
+        database_path: Optional[str] = None,
+        table_name: Optional[str] = None,
+    ) -> bool:
+        """
+        Look up cached results for the content fingerprint of the source.
+
+        Call before loading: HuggingFace datasets are fingerprinted by hub
+        revision, split and schema, local sources by file hash. Sections
+        cached by the current analysis code are reused by analyze_dataset().
+
+        Args:
+            parquet: Parquet source that will be passed to load_parquet()
+            database_path: DuckDB source that will be passed to load_table()
+            table_name: Table of database_path that will be profiled
+
+        Returns:
+            bool: True if every section that scans the data is cached, so the
+                dataset need not be loaded
+        """
+        if self.cache is None:
+            return False
+
+        if parquet:
+            fingerprint = fingerprint_parquet(parquet)
+        elif database_path:
+            fingerprint = fingerprint_duckdb_table(database_path, table_name)
+        else:
+            fingerprint = fingerprint_hf_dataset(self.dataset_name, self.split)
+        if fingerprint is None:
+            return False
+
+        # Raw Parquet and DuckDB sources always use the duckdb engine
+        options = {
+            "dataset_name": self.dataset_name,
+            "split": self.split,
+            "engine": "duckdb" if parquet or database_path else self.engine,
+            "approximate": self.approximate,
+            "near_duplicates": self.near_duplicates,
+            "sample_size": self.sample_size,
+        }
+        self.fingerprint = fingerprint
+        self.cache_key = ExplorationCache.make_key(fingerprint, options)
+        self._cached_sections = self.cache.load(self.cache_key, self.ANALYSIS_VERSIONS)
+
+        if len(self._cached_sections) == len(self.ANALYSIS_VERSIONS):
+            print(f"⚡ Using cached analysis {self.cache_key}")
+        elif self._cached_sections:
+            print(f"⚡ Reusing cached sections: {', '.join(self._cached_sections)}")
+
+        return all(name in self._cached_sections for name in self.DATA_SECTIONS)
 
     def load_dataset(self) -> bool:
         """
-        Load the dataset from HuggingFace and convert to pandas DataFrame.
+        Load the dataset from HuggingFace.
+
+        The pandas engine converts it to a DataFrame; the duckdb engine keeps
+        the memory-mapped Arrow table and profiles it in place.
 
         Returns:
             bool: True if successful, False otherwise
@@ -72,6 +269,16 @@ class DatasetExplorer:
         try:
             print(f"📥 Loading dataset: {self.dataset_name} (split: {self.split})")
             ds = load_dataset(self.dataset_name, split=self.split)
+            if self.engine == "duckdb":
+                self.arrow_table = ds.data.table
+                self.profiler = DuckDBProfiler.from_arrow(
+                    self.arrow_table,
+                    memory_limit=self.memory_limit,
+                    approximate=self.approximate,
+                )
+                self._print_loaded()
+                return True
+
             self.df = ds.to_pandas()
             print(
                 f"✅ Loaded {len(self.df):,} records with {len(self.df.columns)} columns"
@@ -81,117 +288,307 @@ class DatasetExplorer:
             print(f"❌ Failed to load dataset: {e}")
             return False
 
+    def load_parquet(self, path: str) -> bool:
+        """
+        Profile Parquet files directly with the duckdb engine.
+
+        Args:
+            path: Parquet file path or glob (e.g. "data/*.parquet")
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            print(f"📥 Opening Parquet source: {path}")
+            self.engine = "duckdb"
+            self.profiler = DuckDBProfiler.from_parquet(
+                path, memory_limit=self.memory_limit, approximate=self.approximate
+            )
+            self._print_loaded()
+            return True
+        except Exception as e:
+            print(f"❌ Failed to open Parquet source: {e}")
+            return False
+
+    def load_table(self, database_path: str, table_name: str) -> bool:
+        """
+        Profile a raw table of an existing DuckDB database with the duckdb engine.
+
+        Args:
+            database_path: Path to the DuckDB database (opened read-only)
+            table_name: Table to profile
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            print(f"📥 Opening table {table_name} in {database_path}")
+            self.engine = "duckdb"
+            self.profiler = DuckDBProfiler.from_table(
+                database_path,
+                table_name,
+                memory_limit=self.memory_limit,
+                approximate=self.approximate,
+            )
+            self._print_loaded()
+            return True
+        except Exception as e:
+            print(f"❌ Failed to open table: {e}")
+            return False
+
+    def _print_loaded(self):
+        """Print the size of a source opened with the duckdb engine."""
+        if self.jobs > 1:
+            self.profiler.conn.execute(f"SET threads = {self.jobs}")
+        print(
+            f"✅ Loaded {self.profiler.row_count:,} records with "
+            f"{len(self.profiler.columns)} columns (duckdb engine)"
+        )
+
     def analyze_dataset(self) -> Dict[str, Any]:
         """
         Perform comprehensive dataset analysis.
 
+        Sections restored by restore_cached_analysis() are reused; the rest
+        are computed and written back to the cache.
+
         Returns:
             dict: Complete analysis results
         """
-        if self.df is None:
-            raise ValueError("Dataset not loaded. Call load_dataset() first.")
+        stale = [
+            name for name in self.ANALYSIS_VERSIONS if name not in self._cached_sections
+        ]
+        for name, inputs in self.SECTION_INPUTS.items():
+            if name not in stale and any(section in stale for section in inputs):
+                stale.append(name)
+        if not stale:
+            self.analysis_results = {
+                name: self._cached_sections[name] for name in self.ANALYSIS_VERSIONS
+            }
+            return self.analysis_results
 
-        if self.df.empty:
-            raise ValueError(
-                "Dataset is empty - cannot perform analysis on empty dataset."
-            )
+        if any(name in stale for name in self.DATA_SECTIONS):
+            if self.df is None and self.profiler is None:
+                raise ValueError("Dataset not loaded. Call load_dataset() first.")
+
+            if self._record_count() == 0 or not self._column_names():
+                raise ValueError(
+                    "Dataset is empty - cannot perform analysis on empty dataset."
+                )
+
+            if self.approximate and self.df is not None:
+                # Sketches run on DuckDB; scan the DataFrame in place
+                self.profiler = DuckDBProfiler.from_arrow(
+                    self.df, memory_limit=self.memory_limit, approximate=True
+                )
 
         print("🔍 Analyzing dataset characteristics...")
 
-        # Perform all analysis components
-        metadata = self._analyze_metadata()
-        columns = self._analyze_columns()
-        data_quality = self._analyze_data_quality()
-        relationships = self._detect_relationships()
-        educational_assessment = self._assess_educational_value()
-
-        self.analysis_results = {
-            "metadata": metadata,
-            "columns": columns,
-            "data_quality": data_quality,
-            "relationships": relationships,
-            "educational_assessment": educational_assessment,
-        }
+        # Perform the stale analysis components; everything after the column
+        # pass works from the column analyses, so it is engine independent
+        results = dict(self._cached_sections)
+        if "columns" in stale:
+            results["columns"] = self._analyze_columns()
+        if "metadata" in stale:
+            results["metadata"] = self._analyze_metadata()
+        if "data_quality" in stale:
+            results["data_quality"] = self._analyze_data_quality(results["columns"])
+        if "relationships" in stale:
+            results["relationships"] = self._detect_relationships(results["columns"])
+        if "educational_assessment" in stale:
+            results["educational_assessment"] = self._assess_educational_value(
+                results["metadata"], results["columns"]
+            )
+
+        self.analysis_results = {name: results[name] for name in self.ANALYSIS_VERSIONS}
+
+        if self.cache_key is not None:
+            self.cache.store(
+                self.cache_key,
+                self.fingerprint,
+                self.analysis_results,
+                self.ANALYSIS_VERSIONS,
+            )
+            self._cached_sections = dict(self.analysis_results)
 
         return self.analysis_results
 
+    def _record_count(self) -> int:
+        """Number of records in the loaded dataset."""
+        if self.profiler is not None:
+            return self.profiler.row_count
+        return len(self.df)
+
+    def _column_names(self) -> List[str]:
+        """Column names of the loaded dataset."""
+        if self.profiler is not None:
+            return [name for name, _ in self.profiler.columns]
+        return list(self.df.columns)
+
     def _analyze_metadata(self) -> Dict[str, Any]:
         """Analyze basic dataset metadata."""
-        memory_usage_mb = self.df.memory_usage(deep=True).sum() / (1024 * 1024)
+        if self.profiler is not None:
+            memory_usage_mb = self.profiler.estimate_memory_mb()
+        else:
+            memory_usage_mb = self.df.memory_usage(deep=True).sum() / (1024 * 1024)
 
-        return {
+        metadata = {
             "dataset_name": self.dataset_name.split("/")[-1],
             "hf_source": self.dataset_name,
             "split": self.split,
-            "total_records": len(self.df),
-            "total_columns": len(self.df.columns),
+            "total_records": self._record_count(),
+            "total_columns": len(self._column_names()),
             "memory_usage_mb": round(memory_usage_mb, 2),
             "analysis_date": datetime.now().isoformat(),
-            "column_names": list(self.df.columns),
+            "column_names": self._column_names(),
         }
+        if self.approximate:
+            metadata["approximate"] = True
+
+        return metadata
 
     def _analyze_columns(self) -> List[Dict[str, Any]]:
         """Perform detailed analysis of each column."""
+        if self.profiler is not None:
+            return self.profiler.analyze_columns()
+
+        index_bytes = int(self.df.index.memory_usage(deep=True))
+
+        if self.jobs > 1 and len(self.df.columns) > 1:
+            columns_analysis = self._analyze_columns_parallel(index_bytes)
+            if columns_analysis is not None:
+                return columns_analysis
+
         columns_analysis = []
 
-        for col in self.df.columns:
+        for position, col in enumerate(self.df.columns):
             print(f"  📊 Analyzing column: {col}")
+            columns_analysis.append(
+                self._analyze_column(col, self.df[col], position, index_bytes)
+            )
 
-            col_data = self.df[col]
-            analysis = {
-                "name": col,
-                "data_type": str(col_data.dtype),
-                "pandas_type": self._classify_pandas_type(col_data),
-                "null_count": int(col_data.isnull().sum()),
-                "null_percentage": round(
-                    (col_data.isnull().sum() / len(col_data)) * 100, 2
-                ),
-                "unique_count": int(col_data.nunique()),
-                "unique_percentage": round(
-                    (col_data.nunique() / len(col_data)) * 100, 2
-                ),
-                "sample_values": self._get_sample_values(col_data),
-                "statistics": self._get_column_statistics(col_data),
-            }
+        return columns_analysis
+
+    def _analyze_columns_parallel(
+        self, index_bytes: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Analyze columns concurrently in a process pool.
 
-            # Add type-specific analysis
-            if analysis["pandas_type"] in ["numeric", "datetime"]:
-                analysis.update(self._analyze_numeric_column(col_data))
-            elif analysis["pandas_type"] == "categorical":
-                analysis.update(self._analyze_categorical_column(col_data))
+        The DataFrame is written once to an uncompressed Arrow IPC file that
+        every worker memory-maps, so columns are shared zero-copy instead of
+        being pickled. Results are collected in column order.
+
+        Returns:
+            Column analyses, or None if the data does not round-trip through
+            Arrow unchanged (the caller then falls back to a serial run)
+        """
+        try:
+            table = pa.Table.from_pandas(self.df, preserve_index=False)
+            round_trip_dtypes = table.schema.empty_table().to_pandas().dtypes
+            if list(round_trip_dtypes) != list(self.df.dtypes):
+                raise TypeError("column dtypes change when converted to Arrow")
+        except (pa.ArrowException, TypeError, ValueError) as e:
+            print(f"⚠️  Parallel analysis unavailable ({e}); analyzing serially")
+            return None
+
+        temp_dir = tempfile.mkdtemp(prefix="explore_dataset_")
+        try:
+            arrow_path = os.path.join(temp_dir, "dataset.arrow")
+            with pa.OSFile(arrow_path, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            del table
 
-            columns_analysis.append(analysis)
+            print(
+                f"  ⚡ Analyzing {len(self.df.columns)} columns with {self.jobs} processes"
+            )
+            with ProcessPoolExecutor(
+                max_workers=self.jobs,
+                initializer=_init_column_worker,
+                initargs=(arrow_path,),
+            ) as executor:
+                tasks = [
+                    (col, position, index_bytes)
+                    for position, col in enumerate(self.df.columns)
+                ]
+                columns_analysis = []
+                for analysis in executor.map(_analyze_column_worker, tasks):
+                    print(f"  📊 Analyzed column: {analysis['name']}")
+                    columns_analysis.append(analysis)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
 
         return columns_analysis
 
-    def _classify_pandas_type(self, series: pd.Series) -> str:
+    def _analyze_column(
+        self, col: str, series: pd.Series, position: int, index_bytes: int
+    ) -> Dict[str, Any]:
+        """
+        Analyze a single column.
+
+        Args:
+            col: Column name
+            series: Column data
+            position: Column position, used to seed sampling deterministically
+            index_bytes: Memory used by the DataFrame index
+
+        Returns:
+            Column analysis dictionary
+        """
+        profile = ColumnProfile(series)
+        pandas_type = self._classify_pandas_type(profile)
+        rng = np.random.RandomState(RANDOM_SEED + position)
+        analysis = {
+            "name": col,
+            "data_type": str(profile.series.dtype),
+            "pandas_type": pandas_type,
+            "null_count": profile.null_count,
+            "null_percentage": round((profile.null_count / profile.length) * 100, 2),
+            "unique_count": profile.unique_count,
+            "unique_percentage": round(profile.unique_ratio * 100, 2),
+            "sample_values": self._get_sample_values(profile, pandas_type, rng),
+            "statistics": self._get_column_statistics(profile, index_bytes),
+        }
+
+        # Add type-specific analysis
+        if pandas_type in ["numeric", "datetime"]:
+            analysis.update(self._analyze_numeric_column(profile))
+        elif pandas_type == "categorical":
+            analysis.update(self._analyze_categorical_column(profile))
+
+        return analysis
+
+    def _classify_pandas_type(self, profile: ColumnProfile) -> str:
         """Classify pandas column into educational categories."""
         # Check boolean first since it might also be detected as numeric
-        if pd.api.types.is_bool_dtype(series):
+        if profile.is_bool:
             return "boolean"
-        elif series.dtype == "bool" or set(series.dropna().unique()).issubset(
-            {True, False, 1, 0}
-        ):
-            # Additional check for boolean-like data
+        elif set(profile.unique_values).issubset({True, False}):
+            # Additional check for boolean-like data (0/1 compare equal to bools)
             return "boolean"
-        elif pd.api.types.is_datetime64_any_dtype(series):
+        elif profile.is_datetime:
             return "datetime"
-        elif pd.api.types.is_numeric_dtype(series):
+        elif profile.is_numeric:
             return "numeric"
-        elif series.dtype == "object":
+        elif profile.series.dtype == "object":
             # Check if it's categorical (low cardinality)
-            unique_ratio = series.nunique() / len(series)
-            if unique_ratio < 0.1:  # Less than 10% unique values
+            if profile.unique_ratio < 0.1:  # Less than 10% unique values
                 return "categorical"
             else:
                 return "text"
         else:
             return "other"
 
-    def _get_sample_values(self, series: pd.Series, max_samples: int = 5) -> List[str]:
+    def _get_sample_values(
+        self,
+        profile: ColumnProfile,
+        pandas_type: str,
+        rng: np.random.RandomState,
+        max_samples: int = 5,
+    ) -> List[str]:
         """Get representative sample values from a column."""
-        # Remove nulls and get unique values
-        non_null_values = series.dropna().unique()
+        non_null_values = profile.unique_values
 
         if len(non_null_values) == 0:
             return ["(all null values)"]
@@ -201,25 +598,30 @@ class DatasetExplorer:
             samples = non_null_values
         else:
             # For categorical data, get most frequent values
-            if self._classify_pandas_type(series) == "categorical":
-                samples = series.value_counts().head(max_samples).index.tolist()
+            if pandas_type == "categorical":
+                samples = profile.value_counts.head(max_samples).index.tolist()
             else:
                 # For other types, get random sample
-                samples = np.random.choice(non_null_values, max_samples, replace=False)
+                samples = rng.choice(non_null_values, max_samples, replace=False)
 
         # Convert to strings and handle long values
         return [
             str(val)[:50] + "..." if len(str(val)) > 50 else str(val) for val in samples
         ]
 
-    def _get_column_statistics(self, series: pd.Series) -> Dict[str, Any]:
+    def _get_column_statistics(
+        self, profile: ColumnProfile, index_bytes: int
+    ) -> Dict[str, Any]:
         """Get basic statistics for a column."""
+        series = profile.series
+        # Equivalent to series.memory_usage(deep=True) with the DataFrame's index
+        memory_bytes = series.memory_usage(deep=True, index=False) + index_bytes
         stats = {
-            "count": int(series.count()),
-            "memory_usage_mb": round(series.memory_usage(deep=True) / (1024 * 1024), 3),
+            "count": profile.length - profile.null_count,
+            "memory_usage_mb": round(memory_bytes / (1024 * 1024), 3),
         }
 
-        if pd.api.types.is_numeric_dtype(series):
+        if profile.is_numeric:
             stats.update(
                 {
                     "mean": float(series.mean()) if not series.empty else None,
@@ -232,76 +634,156 @@ class DatasetExplorer:
 
         return stats
 
-    def _analyze_numeric_column(self, series: pd.Series) -> Dict[str, Any]:
+    def _analyze_numeric_column(self, profile: ColumnProfile) -> Dict[str, Any]:
         """Additional analysis for numeric columns."""
         # Only analyze if it's actually numeric (not datetime)
-        if not pd.api.types.is_numeric_dtype(series):
+        if not profile.is_numeric:
             return {"potential_id_field": False}
 
+        series = profile.series
         return {
-            "is_integer": pd.api.types.is_integer_dtype(series),
+            "is_integer": profile.is_integer,
             "has_negatives": bool((series < 0).any()) if not series.empty else False,
             "has_zeros": bool((series == 0).any()) if not series.empty else False,
-            "potential_id_field": self._is_potential_id_field(series),
+            "potential_id_field": self._is_potential_id_field(profile),
         }
 
-    def _analyze_categorical_column(self, series: pd.Series) -> Dict[str, Any]:
+    def _analyze_categorical_column(self, profile: ColumnProfile) -> Dict[str, Any]:
         """Additional analysis for categorical columns."""
-        value_counts = series.value_counts()
-
         return {
-            "top_values": value_counts.head(10).to_dict(),
-            "category_count": len(value_counts),
-            "potential_foreign_key": self._is_potential_foreign_key(series),
+            "top_values": profile.value_counts.head(10).to_dict(),
+            "category_count": profile.unique_count,
+            "potential_foreign_key": self._is_potential_foreign_key(profile),
         }
 
-    def _is_potential_id_field(self, series: pd.Series) -> bool:
+    def _is_potential_id_field(self, profile: ColumnProfile) -> bool:
         """Determine if a numeric column could be an ID field."""
-        if not pd.api.types.is_numeric_dtype(series):
+        if not profile.is_numeric:
             return False
 
-        if series.empty:
+        if profile.length == 0:
             return False
 
         # Check for ID-like characteristics
-        unique_ratio = series.nunique() / len(series)
+        unique_ratio = profile.unique_ratio
         is_sequential = False
-        has_no_negatives = series.min() >= 0
+        has_no_negatives = profile.series.min() >= 0
 
-        if pd.api.types.is_integer_dtype(series):
-            sorted_values = series.dropna().sort_values()
+        # The sort is only needed when uniqueness alone does not decide
+        if profile.is_integer and 0.9 < unique_ratio <= 0.98 and has_no_negatives:
+            sorted_values = profile.non_null.sort_values()
             if len(sorted_values) > 1:
                 # Check if values are roughly sequential
                 diffs = sorted_values.diff().dropna()
                 is_sequential = (diffs == 1).mean() > 0.8
 
-        return (
+        return bool(
             unique_ratio > 0.9
             and has_no_negatives
             and (is_sequential or unique_ratio > 0.98)
         )
 
-    def _is_potential_foreign_key(self, series: pd.Series) -> bool:
+    def _is_potential_foreign_key(self, profile: ColumnProfile) -> bool:
         """Determine if a categorical column could be a foreign key."""
-        if series.empty:
+        if profile.length == 0:
             return False
 
-        unique_ratio = series.nunique() / len(series)
-        unique_count = series.nunique()
+        unique_ratio = profile.unique_ratio
+        unique_count = profile.unique_count
 
         # Potential FK if it has moderate cardinality (not too unique, not too few values)
         # Adjusted thresholds to be more permissive for testing
         return 0.001 < unique_ratio < 0.5 and unique_count >= 3
 
-    def _analyze_data_quality(self) -> Dict[str, Any]:
+    def _source_connection(self) -> Optional[duckdb.DuckDBPyConnection]:
+        """
+        DuckDB connection exposing the loaded dataset as SOURCE_VIEW.
+
+        Returns:
+            The connection, or None if the DataFrame cannot be converted to
+            Arrow (e.g. an object column mixing strings and numbers)
+        """
+        if self.profiler is not None:
+            return self.profiler.conn
+        if self._source_conn is None and self._source_error is None:
+            try:
+                table = pa.Table.from_pandas(self.df, preserve_index=False)
+            except (pa.ArrowException, TypeError, ValueError) as e:
+                self._source_error = str(e)
+                print(f"⚠️  DuckDB analysis of the DataFrame unavailable ({e})")
+                return None
+            self._source_conn = duckdb.connect()
+            self._source_conn.register(SOURCE_VIEW, table)
+        return self._source_conn
+
+    def _duplicate_analyzer(self) -> Optional[DuplicateAnalyzer]:
+        """Duplicate analysis over the loaded dataset, created on first use."""
+        if self.duplicates is None:
+            conn = self._source_connection()
+            if conn is None:
+                return None
+            self.duplicates = DuplicateAnalyzer(conn)
+        return self.duplicates
+
+    def _duplicate_stats(self) -> Dict[str, int]:
+        """Count rows that duplicate an earlier row, and their clusters."""
+        if self.approximate:
+            return {"duplicate_records": self.profiler.count_duplicates()}
+        # The analyzer is only needed with the DuckDB engine or near
+        # duplicates; pandas counts exact duplicates without an Arrow copy
+        if self.profiler is not None or self.near_duplicates:
+            analyzer = self._duplicate_analyzer()
+            if analyzer is not None:
+                stats = analyzer.exact_duplicates()
+                return {
+                    "duplicate_records": stats["duplicate_records"],
+                    "duplicate_clusters": stats["duplicate_clusters"],
+                }
+        later = self.df.duplicated()
+        first = self.df.duplicated(keep=False) & ~later
+        return {
+            "duplicate_records": int(later.sum()),
+            "duplicate_clusters": int(first.sum()),
+        }
+
+    def export_duplicates(self, output_path: str) -> bool:
+        """
+        Export exact (and, if enabled, near) duplicate clusters for review.
+
+        Args:
+            output_path: Destination file (.parquet, .csv or .json)
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            analyzer = self._duplicate_analyzer()
+            if analyzer is None:
+                print(f"❌ Failed to export duplicates: {self._source_error}")
+                return False
+            if self.near_duplicates and analyzer.near_stats is None:
+                analyzer.near_duplicates()
+            row_count = analyzer.export_clusters(output_path)
+            print(f"💾 Exported {row_count:,} duplicate cluster rows to: {output_path}")
+            return True
+        except Exception as e:
+            print(f"❌ Failed to export duplicates: {e}")
+            return False
+
+    def _analyze_data_quality(self, columns: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze overall data quality metrics."""
+        total_records = self._record_count()
+        column_names = [col["name"] for col in columns]
+        null_rates = {col["name"]: col["null_count"] / total_records for col in columns}
+
         # Count duplicate rows
-        duplicate_count = self.df.duplicated().sum()
+        duplicate_stats = self._duplicate_stats()
+        duplicate_count = duplicate_stats["duplicate_records"]
 
         # Calculate completeness score (average non-null percentage across columns)
         completeness_scores = []
-        for col in self.df.columns:
-            completeness = (1 - self.df[col].isnull().mean()) * 100
+        for col in column_names:
+            completeness = (1 - null_rates[col]) * 100
             completeness_scores.append(completeness)
 
         avg_completeness = np.mean(completeness_scores)
@@ -310,9 +792,7 @@ class DatasetExplorer:
         issues = []
 
         # Check for columns with high null rates
-        high_null_cols = [
-            col for col in self.df.columns if self.df[col].isnull().mean() > 0.5
-        ]
+        high_null_cols = [col for col in column_names if null_rates[col] > 0.5]
         if high_null_cols:
             issues.append(f"High null rates in columns: {', '.join(high_null_cols)}")
 
@@ -320,52 +800,70 @@ class DatasetExplorer:
         if duplicate_count > 0:
             issues.append(f"Found {duplicate_count} duplicate records")
 
+        near_duplicates = None
+        analyzer = self._duplicate_analyzer() if self.near_duplicates else None
+        if self.near_duplicates and analyzer is None:
+            print("⚠️  Skipping near-duplicate detection")
+        elif analyzer is not None:
+            near_duplicates = analyzer.near_duplicates()
+            near_count = near_duplicates["near_duplicate_records"]
+            if near_count > duplicate_count:
+                issues.append(
+                    f"Found {near_count} near-duplicate records "
+                    "(differing in whitespace, case or small edits)"
+                )
+
         # Check for columns with single values
-        single_value_cols = [
-            col for col in self.df.columns if self.df[col].nunique() <= 1
-        ]
+        single_value_cols = [col["name"] for col in columns if col["unique_count"] <= 1]
         if single_value_cols:
             issues.append(
                 f"Columns with single/no values: {', '.join(single_value_cols)}"
             )
 
-        return {
-            "total_records": len(self.df),
+        data_quality = {
+            "total_records": total_records,
             "duplicate_records": int(duplicate_count),
-            "duplicate_percentage": round((duplicate_count / len(self.df)) * 100, 2),
+            "duplicate_percentage": round((duplicate_count / total_records) * 100, 2),
             "completeness_score": round(avg_completeness, 2),
             "completeness_by_column": {
                 col: round(score, 2)
-                for col, score in zip(self.df.columns, completeness_scores)
+                for col, score in zip(column_names, completeness_scores)
             },
             "potential_issues": issues,
         }
+        if "duplicate_clusters" in duplicate_stats:
+            data_quality["duplicate_clusters"] = duplicate_stats["duplicate_clusters"]
+        if near_duplicates is not None:
+            data_quality["near_duplicates"] = near_duplicates
+        if self.profiler is not None and self.profiler.duplicate_error_bound:
+            data_quality["error_bounds"] = {
+                "duplicate_records": self.profiler.duplicate_error_bound
+            }
+
+        return data_quality
 
-    def _detect_relationships(self) -> Dict[str, Any]:
+    def _detect_relationships(self, columns: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Detect potential relationships between columns."""
         normalization_opportunities = []
 
         # Find potential primary keys
-        potential_pks = []
-        for col in self.df.columns:
-            col_data = self.df[col]
-            if self._is_potential_id_field(col_data):
-                potential_pks.append(col)
+        potential_pks = [
+            col["name"] for col in columns if col.get("potential_id_field", False)
+        ]
 
         # Find potential foreign key relationships
         categorical_cols = [
-            col
-            for col in self.df.columns
-            if self._classify_pandas_type(self.df[col]) == "categorical"
+            col for col in columns if col["pandas_type"] == "categorical"
         ]
 
         for col in categorical_cols:
-            if self._is_potential_foreign_key(self.df[col]):
+            if col.get("potential_foreign_key", False):
+                name = col["name"]
                 normalization_opportunities.append(
                     {
-                        "column": col,
-                        "suggested_table": f"{col.lower().replace('_', '')}_table",
-                        "unique_values": int(self.df[col].nunique()),
+                        "column": name,
+                        "suggested_table": f"{name.lower().replace('_', '')}_table",
+                        "unique_values": int(col["unique_count"]),
                         "foreign_key_potential": "high",
                     }
                 )
@@ -375,21 +873,67 @@ class DatasetExplorer:
             "normalization_opportunities": normalization_opportunities,
             "total_categorical_columns": len(categorical_cols),
             "suggested_fact_table": "main_table",
+            "inclusion_dependencies": self._find_inclusion_dependencies(columns),
         }
 
-    def _assess_educational_value(self) -> Dict[str, Any]:
+    def _find_inclusion_dependencies(
+        self, columns: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Find columns whose values are contained in a unique column of the dataset.
+
+        These are self-referencing foreign keys (e.g. manager_id -> employee_id),
+        tested with anti-join counts in DuckDB and reported with their
+        containment ratios.
+        """
+        total_records = self._record_count()
+        # Slack for approximate distinct counts; the finder checks uniqueness exactly
+        keys = {
+            (SOURCE_VIEW, col["name"])
+            for col in columns
+            if col["unique_count"] > 0
+            and col["unique_count"] >= 0.95 * (total_records - col["null_count"])
+        }
+        if not keys:
+            return []
+
+        conn = self._source_connection()
+        if conn is None:
+            # The pandas foreign key heuristics still apply
+            print("⚠️  Skipping inclusion dependency discovery")
+            return []
+
+        dependencies = InclusionDependencyFinder(conn).find(
+            [SOURCE_VIEW], referenced=keys
+        )
+
+        return [
+            {
+                "column": dependency["dependent_column"],
+                "referenced_column": dependency["referenced_column"],
+                "containment_ratio": dependency["containment_ratio"],
+                "referenced_coverage": dependency["referenced_coverage"],
+            }
+            for dependency in dependencies
+        ]
+
+    def _assess_educational_value(
+        self, metadata: Dict[str, Any], columns: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
         """Assess the dataset's educational value for SQL learning."""
+        total_records = metadata["total_records"]
+
         # Count different column types
         type_counts = {}
-        for col in self.df.columns:
-            col_type = self._classify_pandas_type(self.df[col])
+        for col in columns:
+            col_type = col["pandas_type"]
             type_counts[col_type] = type_counts.get(col_type, 0) + 1
 
         # Calculate suitability score (0-10)
         score = 5.0  # Base score
 
         # Add points for good characteristics
-        if len(self.df) > 1000:  # Sufficient data size
+        if total_records > 1000:  # Sufficient data size
             score += 1.0
         if (
             type_counts.get("categorical", 0) >= 3
@@ -406,7 +950,7 @@ class DatasetExplorer:
             score += 1.0
 
         # Subtract points for issues
-        if len(self.df) < 100:  # Too small
+        if total_records < 100:  # Too small
             score -= 2.0
         if (
             self.analysis_results.get("data_quality", {}).get("completeness_score", 0)
@@ -417,9 +961,9 @@ class DatasetExplorer:
         score = max(0, min(10, score))  # Clamp to 0-10 range
 
         # Determine complexity level
-        if len(self.df.columns) < 5:
+        if len(columns) < 5:
             complexity = "beginner"
-        elif len(self.df.columns) < 15:
+        elif len(columns) < 15:
             complexity = "intermediate"
         else:
             complexity = "advanced"
@@ -452,24 +996,24 @@ class DatasetExplorer:
             "complexity_level": complexity,
             "recommended_topics": recommended_topics,
             "column_type_distribution": type_counts,
-            "strengths": self._identify_strengths(),
-            "limitations": self._identify_limitations(),
+            "strengths": self._identify_strengths(total_records, type_counts),
+            "limitations": self._identify_limitations(
+                total_records, len(columns), type_counts
+            ),
         }
 
-    def _identify_strengths(self) -> List[str]:
+    def _identify_strengths(
+        self, total_records: int, type_counts: Dict[str, int]
+    ) -> List[str]:
         """Identify dataset strengths for SQL education."""
         strengths = []
 
-        if len(self.df) > 10000:
+        if total_records > 10000:
             strengths.append(
                 "Large dataset size enables realistic query performance analysis"
             )
 
-        categorical_count = sum(
-            1
-            for col in self.df.columns
-            if self._classify_pandas_type(self.df[col]) == "categorical"
-        )
+        categorical_count = type_counts.get("categorical", 0)
         if categorical_count >= 3:
             strengths.append(
                 "Multiple categorical columns enable complex JOIN exercises"
@@ -495,11 +1039,13 @@ class DatasetExplorer:
 
         return strengths
 
-    def _identify_limitations(self) -> List[str]:
+    def _identify_limitations(
+        self, total_records: int, column_count: int, type_counts: Dict[str, int]
+    ) -> List[str]:
         """Identify dataset limitations for SQL education."""
         limitations = []
 
-        if len(self.df) < 1000:
+        if total_records < 1000:
             limitations.append(
                 "Small dataset size may not demonstrate query performance concepts"
             )
@@ -510,17 +1056,13 @@ class DatasetExplorer:
         ):
             limitations.append("High missing data rates may complicate analysis")
 
-        categorical_count = sum(
-            1
-            for col in self.df.columns
-            if self._classify_pandas_type(self.df[col]) == "categorical"
-        )
+        categorical_count = type_counts.get("categorical", 0)
         if categorical_count < 2:
             limitations.append(
                 "Limited categorical columns reduce JOIN exercise opportunities"
             )
 
-        if len(self.df.columns) < 5:
+        if column_count < 5:
             limitations.append("Few columns limit complexity of exercises")
 
         return limitations
@@ -558,17 +1100,32 @@ class DatasetExplorer:
             print(f"❌ Failed to save analysis: {e}")
             return False
 
-    def create_database(self, database_path: str) -> bool:
+    def create_database(
+        self, database_path: str, batch_size: int = INGEST_BATCH_SIZE
+    ) -> bool:
         """
         Create a generic database from the dataset (dataset agnostic).
 
+        With the duckdb engine the dataset's memory-mapped Arrow table is
+        streamed into DuckDB as record batches, so no pandas copy is made and
+        memory stays bounded by the batch size. With the pandas engine the
+        loaded DataFrame is used.
+
         Args:
             database_path: Path where to create the database
+            batch_size: Rows per Arrow record batch when streaming
 
         Returns:
             bool: True if successful, False otherwise
         """
-        if self.df is None:
+        if self.arrow_table is not None:
+            source = pa.RecordBatchReader.from_batches(
+                self.arrow_table.schema,
+                self.arrow_table.to_batches(max_chunksize=batch_size),
+            )
+        elif self.df is not None:
+            source = self.df
+        else:
             print("❌ Dataset not loaded. Cannot create database.")
             return False
 
@@ -580,6 +1137,8 @@ class DatasetExplorer:
 
             # Connect to database
             conn = duckdb.connect(database_path)
+            if self.memory_limit:
+                conn.execute(f"SET memory_limit = '{self.memory_limit}'")
 
             # Create a generic table name based on dataset
             dataset_name = self.dataset_name.split("/")[-1]
@@ -590,12 +1149,16 @@ class DatasetExplorer:
 
             # Create a single table with all the raw data
             # This is dataset agnostic - works with any dataset structure
-            conn.register("df_temp", self.df)
+            start_time = time.time()
+            conn.register("df_temp", source)
             conn.execute(f"CREATE TABLE {table_name} AS SELECT * FROM df_temp")
+            conn.unregister("df_temp")
+            elapsed = time.time() - start_time
 
-            # Get row count for summary
+            # Get row and column counts for summary
             result = conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()
             row_count = result[0] if result else 0
+            column_count = len(conn.table(table_name).columns)
 
             conn.close()
 
@@ -603,7 +1166,11 @@ class DatasetExplorer:
             print("📊 Database Summary:")
             print(f"   Table: {table_name}")
             print(f"   Records: {row_count:,}")
-            print(f"   Columns: {len(self.df.columns):,}")
+            print(f"   Columns: {column_count:,}")
+            print(
+                f"   Ingestion: {elapsed:.2f}s "
+                f"({row_count / elapsed if elapsed > 0 else 0:,.0f} rows/sec)"
+            )
 
             print(f"✅ Database created successfully: {database_path}")
             return True
@@ -613,6 +1180,27 @@ class DatasetExplorer:
             return False
 
 
+# Per-process state of parallel column analysis workers
+_worker_table = None
+_worker_explorer = None
+
+
+def _init_column_worker(arrow_path: str):
+    """Memory-map the shared Arrow file once per worker process."""
+    global _worker_table, _worker_explorer
+    source = pa.memory_map(arrow_path, "r")
+    _worker_table = pa.ipc.open_file(source).read_all()
+    _worker_explorer = DatasetExplorer("worker")
+
+
+def _analyze_column_worker(task) -> Dict[str, Any]:
+    """Analyze one column of the memory-mapped table in a worker process."""
+    col, position, index_bytes = task
+    series = _worker_table.column(col).to_pandas()
+    series.name = col
+    return _worker_explorer._analyze_column(col, series, position, index_bytes)
+
+
 def main():
     """Main function for command-line usage."""
     parser = argparse.ArgumentParser(
@@ -641,6 +1229,60 @@ def main():
         action="store_true",
         help="Create generic database from the dataset (dataset agnostic)",
     )
+    parser.add_argument(
+        "--engine",
+        choices=DatasetExplorer.ENGINES,
+        default="pandas",
+        help="Analysis engine: pandas (in-memory) or duckdb (out-of-core SQL aggregates)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Analyze columns with N processes (pandas) or N DuckDB threads (default: 1)",
+    )
+    parser.add_argument(
+        "--approximate",
+        action="store_true",
+        help="Use sketches (HyperLogLog, sampling, space-saving) with error bounds "
+        "instead of exact metrics; runs on DuckDB",
+    )
+    parser.add_argument(
+        "--memory-limit",
+        help="DuckDB memory limit for the duckdb engine (e.g. '2GB')",
+    )
+    parser.add_argument(
+        "--parquet",
+        help="Profile these Parquet files (path or glob) instead of downloading the dataset",
+    )
+    parser.add_argument(
+        "--source-db",
+        help="Profile a table of this DuckDB database instead of downloading the dataset",
+    )
+    parser.add_argument(
+        "--source-table",
+        help="Table to profile in --source-db (default: the dataset name)",
+    )
+    parser.add_argument(
+        "--near-duplicates",
+        action="store_true",
+        help="Also detect near-duplicate rows (whitespace/case variants and "
+        "similar text via MinHash/LSH)",
+    )
+    parser.add_argument(
+        "--export-duplicates",
+        help="Export duplicate clusters with their rows to this file "
+        "(.parquet, .csv or .json)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Directory of the exploration result cache (default: .cache/exploration in the project root)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Recompute every analysis section instead of reusing cached results",
+    )
 
     args = parser.parse_args()
 
@@ -657,12 +1299,41 @@ def main():
             / f"initial_exploration_data_{dataset_name}.json"
         )
 
+    if not args.no_cache and not args.cache_dir:
+        project_root = Path(__file__).parent.parent.parent
+        args.cache_dir = str(project_root / ".cache" / "exploration")
+
     # Create explorer and run analysis
-    explorer = DatasetExplorer(args.dataset, args.split, args.sample_size)
+    explorer = DatasetExplorer(
+        args.dataset,
+        args.split,
+        args.sample_size,
+        engine=args.engine,
+        memory_limit=args.memory_limit,
+        jobs=args.jobs,
+        approximate=args.approximate,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        near_duplicates=args.near_duplicates,
+    )
 
-    # Load dataset
-    if not explorer.load_dataset():
-        sys.exit(1)
+    table_name = args.source_table or args.dataset.split("/")[-1].replace("-", "_")
+    data_cached = explorer.restore_cached_analysis(
+        parquet=args.parquet,
+        database_path=args.source_db,
+        table_name=table_name,
+    )
+
+    # Load dataset (raw Parquet and DuckDB sources always use the duckdb engine);
+    # a cache hit skips loading unless the data itself is needed
+    if not data_cached or args.create_database or args.export_duplicates:
+        if args.parquet:
+            loaded = explorer.load_parquet(args.parquet)
+        elif args.source_db:
+            loaded = explorer.load_table(args.source_db, table_name)
+        else:
+            loaded = explorer.load_dataset()
+        if not loaded:
+            sys.exit(1)
 
     # Run analysis
     try:
@@ -685,6 +1356,11 @@ def main():
     if not explorer.save_analysis(args.output):
         sys.exit(1)
 
+    if args.export_duplicates and not explorer.export_duplicates(
+        args.export_duplicates
+    ):
+        sys.exit(1)
+
     # Create database if requested
     if args.create_database:
         dataset_name = args.dataset.split("/")[-1].replace("-", "_")
@@ -0,0 +1,376 @@
+"""
+Data-driven foreign-key discovery via inclusion-dependency testing.
+
+A column A is included in a column B (A ⊆ B) when every distinct value of A
+also occurs in B; a foreign key A -> B is an inclusion dependency whose
+referenced column B is unique. Candidate pairs across all tables are pruned
+in three cheap steps before any join runs:
+
+1. Statistics: one aggregate scan per table gives each column's type family,
+   distinct count and min/max. B must be unique, of the same family, have at
+   least as many distinct values as A and (for full containment) a range
+   covering A's.
+2. MinHash: one-permutation MinHash signatures of every surviving column
+   (minimum hash per bucket). If A ⊆ B, B's minimum in every bucket A
+   occupies is at most A's; pairs with too many violating buckets are dropped.
+3. Verification: the remaining pairs are checked exactly with batched
+   anti-join counts over a table of distinct values, one query per batch.
+
+Each result carries the real containment ratio (share of A's distinct values
+found in B) and the coverage of B (share of B's values used by A).
+"""
+
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import duckdb
+
+from scripts.core.duckdb_profiler import quote_identifier
+
+# Minimum share of the dependent column's distinct values found in the
+# referenced column for an inclusion dependency to be reported
+MIN_CONTAINMENT = 0.95
+
+# Minimum share of the referenced column's values that a foreign key whose
+# name does not point at the referenced table must use
+MIN_COVERAGE = 0.5
+
+# MinHash buckets per column signature
+MINHASH_BUCKETS = 128
+
+# Extra share of violating MinHash buckets tolerated for partial containment
+MINHASH_TOLERANCE = 0.1
+
+# Candidate pairs verified per anti-join query
+VERIFY_BATCH_SIZE = 256
+
+# Columns are compared within a type family, cast to the family's type
+_TYPE_FAMILIES = {
+    "TINYINT": "BIGINT",
+    "SMALLINT": "BIGINT",
+    "INTEGER": "BIGINT",
+    "BIGINT": "BIGINT",
+    "UTINYINT": "BIGINT",
+    "USMALLINT": "BIGINT",
+    "UINTEGER": "BIGINT",
+    "VARCHAR": "VARCHAR",
+}
+
+_VALUES_TABLE = "_ind_values_{family}"
+
+
+class InclusionDependencyFinder:
+    """Discover unary inclusion dependencies between columns with DuckDB."""
+
+    def __init__(
+        self,
+        conn: duckdb.DuckDBPyConnection,
+        min_containment: float = MIN_CONTAINMENT,
+        minhash_buckets: int = MINHASH_BUCKETS,
+        batch_size: int = VERIFY_BATCH_SIZE,
+    ):
+        """
+        Initialize the finder.
+
+        Args:
+            conn: DuckDB connection the tables or views are visible in
+            min_containment: Minimum containment ratio to report (0-1]
+            minhash_buckets: Buckets per MinHash signature
+            batch_size: Candidate pairs per verification query
+        """
+        self.conn = conn
+        self.min_containment = min_containment
+        self.minhash_buckets = minhash_buckets
+        self.batch_size = batch_size
+        self.pruning_stats = {}
+
+    def find(
+        self,
+        relations: List[str],
+        referenced: Optional[Set[Tuple[str, str]]] = None,
+        verbose: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        Find inclusion dependencies into unique columns of the given relations.
+
+        Args:
+            relations: Tables or views to test; every integer and string
+                column takes part
+            referenced: Restrict referenced columns to these
+                (relation, column) pairs
+            verbose: Print pruning progress
+
+        Returns:
+            Inclusion dependencies sorted by containment ratio, then coverage
+        """
+        columns = []
+        for relation in relations:
+            columns.extend(self._column_stats(relation))
+
+        candidates = self._prune_by_statistics(columns, referenced)
+        self.pruning_stats = {
+            "columns": len(columns),
+            "statistics": len(candidates),
+            "minhash": 0,
+        }
+        dependencies = []
+
+        for family in sorted({columns[dep]["family"] for dep, _ in candidates}):
+            family_candidates = [
+                pair for pair in candidates if columns[pair[0]]["family"] == family
+            ]
+            table = self._build_values_table(family, family_candidates, columns)
+            try:
+                signatures = self._minhash_signatures(table)
+                family_candidates = [
+                    (dep, ref)
+                    for dep, ref in family_candidates
+                    if self._passes_minhash(signatures, dep, ref)
+                ]
+                self.pruning_stats["minhash"] += len(family_candidates)
+                missing = self._count_missing(table, family_candidates)
+            finally:
+                self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+
+            for dep, ref in family_candidates:
+                dependency = self._dependency(
+                    columns[dep], columns[ref], missing[dep, ref]
+                )
+                if dependency["containment_ratio"] >= self.min_containment:
+                    dependencies.append(dependency)
+
+        self.pruning_stats["dependencies"] = len(dependencies)
+        if verbose:
+            print(
+                f"🔗 Inclusion dependencies: {len(columns)} columns, "
+                f"{self.pruning_stats['statistics']} candidate pairs after statistics, "
+                f"{self.pruning_stats['minhash']} after MinHash, "
+                f"{len(dependencies)} found"
+            )
+
+        dependencies.sort(
+            key=lambda d: (-d["containment_ratio"], -d["referenced_coverage"])
+        )
+        return dependencies
+
+    def _column_stats(self, relation: str) -> List[Dict[str, Any]]:
+        """Type family, counts and range of each comparable column in one scan."""
+        described = self.conn.execute(
+            f"DESCRIBE {quote_identifier(relation)}"
+        ).fetchall()
+        comparable = [
+            (row[0], _TYPE_FAMILIES[row[1]])
+            for row in described
+            if row[1] in _TYPE_FAMILIES
+        ]
+        if not comparable:
+            return []
+
+        aggregates = []
+        for name, family in comparable:
+            column = quote_identifier(name)
+            aggregates.extend(
+                [
+                    f"count({column})",
+                    f"count(DISTINCT {column})",
+                    f"CAST(min({column}) AS {family})",
+                    f"CAST(max({column}) AS {family})",
+                ]
+            )
+        row = self.conn.execute(
+            f"SELECT {', '.join(aggregates)} FROM {quote_identifier(relation)}"
+        ).fetchone()
+
+        stats = []
+        for i, (name, family) in enumerate(comparable):
+            non_null, distinct, minimum, maximum = row[4 * i : 4 * i + 4]
+            if non_null == 0:
+                continue
+            stats.append(
+                {
+                    "relation": relation,
+                    "column": name,
+                    "family": family,
+                    "distinct": distinct,
+                    "unique": distinct == non_null,
+                    "min": minimum,
+                    "max": maximum,
+                }
+            )
+        return stats
+
+    def _prune_by_statistics(
+        self,
+        columns: List[Dict[str, Any]],
+        referenced: Optional[Set[Tuple[str, str]]],
+    ) -> List[Tuple[int, int]]:
+        """Candidate (dependent, referenced) index pairs surviving the statistics."""
+        full = self.min_containment >= 1
+        candidates = []
+        for ref, ref_col in enumerate(columns):
+            if not ref_col["unique"]:
+                continue
+            if referenced is not None and (
+                (ref_col["relation"], ref_col["column"]) not in referenced
+            ):
+                continue
+
+            for dep, dep_col in enumerate(columns):
+                if dep == ref or dep_col["family"] != ref_col["family"]:
+                    continue
+                if dep_col["distinct"] * self.min_containment > ref_col["distinct"]:
+                    continue
+                if full:
+                    in_range = (
+                        dep_col["min"] >= ref_col["min"]
+                        and dep_col["max"] <= ref_col["max"]
+                    )
+                else:
+                    in_range = (
+                        dep_col["max"] >= ref_col["min"]
+                        and dep_col["min"] <= ref_col["max"]
+                    )
+                if in_range:
+                    candidates.append((dep, ref))
+        return candidates
+
+    def _build_values_table(
+        self,
+        family: str,
+        candidates: List[Tuple[int, int]],
+        columns: List[Dict[str, Any]],
+    ) -> str:
+        """Materialize the distinct values of every column in the candidates."""
+        table = _VALUES_TABLE.format(family=family.lower())
+        involved = sorted({index for pair in candidates for index in pair})
+        selects = []
+        for index in involved:
+            column = quote_identifier(columns[index]["column"])
+            selects.append(
+                f"SELECT DISTINCT {index} AS column_id, "
+                f"CAST({column} AS {family}) AS value "
+                f"FROM {quote_identifier(columns[index]['relation'])} "
+                f"WHERE {column} IS NOT NULL"
+            )
+        self.conn.execute(
+            f"CREATE OR REPLACE TEMP TABLE {table} AS {' UNION ALL '.join(selects)}"
+        )
+        return table
+
+    def _minhash_signatures(self, table: str) -> Dict[int, Dict[int, int]]:
+        """One-permutation MinHash signature (bucket -> minimum) per column."""
+        rows = self.conn.execute(
+            f"""
+            SELECT column_id, hash(value) % {self.minhash_buckets} AS bucket,
+                   min(hash(value)) AS minimum
+            FROM {table}
+            GROUP BY ALL
+            """
+        ).fetchall()
+
+        signatures = {}
+        for column_id, bucket, minimum in rows:
+            signatures.setdefault(column_id, {})[bucket] = minimum
+        return signatures
+
+    def _passes_minhash(
+        self, signatures: Dict[int, Dict[int, int]], dep: int, ref: int
+    ) -> bool:
+        """Whether the signatures allow the dependent's required containment."""
+        dep_signature = signatures.get(dep, {})
+        ref_signature = signatures.get(ref, {})
+        if not dep_signature:
+            return False
+
+        violations = sum(
+            1
+            for bucket, minimum in dep_signature.items()
+            if ref_signature.get(bucket, minimum + 1) > minimum
+        )
+        tolerance = 0 if self.min_containment >= 1 else MINHASH_TOLERANCE
+        allowed = (1 - self.min_containment + tolerance) * len(dep_signature)
+        return violations <= allowed
+
+    def _count_missing(
+        self, table: str, candidates: List[Tuple[int, int]]
+    ) -> Dict[Tuple[int, int], int]:
+        """Dependent values absent from the referenced column, per candidate."""
+        missing = dict.fromkeys(candidates, 0)
+        for start in range(0, len(candidates), self.batch_size):
+            batch = candidates[start : start + self.batch_size]
+            pairs = ", ".join(f"({dep}, {ref})" for dep, ref in batch)
+            rows = self.conn.execute(
+                f"""
+                WITH candidates(dependent_id, referenced_id) AS (VALUES {pairs}),
+                dependent_values AS (
+                    SELECT c.dependent_id, c.referenced_id, v.value
+                    FROM candidates c
+                    JOIN {table} v ON v.column_id = c.dependent_id
+                )
+                SELECT d.dependent_id, d.referenced_id, count(*) AS missing
+                FROM dependent_values d
+                ANTI JOIN {table} r
+                    ON r.column_id = d.referenced_id AND r.value = d.value
+                GROUP BY ALL
+                """
+            ).fetchall()
+            for dep, ref, count in rows:
+                missing[dep, ref] = count
+        return missing
+
+    @staticmethod
+    def _dependency(
+        dep_col: Dict[str, Any], ref_col: Dict[str, Any], missing: int
+    ) -> Dict[str, Any]:
+        """Describe a verified dependent -> referenced pair."""
+        shared = dep_col["distinct"] - missing
+        return {
+            "dependent_table": dep_col["relation"],
+            "dependent_column": dep_col["column"],
+            "referenced_table": ref_col["relation"],
+            "referenced_column": ref_col["column"],
+            "containment_ratio": round(shared / dep_col["distinct"], 4),
+            "referenced_coverage": round(shared / ref_col["distinct"], 4),
+            "dependent_distinct": dep_col["distinct"],
+            "missing_values": missing,
+            "one_to_one": dep_col["unique"],
+        }
+
+
+def _names_related(column: str, table: str, referenced_column: str) -> bool:
+    """Whether a column's name points at a table or its referenced column."""
+    if column == referenced_column:
+        return True
+    stem = column[:-3] if column.endswith("_id") else column
+    plurals = {stem, f"{stem}s", f"{stem}es"}
+    if stem.endswith("y"):
+        plurals.add(f"{stem[:-1]}ies")
+    return table in plurals
+
+
+def is_probable_foreign_key(
+    dependency: Dict[str, Any], min_coverage: float = MIN_COVERAGE
+) -> bool:
+    """
+    Decide whether an inclusion dependency is likely a real foreign key.
+
+    Containment alone also holds by accident, e.g. between small integer
+    counts and a surrogate key range. A dependency is accepted when the
+    column name points at the referenced table or column; otherwise it has
+    to be many-to-one and use a large share of the referenced values.
+
+    Args:
+        dependency: Result of InclusionDependencyFinder.find()
+        min_coverage: Minimum referenced coverage without a naming match
+
+    Returns:
+        bool: True if the dependency should be reported as a foreign key
+    """
+    if _names_related(
+        dependency["dependent_column"],
+        dependency["referenced_table"],
+        dependency["referenced_column"],
+    ):
+        return True
+    if dependency["one_to_one"]:
+        return False
+    return dependency["referenced_coverage"] >= min_coverage
@@ -0,0 +1,100 @@
+"""
+Query normalization and fingerprinting.
+
+Reduces a SQL query to its "shape" so that executions differing only in
+literal values, whitespace, comments or identifier case group together.
+"""
+
+import hashlib
+import re
+from typing import List
+
+# Comments: -- to end of line, and /* ... */ blocks
+_LINE_COMMENT = re.compile(r"--[^\n]*")
+_BLOCK_COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+
+# String literals with '' escapes, and numeric literals not part of identifiers
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])[-+]?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b")
+
+# Double-quoted identifiers are case-insensitive in DuckDB unless quoted
+_QUOTED_IDENTIFIER = re.compile(r'"((?:[^"]|"")*)"')
+
+# Lists of placeholders, e.g. IN (?, ?, ?) -> IN (?)
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a SQL query to its literal-free shape.
+
+    Comments are removed, string and numeric literals become ``?``, quoted
+    identifiers are unquoted, and case and whitespace are normalized.
+
+    Args:
+        query: SQL query text
+
+    Returns:
+        Normalized query text
+    """
+    if not query:
+        return ""
+
+    normalized = _BLOCK_COMMENT.sub(" ", query)
+    normalized = _LINE_COMMENT.sub(" ", normalized)
+    normalized = _STRING_LITERAL.sub("?", normalized)
+    normalized = _QUOTED_IDENTIFIER.sub(
+        lambda m: m.group(1).replace('""', '"'), normalized
+    )
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _PLACEHOLDER_LIST.sub("?", normalized)
+    normalized = _WHITESPACE.sub(" ", normalized).strip().lower()
+
+    return normalized.rstrip("; ")
+
+
+def fingerprint_query(query: str) -> str:
+    """
+    Compute a short, stable fingerprint of a query's normalized shape.
+
+    Args:
+        query: SQL query text
+
+    Returns:
+        16-character hex digest
+    """
+    return hashlib.sha1(normalize_query(query).encode("utf-8")).hexdigest()[:16]
+
+
+# Table references following FROM/JOIN; table functions such as read_parquet(...)
+# are excluded by the negative lookahead
+_TABLE_REFERENCE = re.compile(r"\b(?:from|join)\s+([a-z_][\w.]*)\b(?!\s*\()")
+
+# Common table expression names, e.g. WITH totals AS (...), ranked AS (...)
+_CTE_NAME = re.compile(r"(?:\bwith(?:\s+recursive)?|,)\s+([a-z_]\w*)\s+as\s*\(")
+
+
+def extract_tables(query: str) -> List[str]:
+    """
+    Extract the tables a query reads from its FROM and JOIN clauses.
+
+    CTE names are excluded so only base tables are reported. This is a
+    lightweight heuristic for workload reporting, not a SQL parser.
+
+    Args:
+        query: SQL query text (raw or normalized)
+
+    Returns:
+        Sorted list of distinct table names
+    """
+    normalized = normalize_query(query)
+    cte_names = set(_CTE_NAME.findall(normalized))
+
+    tables = {
+        name.split(".")[-1]
+        for name in _TABLE_REFERENCE.findall(normalized)
+        if name not in cte_names
+    }
+    return sorted(tables)
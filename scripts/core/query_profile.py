@@ -0,0 +1,129 @@
+"""
+Query profiling helpers built on DuckDB's JSON profiler.
+
+Runs a query with ``enable_profiling='json'`` and turns the raw profile into
+a compact plan tree (operator name, timing, cardinality, details) that the
+SQL helper and the practice app can display.
+"""
+
+import json
+import os
+import tempfile
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def run_with_profile(
+    conn, query: str, fetch: Callable[[Any], Any]
+) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Execute a query with JSON profiling enabled.
+
+    Args:
+        conn: Open DuckDB connection
+        query: SQL query to execute
+        fetch: Callable that materializes the result from the executed cursor
+
+    Returns:
+        Tuple of (fetched result, summarized profile)
+    """
+    fd, profile_path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+
+    try:
+        escaped_path = profile_path.replace("'", "''")
+        conn.execute("PRAGMA enable_profiling='json'")
+        conn.execute(f"PRAGMA profiling_output='{escaped_path}'")
+        try:
+            data = fetch(conn.execute(query))
+        finally:
+            conn.execute("PRAGMA disable_profiling")
+
+        with open(profile_path, encoding="utf-8") as f:
+            raw_profile = json.load(f)
+    finally:
+        os.unlink(profile_path)
+
+    return data, summarize_profile(raw_profile)
+
+
+def summarize_profile(raw_profile: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a raw DuckDB JSON profile into a compact plan summary.
+
+    Handles both the current profile layout (``operator_name``,
+    ``operator_timing``, ...) and the older one (``name``, ``timing``, ...).
+
+    Args:
+        raw_profile: Parsed JSON profile written by DuckDB
+
+    Returns:
+        Dictionary with total latency, rows returned and the operator tree
+    """
+    latency = raw_profile.get("latency", raw_profile.get("timing"))
+    if latency is None and isinstance(raw_profile.get("result"), (int, float)):
+        latency = raw_profile["result"]
+
+    plan = [_summarize_node(child) for child in raw_profile.get("children", [])]
+
+    return {
+        "latency": _round(latency),
+        "cpu_time": _round(raw_profile.get("cpu_time")),
+        "rows_returned": raw_profile.get("rows_returned"),
+        "rows_scanned": raw_profile.get("cumulative_rows_scanned"),
+        "plan": plan,
+    }
+
+
+def _summarize_node(node: Dict[str, Any]) -> Dict[str, Any]:
+    """Summarize a single operator node and its children."""
+    name = node.get("operator_name") or node.get("operator_type") or node.get("name")
+    timing = node.get("operator_timing", node.get("timing"))
+    cardinality = node.get("operator_cardinality", node.get("cardinality"))
+
+    extra_info = node.get("extra_info", node.get("extra-info", {}))
+    if isinstance(extra_info, str):
+        extra_info = {"details": extra_info.strip()} if extra_info.strip() else {}
+
+    return {
+        "name": (name or "UNKNOWN").strip(),
+        "timing": _round(timing),
+        "cardinality": cardinality,
+        "rows_scanned": node.get("operator_rows_scanned"),
+        "extra_info": extra_info,
+        "children": [_summarize_node(child) for child in node.get("children", [])],
+    }
+
+
+def format_profile(profile: Dict[str, Any]) -> List[str]:
+    """
+    Render a profile summary as indented text lines for console display.
+
+    Args:
+        profile: Summary returned by summarize_profile
+
+    Returns:
+        List of lines, one per operator
+    """
+    lines = [
+        f"Total: {profile.get('latency')}s, rows returned: {profile.get('rows_returned')}"
+    ]
+
+    def walk(node: Dict[str, Any], depth: int) -> None:
+        lines.append(
+            f"{'  ' * depth}└─ {node['name']} "
+            f"({node['timing']}s, {node['cardinality']} rows)"
+        )
+        for child in node["children"]:
+            walk(child, depth + 1)
+
+    for root in profile.get("plan", []):
+        walk(root, 0)
+
+    return lines
+
+
+def _round(value: Any) -> Any:
+    """Round timings for display while leaving missing values untouched."""
+    if isinstance(value, (int, float)):
+        return round(float(value), 6)
+    return value
@@ -1,9 +1,21 @@
+import atexit
+import threading
 import traceback
 from pathlib import Path
 from typing import Any, Dict, Optional
 
 import duckdb
-import pandas as pd
+
+from scripts.core.query_profile import format_profile, run_with_profile
+
+# Supported result containers for SQLHelper.execute_query
+OUTPUT_FORMATS = ("pandas", "arrow", "batches")
+
+# Default number of rows per Arrow record batch when streaming results
+DEFAULT_BATCH_SIZE = 100_000
+
+# Leading keywords of statements that cannot change the database
+READ_ONLY_KEYWORDS = ("select", "with", "show", "describe", "summarize", "from")
 
 
 class SQLHelper:
@@ -12,16 +24,41 @@ class SQLHelper:
     Designed for educational use with built-in safety and formatting features.
     """
 
-    def __init__(self, db_path: str = "datasets/data_jobs.db"):
+    def __init__(
+        self,
+        db_path: str = "datasets/data_jobs.db",
+        lazy: bool = False,
+        cache_results: bool = False,
+    ):
         """
         Initialize the SQL helper with a database connection.
 
         Args:
             db_path: Path to the DuckDB database file
+            lazy: Defer connecting until the first query is executed
+            cache_results: Reuse results of repeated read-only queries
         """
         self.db_path = Path(db_path)
         self.conn = None
-        self._connect()
+        self.cache_results = cache_results
+        self._result_cache = {}
+        if not lazy:
+            self._connect()
+
+    @classmethod
+    def from_connection(cls, conn: duckdb.DuckDBPyConnection) -> "SQLHelper":
+        """
+        Wrap an existing connection, such as an in-memory scratch database.
+
+        Args:
+            conn: Open DuckDB connection; the helper closes it on close()
+
+        Returns:
+            SQLHelper: Helper executing queries on the connection
+        """
+        helper = cls(":memory:", lazy=True)
+        helper.conn = conn
+        return helper
 
     def _connect(self):
         """Establish connection to the database."""
@@ -36,18 +73,39 @@ class SQLHelper:
             print(f"❌ Failed to connect to database: {e}")
             raise
 
+    def _ensure_connected(self):
+        """Connect on first use for helpers created with lazy=True."""
+        if self.conn is None:
+            self._connect()
+
     def execute_query(
-        self, query: str, exercise_number: Optional[int] = None
+        self,
+        query: str,
+        exercise_number: Optional[int] = None,
+        output_format: str = "pandas",
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        profile: bool = False,
     ) -> Dict[str, Any]:
         """
         Execute a SQL query and return formatted results.
 
+        Results are fetched natively from DuckDB rather than through
+        pandas' generic DBAPI path.
+
         Args:
             query: SQL query string
             exercise_number: Optional exercise number for context
+            output_format: Result container - "pandas" (DataFrame), "arrow"
+                (pyarrow.Table) or "batches" (pyarrow.RecordBatchReader)
+            batch_size: Rows per record batch when output_format is "batches"
+            profile: Capture DuckDB's JSON query profile (per-operator timings,
+                cardinalities and plan tree) under the "profile" key
 
         Returns:
-            Dictionary containing status, data, and metadata
+            Dictionary containing status, data, and metadata. For "batches"
+            the row_count is None because the result has not been consumed
+            yet, and execution_time only covers running the query up to the
+            reader, not fetching its batches.
         """
         result = {
             "status": "success",
@@ -58,9 +116,18 @@ class SQLHelper:
             "row_count": 0,
             "columns": [],
             "execution_time": None,
+            "output_format": output_format,
         }
 
         try:
+            if output_format not in OUTPUT_FORMATS:
+                raise ValueError(
+                    f"Unsupported output_format '{output_format}' "
+                    f"(expected one of: {', '.join(OUTPUT_FORMATS)})"
+                )
+            if profile and output_format == "batches":
+                raise ValueError("Profiling requires a fully materialized result")
+
             # Clean and validate query
             clean_query = self._clean_query(query)
             if not clean_query:
@@ -68,24 +135,55 @@ class SQLHelper:
                 result["error"] = "Empty or invalid query"
                 return result
 
+            # Serve repeated read-only queries from the session cache
+            cache_key = (clean_query, output_format)
+            cacheable = (
+                self.cache_results
+                and not profile
+                and output_format != "batches"
+                and self._is_read_only(clean_query)
+            )
+            if cacheable and cache_key in self._result_cache:
+                return self._cached_result(cache_key, exercise_number)
+
             # Execute query with timing
             import time
 
             start_time = time.time()
 
-            df = pd.read_sql(clean_query, self.conn)
+            if profile:
+                self._ensure_connected()
+                (data, row_count, columns), result["profile"] = run_with_profile(
+                    self.conn,
+                    clean_query,
+                    lambda cursor: self._materialize(cursor, output_format),
+                )
+            else:
+                data, row_count, columns = self._fetch_result(
+                    clean_query, output_format, batch_size
+                )
 
             end_time = time.time()
             result["execution_time"] = round(end_time - start_time, 3)
 
             # Format results
-            result["data"] = df
-            result["row_count"] = len(df)
-            result["columns"] = df.columns.tolist()
+            result["data"] = data
+            result["row_count"] = row_count
+            result["columns"] = columns
+            result["cache_hit"] = False
 
             # Add summary for large results
-            if len(df) > 100:
-                result["summary"] = f"Query returned {len(df)} rows (showing first 100)"
+            if row_count is not None and row_count > 100:
+                result["summary"] = (
+                    f"Query returned {row_count} rows (showing first 100)"
+                )
+
+            if cacheable:
+                # Cache a copy so callers mutating their result don't alter it
+                self._result_cache[cache_key] = self._copy_result(result)
+            elif not self._is_read_only(clean_query):
+                # Tables may have changed, so earlier results are stale
+                self._result_cache.clear()
 
         except Exception as e:
             result["status"] = "error"
@@ -95,6 +193,86 @@ class SQLHelper:
 
         return result
 
+    def _fetch_result(self, query: str, output_format: str, batch_size: int):
+        """
+        Execute a query and fetch the result in the requested container.
+
+        Returns:
+            Tuple of (data, row_count, columns)
+        """
+        self._ensure_connected()
+
+        if output_format == "batches":
+            import pyarrow as pa
+
+            # Stream from a dedicated cursor so later queries on the main
+            # connection do not invalidate the reader before it is consumed
+            cursor = self.conn.cursor()
+            try:
+                cursor.execute(query)
+                columns = [desc[0] for desc in cursor.description or []]
+                fetch = (
+                    getattr(cursor, "to_arrow_reader", None)
+                    or cursor.fetch_record_batch
+                )
+                reader = fetch(batch_size)
+            except BaseException:
+                cursor.close()
+                raise
+
+            def stream():
+                # Close the cursor once the reader is exhausted or discarded
+                try:
+                    yield from reader
+                finally:
+                    cursor.close()
+
+            return (
+                pa.RecordBatchReader.from_batches(reader.schema, stream()),
+                None,
+                columns,
+            )
+
+        return self._materialize(self.conn.execute(query), output_format)
+
+    def _materialize(self, cursor, output_format: str):
+        """Fetch an executed cursor as a DataFrame or Arrow table."""
+        if output_format == "arrow":
+            fetch = getattr(cursor, "to_arrow_table", None) or cursor.fetch_arrow_table
+            table = fetch()
+            return table, table.num_rows, table.column_names
+
+        df = cursor.df()
+        return df, len(df), df.columns.tolist()
+
+    def _cached_result(self, cache_key, exercise_number: Optional[int]):
+        """Build a result dictionary from a cached execution."""
+        result = self._copy_result(self._result_cache[cache_key])
+        result["exercise_number"] = exercise_number
+        result["cache_hit"] = True
+        return result
+
+    @staticmethod
+    def _copy_result(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy a result so the copy's DataFrame can be mutated independently."""
+        result = dict(result)
+        if result["output_format"] == "pandas" and result["data"] is not None:
+            # Arrow tables are immutable; DataFrames need a deep copy
+            result["data"] = result["data"].copy(deep=True)
+        return result
+
+    def _is_read_only(self, query: str) -> bool:
+        """Check whether a cleaned query is a single read-only statement."""
+        statements = [part for part in query.split(";") if part.strip()]
+        if len(statements) != 1:
+            return False
+        first_word = statements[0].split(None, 1)[0].lower()
+        return first_word in READ_ONLY_KEYWORDS
+
+    def clear_cache(self) -> None:
+        """Drop all cached query results."""
+        self._result_cache.clear()
+
     def _clean_query(self, query: str) -> str:
         """Clean and validate SQL query."""
         if not query or not isinstance(query, str):
@@ -149,21 +327,39 @@ class SQLHelper:
             return
 
         print(f"✅ Success! ({result['execution_time']}s)")
+
+        output_format = result.get("output_format", "pandas")
+        if output_format == "batches":
+            # Displaying would consume the stream the caller asked for
+            print(f"📋 Columns: {', '.join(result['columns'])}")
+            print("🌊 Streaming result (record batches not displayed)")
+            print("=" * 60)
+            return
+
         print(f"📊 Rows: {result['row_count']}, Columns: {len(result['columns'])}")
 
-        if result["data"] is not None and not result["data"].empty:
+        if result["data"] is not None and result["row_count"] > 0:
             print(f"📋 Columns: {', '.join(result['columns'])}")
             print()
 
             # Display data
-            display_df = result["data"].head(max_rows)
+            if output_format == "arrow":
+                display_df = result["data"].slice(0, max_rows).to_pandas()
+            else:
+                display_df = result["data"].head(max_rows)
             print(display_df.to_string(index=False))
 
-            if len(result["data"]) > max_rows:
-                print(f"... and {len(result['data']) - max_rows} more rows")
+            if result["row_count"] > max_rows:
+                print(f"... and {result['row_count'] - max_rows} more rows")
         else:
             print("📭 No data returned")
 
+        if result.get("profile"):
+            print()
+            print("🔬 Query Profile:")
+            for line in format_profile(result["profile"]):
+                print(f"   {line}")
+
         print("=" * 60)
 
     def run_exercise(
@@ -217,6 +413,8 @@ class SQLHelper:
         """Close the database connection."""
         if self.conn:
             self.conn.close()
+            self.conn = None
+            self._result_cache.clear()
             print("🔒 Database connection closed")
 
 
@@ -233,9 +431,72 @@ def create_sql_helper(db_path: str = "datasets/data_jobs.db") -> SQLHelper:
     return SQLHelper(db_path)
 
 
+# Process-wide SQLHelper instances shared by the notebook helper functions,
+# keyed by resolved database path
+_helper_registry: Dict[str, SQLHelper] = {}
+_registry_lock = threading.Lock()
+
+
+def get_sql_helper(db_path: str = "datasets/data_jobs.db") -> SQLHelper:
+    """
+    Get the shared SQLHelper for a database, creating it on first use.
+
+    The helper connects lazily and stays open for the rest of the session,
+    so repeated notebook cells reuse the same warm connection.
+
+    Args:
+        db_path: Path to the database file
+
+    Returns:
+        Shared SQLHelper instance
+    """
+    key = str(Path(db_path).resolve())
+    with _registry_lock:
+        helper = _helper_registry.get(key)
+        if helper is None:
+            helper = SQLHelper(db_path, lazy=True)
+            _helper_registry[key] = helper
+        return helper
+
+
+def enable_result_cache(
+    enabled: bool = True, db_path: str = "datasets/data_jobs.db"
+) -> None:
+    """
+    Turn the per-session result cache on or off for a shared helper.
+
+    While enabled, re-running an identical read-only query returns the
+    previous result without executing it again. Any write statement
+    clears the cache.
+
+    Args:
+        enabled: Whether results should be cached
+        db_path: Path to the database file
+    """
+    helper = get_sql_helper(db_path)
+    helper.cache_results = enabled
+    if not enabled:
+        helper.clear_cache()
+
+
+def close_all_helpers() -> None:
+    """Close every shared SQLHelper connection (registered with atexit)."""
+    with _registry_lock:
+        helpers = list(_helper_registry.values())
+        _helper_registry.clear()
+    for helper in helpers:
+        helper.close()
+
+
+atexit.register(close_all_helpers)
+
+
 # Example usage functions for students
 def run_sql(
-    query: str, exercise_number: int = None, max_rows: int = 100
+    query: str,
+    exercise_number: int = None,
+    max_rows: int = 100,
+    db_path: str = "datasets/data_jobs.db",
 ) -> Dict[str, Any]:
     """
     Quick function to run SQL queries with formatted output.
@@ -244,47 +505,35 @@ def run_sql(
         query: SQL query string
         exercise_number: Optional exercise number
         max_rows: Maximum rows to display
+        db_path: Path to the database file
 
     Returns:
         Result dictionary
     """
-    helper = create_sql_helper()
-    try:
-        if exercise_number:
-            return helper.run_exercise(query, exercise_number, max_rows)
-        else:
-            result = helper.execute_query(query)
-            helper.display_result(result, max_rows)
-            return result
-    finally:
-        helper.close()
+    helper = get_sql_helper(db_path)
+    if exercise_number:
+        return helper.run_exercise(query, exercise_number, max_rows)
+    else:
+        result = helper.execute_query(query)
+        helper.display_result(result, max_rows)
+        return result
 
 
-def show_tables():
+def show_tables(db_path: str = "datasets/data_jobs.db"):
     """Show all available tables in the database."""
-    helper = create_sql_helper()
-    try:
-        helper.get_table_info()
-    finally:
-        helper.close()
+    get_sql_helper(db_path).get_table_info()
 
 
-def describe_table(table_name: str):
+def describe_table(table_name: str, db_path: str = "datasets/data_jobs.db"):
     """Show structure of a specific table."""
-    helper = create_sql_helper()
-    try:
-        helper.get_table_info(table_name)
-    finally:
-        helper.close()
+    get_sql_helper(db_path).get_table_info(table_name)
 
 
-def sample_data(table_name: str, limit: int = 5):
+def sample_data(
+    table_name: str, limit: int = 5, db_path: str = "datasets/data_jobs.db"
+):
     """Show sample data from a table."""
-    helper = create_sql_helper()
-    try:
-        helper.get_sample_data(table_name, limit)
-    finally:
-        helper.close()
+    get_sql_helper(db_path).get_sample_data(table_name, limit)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Benchmark the physical layouts declared in the table creation JSON.
+
+Copies a week's schema tables into two in-memory databases: one in build
+order (surrogate id order, i.e. hash-sample order) and one with each
+table's "layout" applied (sort order and ART indexes). The week's solution
+queries are then run against both and their median times compared. Results
+of both runs are checked to be the same rows.
+
+Usage:
+    python scripts/data_schema_generation/benchmark_layout.py --week 4
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List
+
+import duckdb
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from scripts.data_schema_generation.create_tables_from_queries import (  # noqa: E402
+    layout_statements,
+    load_table_queries,
+)
+
+# Timed runs per query and layout, after one warm-up run
+DEFAULT_REPEATS = 5
+
+# Names of the attached databases holding each variant
+BASELINE = "baseline"
+OPTIMIZED = "optimized"
+
+
+def load_layout_databases(
+    conn: duckdb.DuckDBPyConnection,
+    source_path: str,
+    tables: List[str],
+    definitions: Dict[str, Dict[str, Any]],
+) -> None:
+    """
+    Copy tables into a build-order and a layout-optimized in-memory database.
+
+    Args:
+        conn: Connection receiving the databases
+        source_path: Database holding the built tables
+        tables: Tables to copy
+        definitions: Table entries of the table creation queries JSON
+    """
+    escaped_source = str(source_path).replace("'", "''")
+    conn.execute(f"ATTACH '{escaped_source}' AS source (READ_ONLY)")
+    conn.execute(f"ATTACH ':memory:' AS {BASELINE}")
+    conn.execute(f"ATTACH ':memory:' AS {OPTIMIZED}")
+
+    for table_name in tables:
+        layout = definitions.get(table_name, {}).get("layout", {})
+        columns = conn.execute(f'DESCRIBE source.main."{table_name}"').fetchall()
+        first_column = columns[0][0]
+        conn.execute(
+            f'CREATE TABLE {BASELINE}."{table_name}" AS '
+            f'SELECT * FROM source.main."{table_name}" ORDER BY "{first_column}"'
+        )
+        sort_by = layout.get("sort_by", [first_column])
+        conn.execute(
+            f'CREATE TABLE {OPTIMIZED}."{table_name}" AS '
+            f'SELECT * FROM source.main."{table_name}" ORDER BY {", ".join(sort_by)}'
+        )
+        conn.execute(f"USE {OPTIMIZED}")
+        for statement in layout_statements(table_name, layout):
+            conn.execute(statement)
+
+    conn.execute("DETACH source")
+
+
+def time_query(
+    conn: duckdb.DuckDBPyConnection, database: str, query: str, repeats: int
+) -> Dict[str, Any]:
+    """
+    Time a query against one of the attached databases.
+
+    Args:
+        conn: Connection with the databases attached
+        database: Database the query's tables resolve to
+        query: Query to run
+        repeats: Timed runs after one warm-up run
+
+    Returns:
+        dict: Median seconds and the result rows as a multiset
+    """
+    conn.execute(f"USE {database}")
+    rows = conn.execute(query).fetchall()
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        conn.execute(query).fetchall()
+        timings.append(time.perf_counter() - started)
+    return {"seconds": statistics.median(timings), "rows": Counter(rows)}
+
+
+def benchmark_solutions(
+    conn: duckdb.DuckDBPyConnection,
+    exercises: List[Dict[str, Any]],
+    repeats: int = DEFAULT_REPEATS,
+) -> List[Dict[str, Any]]:
+    """
+    Run each exercise's solution against both layouts.
+
+    Args:
+        conn: Connection prepared by load_layout_databases
+        exercises: Exercises with "id" and "solution"
+        repeats: Timed runs per query and layout
+
+    Returns:
+        list: Per exercise id, baseline and optimized seconds, speedup,
+            whether the results match, or the error
+    """
+    results = []
+    for exercise in exercises:
+        solution = exercise.get("solution", "").strip().rstrip(";")
+        if not solution:
+            continue
+        try:
+            baseline = time_query(conn, BASELINE, solution, repeats)
+            optimized = time_query(conn, OPTIMIZED, solution, repeats)
+        except duckdb.Error as e:
+            results.append({"id": exercise.get("id"), "error": str(e)})
+            continue
+        results.append(
+            {
+                "id": exercise.get("id"),
+                "baseline_seconds": baseline["seconds"],
+                "optimized_seconds": optimized["seconds"],
+                "speedup": baseline["seconds"] / max(optimized["seconds"], 1e-9),
+                "results_match": baseline["rows"] == optimized["rows"],
+            }
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark a week's solution queries with and without table layouts"
+    )
+    parser.add_argument("--week", type=int, default=4, help="Week number (default: 4)")
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=DEFAULT_REPEATS,
+        help=f"Timed runs per query (default: {DEFAULT_REPEATS})",
+    )
+    parser.add_argument(
+        "--base-path",
+        default=str(Path(__file__).resolve().parent.parent.parent),
+        help="Project root (default: this repository)",
+    )
+    args = parser.parse_args()
+
+    from scripts.practice_app.data_service import DataService
+
+    data_service = DataService(base_path=args.base_path, week=args.week)
+    try:
+        exercises = data_service.load_exercises()
+        source_path = data_service.get_source_database_path()
+        definitions = load_table_queries(data_service.current_dataset)["tables"]
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    tables = exercises.get("metadata", {}).get("schema_tables", [])
+    with_layout = [name for name in tables if definitions.get(name, {}).get("layout")]
+    print(
+        f"📐 Week {args.week} tables with a layout: {', '.join(with_layout) or 'none'}"
+    )
+
+    conn = duckdb.connect()
+    try:
+        load_layout_databases(conn, source_path, tables, definitions)
+        results = benchmark_solutions(conn, exercises["exercises"], args.repeats)
+    finally:
+        conn.close()
+
+    print(f"\n⏱️  Median of {args.repeats} runs per solution query:")
+    print(f"   {'Exercise':>8}  {'Build order':>12}  {'Layout':>10}  {'Speedup':>8}")
+    baseline_total = optimized_total = 0.0
+    for result in results:
+        if "error" in result:
+            print(f"   {result['id']:>8}  ❌ {result['error']}")
+            continue
+        baseline_total += result["baseline_seconds"]
+        optimized_total += result["optimized_seconds"]
+        mismatch = "" if result["results_match"] else "  ⚠️  results differ"
+        print(
+            f"   {result['id']:>8}  {result['baseline_seconds'] * 1000:>10.1f}ms"
+            f"  {result['optimized_seconds'] * 1000:>8.1f}ms"
+            f"  {result['speedup']:>7.2f}x{mismatch}"
+        )
+    if optimized_total:
+        print(
+            f"\n📊 Total: {baseline_total * 1000:.1f}ms → "
+            f"{optimized_total * 1000:.1f}ms "
+            f"({baseline_total / optimized_total:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""
+Build manifest for incremental table creation.
+
+Each database keeps a ``_build_manifest`` table recording, per derived
+table, the hash of the query that built it, the fingerprints of the tables
+it read and when it was built. A table is rebuilt when any of these no
+longer match; tables built from it are rebuilt after it.
+
+Source tables are fingerprinted by schema, row count and an
+order-independent sum of row hashes, so any change to their content is
+detected. Derived inputs are fingerprinted by their own build hash.
+
+Fingerprinting a large source table means scanning all of it, so the
+result is cached in ``_source_fingerprints`` under the table's storage
+signature: its schema, row count and the checkpointed segments DuckDB
+reports for it. Rewriting the table's data changes its segments, and
+deleting rows changes its count, so a cached fingerprint is only reused
+while the table is stored exactly as when it was computed.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+import duckdb
+
+# Name of the bookkeeping table; tables starting with "_" are internal
+BUILD_MANIFEST_TABLE = "_build_manifest"
+
+# Cached source table fingerprints, keyed on their storage signature
+SOURCE_FINGERPRINT_TABLE = "_source_fingerprints"
+
+
+def query_hash(query: str) -> str:
+    """
+    Hash the SQL that builds a table.
+
+    Args:
+        query: Expanded CREATE TABLE statement
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    return hashlib.sha256(query.strip().encode("utf-8")).hexdigest()
+
+
+def fingerprint_table(conn: duckdb.DuckDBPyConnection, table_name: str) -> str:
+    """
+    Fingerprint a table's schema and content independent of row order.
+
+    Args:
+        conn: Connection the table is visible in
+        table_name: Table or view to fingerprint
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    schema = conn.execute(f'DESCRIBE "{table_name}"').fetchall()
+    row_count, content = conn.execute(
+        f'SELECT count(*), sum(hash(*COLUMNS(*)))::VARCHAR FROM "{table_name}"'
+    ).fetchone()
+    parts = [[column[0], column[1]] for column in schema] + [row_count, content]
+    return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
+
+
+def storage_signature(
+    conn: duckdb.DuckDBPyConnection, table_name: str
+) -> Optional[str]:
+    """
+    Hash a table's schema, row count and storage segments without scanning it.
+
+    Args:
+        conn: Connection the table is visible in
+        table_name: Table to describe
+
+    Returns:
+        Hex SHA-256 digest, or None for views and tables with data that is
+        not checkpointed yet
+    """
+    escaped = table_name.replace("'", "''")
+    try:
+        segments = conn.execute(
+            f"SELECT * FROM pragma_storage_info('{escaped}') "
+            "ORDER BY row_group_id, column_id, segment_id"
+        ).fetchall()
+        columns = [column[0] for column in conn.description]
+        schema = conn.execute(f'DESCRIBE "{table_name}"').fetchall()
+        row_count = conn.execute(f'SELECT count(*) FROM "{table_name}"').fetchone()[0]
+    except duckdb.Error:
+        return None
+
+    persistent = columns.index("persistent")
+    if not all(segment[persistent] for segment in segments):
+        return None
+    parts = [[list(column[:2]) for column in schema], row_count, segments]
+    return hashlib.sha256(json.dumps(parts, default=str).encode("utf-8")).hexdigest()
+
+
+def cached_fingerprint(conn: duckdb.DuckDBPyConnection, table_name: str) -> str:
+    """
+    Fingerprint a table, reusing the stored result while its storage is unchanged.
+
+    Args:
+        conn: Connection to the database holding the table
+        table_name: Source table to fingerprint
+
+    Returns:
+        Hex SHA-256 digest, as fingerprint_table() computes it
+    """
+    signature = storage_signature(conn, table_name)
+    if signature is None:
+        return fingerprint_table(conn, table_name)
+
+    try:
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {SOURCE_FINGERPRINT_TABLE} ("
+            "table_name VARCHAR PRIMARY KEY, storage_signature VARCHAR, "
+            "fingerprint VARCHAR)"
+        )
+        cached = conn.execute(
+            f"SELECT fingerprint FROM {SOURCE_FINGERPRINT_TABLE} "
+            "WHERE table_name = ? AND storage_signature = ?",
+            [table_name, signature],
+        ).fetchone()
+    except duckdb.Error:
+        # Read-only databases cannot keep a cache
+        return fingerprint_table(conn, table_name)
+    if cached:
+        return cached[0]
+
+    fingerprint = fingerprint_table(conn, table_name)
+    conn.execute(
+        f"INSERT OR REPLACE INTO {SOURCE_FINGERPRINT_TABLE} VALUES (?, ?, ?)",
+        [table_name, signature, fingerprint],
+    )
+    return fingerprint
+
+
+class BuildManifest:
+    """Per-table build records stored in the database they describe."""
+
+    def __init__(self, conn: duckdb.DuckDBPyConnection):
+        """
+        Initialize the manifest, creating its table if needed.
+
+        Args:
+            conn: Connection to the target database
+        """
+        self.conn = conn
+        self.conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {BUILD_MANIFEST_TABLE} (
+                table_name VARCHAR PRIMARY KEY,
+                query_hash VARCHAR,
+                input_fingerprints VARCHAR,
+                row_count BIGINT,
+                build_seconds DOUBLE,
+                built_at TIMESTAMP
+            )
+            """
+        )
+
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Load all build records.
+
+        Returns:
+            dict: Table name -> query_hash, input_fingerprints, row_count,
+                build_seconds and built_at
+        """
+        rows = self.conn.execute(
+            f"SELECT table_name, query_hash, input_fingerprints, row_count, "
+            f"build_seconds, built_at FROM {BUILD_MANIFEST_TABLE}"
+        ).fetchall()
+        return {
+            row[0]: {
+                "query_hash": row[1],
+                "input_fingerprints": json.loads(row[2]),
+                "row_count": row[3],
+                "build_seconds": row[4],
+                "built_at": row[5],
+            }
+            for row in rows
+        }
+
+    def record(
+        self,
+        table_name: str,
+        table_query_hash: str,
+        input_fingerprints: Dict[str, str],
+        row_count: Optional[int],
+        build_seconds: Optional[float],
+    ) -> None:
+        """
+        Record a successful build, replacing the table's previous record.
+
+        Args:
+            table_name: Table that was built
+            table_query_hash: query_hash() of the SQL that built it
+            input_fingerprints: Input table name -> fingerprint
+            row_count: Rows in the built table
+            build_seconds: Time taken by the build
+        """
+        self.conn.execute(
+            f"INSERT OR REPLACE INTO {BUILD_MANIFEST_TABLE} "
+            "VALUES (?, ?, ?, ?, ?, current_timestamp::TIMESTAMP)",
+            [
+                table_name,
+                table_query_hash,
+                json.dumps(input_fingerprints, sort_keys=True),
+                row_count,
+                build_seconds,
+            ],
+        )
+
+    def remove(self, table_name: str) -> None:
+        """
+        Forget a table's build record.
+
+        Args:
+            table_name: Table whose record is removed
+        """
+        self.conn.execute(
+            f"DELETE FROM {BUILD_MANIFEST_TABLE} WHERE table_name = ?", [table_name]
+        )
@@ -5,15 +5,72 @@ Phase 1: Deterministic Table Creation Script
 Loads table creation queries from table_creation_queries_[dataset].json
 and executes them against the target database.
 
+Tables may declare a "sampling" block instead of sampling in SQL. The
+query then only selects the candidate rows, and is expanded to keep rows by
+a seeded hash of a stable key and to number them in hash order, so the
+result is identical at any DuckDB thread count:
+
+    "sampling": {"key": ["company_name"], "limit": 111985, "id_column": "company_id"}
+
+"key" lists the expressions identifying a row ("*" for the whole row),
+"limit" keeps the rows with the smallest hashes and "fraction" keeps rows
+whose hash falls below that share of the hash range. "seed" defaults to the
+metadata's sampling_seed.
+
+Tables may also declare their physical layout. Rows are stored in
+"sort_by" order, so DuckDB's per-row-group min/max statistics let filters
+on those columns skip row groups, and "indexes" lists ART indexes created
+after the table:
+
+    "layout": {"sort_by": ["job_posted_date"], "indexes": [["company_name"]],
+               "row_group_size": 61440}
+
+DuckDB fixes the row-group size per database file, so "row_group_size"
+applies to the table's Parquet snapshots (see table_snapshots.py).
+
+Tables are built as a dependency graph: a table waits for the tables its
+query references (or lists in an optional "depends_on" field), and
+independent tables are created concurrently on separate cursors.
+
 Usage: python create_tables_from_queries.py --dataset jobs
 """
 
 import argparse
 import json
+import re
 import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import duckdb
 
 from scripts.core.sql_helper import SQLHelper
+from scripts.data_schema_generation.build_manifest import (
+    BuildManifest,
+    cached_fingerprint,
+    query_hash,
+)
+
+# Seed used when neither the table nor the metadata declares one
+DEFAULT_SAMPLING_SEED = 42
+
+# hash() returns a UBIGINT, uniform over [0, 2^64)
+_HASH_RANGE = 2**64
+
+# Tables created at the same time when their dependencies allow it
+DEFAULT_BUILD_JOBS = 4
+
+_CREATE_TABLE_PATTERN = re.compile(
+    r"^\s*CREATE\s+(?:OR\s+REPLACE\s+)?TABLE\s+(\S+)\s+AS\s+(.*?)\s*;?\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+
+# A LIMIT (and OFFSET) closing the outermost SELECT
+_TRAILING_LIMIT_PATTERN = re.compile(
+    r"\s+LIMIT\s+(\d+)(?:\s+OFFSET\s+\d+)?\s*;?\s*$", re.IGNORECASE
+)
 
 
 def load_table_queries(dataset_name):
@@ -27,7 +84,551 @@ def load_table_queries(dataset_name):
         return json.load(f)
 
 
-def execute_table_creation(dataset_name, verbose=True, force_recreate=False):
+def expand_sampling(query: str, sampling: Dict[str, Any], seed: int) -> str:
+    """
+    Rewrite a CREATE TABLE ... AS SELECT into a seeded hash sample.
+
+    Rows are ranked by hash(key, seed), ties broken by the key and then the
+    whole row, so the selected rows and their surrogate ids do not depend on
+    scan order.
+    A "limit" sample is a top-n over the hash, a "fraction" sample a filter
+    on it; both read the source once. A fraction filter keeps roughly that
+    share of rows; with "exact" it keeps the first round(fraction * rows)
+    rows of the hash order instead, at the cost of ranking every row.
+
+    Args:
+        query: CREATE TABLE statement selecting the candidate rows
+        sampling: Sampling declaration (key, limit or fraction, exact,
+            id_column, seed)
+        seed: Seed used when the declaration has none
+
+    Returns:
+        str: The expanded CREATE TABLE statement
+    """
+    match = _CREATE_TABLE_PATTERN.match(query)
+    if not match:
+        raise ValueError("Sampled queries must be a single CREATE TABLE ... AS SELECT")
+    table_name, select = match.groups()
+
+    if ("limit" in sampling) == ("fraction" in sampling):
+        raise ValueError("Sampling needs exactly one of 'limit' or 'fraction'")
+
+    # Rows with equal keys are ordered by their remaining columns
+    key = sampling.get("key", "*")
+    if key == "*":
+        key_sql = tiebreak_sql = "*COLUMNS(*)"
+    else:
+        key_sql = ", ".join([key] if isinstance(key, str) else key)
+        tiebreak_sql = f"{key_sql}, *COLUMNS(*)"
+    seed = int(sampling.get("seed", seed))
+
+    sample = (
+        f"SELECT hash({key_sql}, {seed}) AS _sample_hash, "
+        f"row({tiebreak_sql}) AS _sample_key, *\n"
+        f"    FROM ({select})"
+    )
+    if "limit" in sampling:
+        sample += (
+            f"\n    ORDER BY _sample_hash, _sample_key LIMIT {int(sampling['limit'])}"
+        )
+    elif sampling.get("exact"):
+        sample = (
+            f"SELECT * FROM ({sample})\n"
+            f"    QUALIFY ROW_NUMBER() OVER (ORDER BY _sample_hash, _sample_key)"
+            f" <= CAST({float(sampling['fraction'])} * COUNT(*) OVER () AS BIGINT)"
+        )
+    elif sampling["fraction"] < 1:
+        threshold = int(sampling["fraction"] * _HASH_RANGE)
+        sample = f"SELECT * FROM ({sample})\n    WHERE _sample_hash < {threshold}"
+
+    id_column = sampling.get("id_column")
+    if id_column is None:
+        return (
+            f"CREATE TABLE {table_name} AS\n"
+            f"SELECT * EXCLUDE (_sample_hash, _sample_key)\n"
+            f"FROM ({sample})\n"
+            f"ORDER BY _sample_hash, _sample_key"
+        )
+    return (
+        f"CREATE TABLE {table_name} AS\n"
+        f"SELECT ROW_NUMBER() OVER (ORDER BY _sample_hash, _sample_key) AS {id_column}, "
+        f"* EXCLUDE (_sample_hash, _sample_key)\n"
+        f"FROM ({sample})\n"
+        f"ORDER BY {id_column}"
+    )
+
+
+def candidate_rows_query(query: str) -> Tuple[str, Optional[int]]:
+    """
+    The SELECT a table creation query draws its rows from, before sampling.
+
+    The CREATE TABLE is dropped, along with a final LIMIT; statements
+    before it (e.g. SETSEED) are ignored. Sampling blocks already keep the
+    candidate rows in the query itself.
+
+    Args:
+        query: SQL creating the table
+
+    Returns:
+        tuple: The candidate SELECT and the stripped LIMIT (None if none)
+    """
+    try:
+        statements = [s.query for s in duckdb.extract_statements(query)]
+    except duckdb.Error as e:
+        raise ValueError(f"Cannot parse query: {e}") from e
+    matches = [_CREATE_TABLE_PATTERN.match(s) for s in statements]
+    matches = [match for match in matches if match]
+    if len(matches) != 1:
+        raise ValueError("Query must contain one CREATE TABLE ... AS SELECT")
+
+    select = matches[0].group(2)
+    limit = _TRAILING_LIMIT_PATTERN.search(select)
+    if not limit:
+        return select, None
+    return select[: limit.start()], int(limit.group(1))
+
+
+def expand_layout_order(query: str, sort_by: List[str]) -> str:
+    """
+    Rewrite a CREATE TABLE ... AS SELECT to store its rows in sort order.
+
+    Args:
+        query: CREATE TABLE statement
+        sort_by: Columns the rows are sorted by
+
+    Returns:
+        str: The expanded CREATE TABLE statement
+    """
+    match = _CREATE_TABLE_PATTERN.match(query)
+    if not match:
+        raise ValueError(
+            "Tables with a layout sort order must be a single CREATE TABLE ... AS SELECT"
+        )
+    table_name, select = match.groups()
+    return (
+        f"CREATE TABLE {table_name} AS\n"
+        f"SELECT * FROM ({select})\n"
+        f"ORDER BY {', '.join(sort_by)}"
+    )
+
+
+def layout_statements(table_name: str, layout: Optional[Dict[str, Any]]) -> List[str]:
+    """
+    Statements applying a table's layout after it has been created.
+
+    Args:
+        table_name: Table the layout belongs to
+        layout: The table's "layout" block
+
+    Returns:
+        list: CREATE INDEX statements, one per declared index
+    """
+    statements = []
+    for columns in (layout or {}).get("indexes", []):
+        columns = [columns] if isinstance(columns, str) else columns
+        suffix = re.sub(r"\W+", "_", "_".join(columns)).strip("_")
+        statements.append(
+            f"CREATE INDEX {table_name}_{suffix}_idx "
+            f"ON {table_name} ({', '.join(columns)})"
+        )
+    return statements
+
+
+def build_table_query(
+    table_info: Dict[str, Any], metadata: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Return the SQL that creates a table, expanding its sampling declaration
+    and layout sort order.
+
+    Args:
+        table_info: Table entry of the table creation queries JSON
+        metadata: The JSON's metadata, for the default sampling seed
+
+    Returns:
+        str: SQL to execute
+    """
+    query = table_info["query"]
+    sampling = table_info.get("sampling")
+    if sampling:
+        seed = (metadata or {}).get("sampling_seed", DEFAULT_SAMPLING_SEED)
+        query = expand_sampling(query, sampling, seed)
+    sort_by = table_info.get("layout", {}).get("sort_by")
+    if sort_by:
+        query = expand_layout_order(query, sort_by)
+    return query
+
+
+def referenced_tables(query: str) -> Optional[Set[str]]:
+    """
+    Names of the tables a query reads, excluding CTEs and the table it creates.
+
+    Args:
+        query: SQL of one or more statements
+
+    Returns:
+        set: Referenced table names, or None if DuckDB cannot parse the query
+    """
+    try:
+        referenced = set()
+        for statement in duckdb.extract_statements(query):
+            referenced |= duckdb.get_table_names(statement.query)
+        return referenced
+    except duckdb.Error:
+        return None
+
+
+def table_dependencies(
+    tables: Dict[str, Any], metadata: Optional[Dict[str, Any]] = None
+) -> Dict[str, Set[str]]:
+    """
+    Find the tables of the file each table is built from.
+
+    Dependencies are the file's tables referenced by the query plus those
+    listed in "depends_on". A query DuckDB cannot parse is assumed to depend
+    on every table defined before it, which keeps the file order.
+
+    Args:
+        tables: Table entries of the table creation queries JSON
+        metadata: The JSON's metadata, for expanding sampling declarations
+
+    Returns:
+        dict: Table name -> names of the tables it depends on
+    """
+    names = list(tables)
+    dependencies = {}
+    for position, (table_name, table_info) in enumerate(tables.items()):
+        declared = set(table_info.get("depends_on", []))
+        unknown = declared - set(names)
+        if unknown:
+            raise ValueError(
+                f"Table '{table_name}' depends on unknown tables: "
+                f"{', '.join(sorted(unknown))}"
+            )
+
+        try:
+            referenced = referenced_tables(build_table_query(table_info, metadata))
+        except ValueError:
+            referenced = None
+        if referenced is None:
+            referenced = set(names[:position])
+
+        dependencies[table_name] = ((referenced & set(names)) | declared) - {table_name}
+
+    topological_order(dependencies)
+    return dependencies
+
+
+def transitive_dependents(
+    dependencies: Dict[str, Set[str]], tables: Set[str]
+) -> Set[str]:
+    """
+    Find every table built, directly or not, from the given tables.
+
+    Args:
+        dependencies: Table name -> names of the tables it depends on
+        tables: Tables whose dependents are wanted
+
+    Returns:
+        set: Dependent table names, excluding ``tables`` themselves
+    """
+    dependents = set()
+    frontier = set(tables)
+    while frontier:
+        frontier = {
+            name
+            for name, needs in dependencies.items()
+            if needs & frontier and name not in dependents | tables
+        }
+        dependents |= frontier
+    return dependents
+
+
+def topological_order(dependencies: Dict[str, Set[str]]) -> List[str]:
+    """
+    Order tables so every table follows its dependencies.
+
+    Args:
+        dependencies: Table name -> names of the tables it depends on
+
+    Returns:
+        list: Table names, ties kept in their original order
+    """
+    order = []
+    remaining = dict(dependencies)
+    while remaining:
+        ready = [
+            name for name, needs in remaining.items() if not (needs & remaining.keys())
+        ]
+        if not ready:
+            raise ValueError(
+                f"Circular table dependencies among: {', '.join(remaining)}"
+            )
+        order.extend(ready)
+        for name in ready:
+            del remaining[name]
+    return order
+
+
+def _build_table(
+    conn: duckdb.DuckDBPyConnection,
+    table_name: str,
+    query: str,
+    post_build: Optional[List[str]] = None,
+    search_path: Optional[str] = None,
+) -> Tuple[int, float, float]:
+    """Run one table's query on its own cursor; return rows, start and end."""
+    cursor = conn.cursor()
+    try:
+        if search_path is not None:
+            cursor.execute(f"SET search_path = '{search_path}'")
+        started = time.perf_counter()
+        cursor.execute(query)
+        for statement in post_build or []:
+            cursor.execute(statement)
+        row_count = cursor.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
+        return int(row_count), started, time.perf_counter()
+    finally:
+        cursor.close()
+
+
+def build_tables(
+    conn: duckdb.DuckDBPyConnection,
+    queries: Dict[str, str],
+    dependencies: Dict[str, Set[str]],
+    jobs: int = DEFAULT_BUILD_JOBS,
+    verbose: bool = True,
+    post_build: Optional[Dict[str, List[str]]] = None,
+    search_path: Optional[str] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Create tables concurrently as soon as their dependencies exist.
+
+    Dependencies outside ``queries`` are taken to exist already. Tables
+    depending on a failed table are skipped.
+
+    Args:
+        conn: Connection to the target database
+        queries: Table name -> SQL creating it, in file order
+        dependencies: Table name -> names of the tables it depends on
+        jobs: Maximum number of tables built at the same time
+        verbose: Print progress
+        post_build: Table name -> statements run after creating it (layout
+            indexes)
+        search_path: Search path of the build cursors, which do not inherit
+            the connection's (e.g. a scratch database reading an attached
+            source)
+
+    Returns:
+        dict: Table name -> status, row_count or error, and start/end seconds
+            since the build began
+    """
+    results = {}
+    pending = list(queries)
+    running = {}
+    build_start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        while pending or running:
+            for table_name in list(pending):
+                needs = dependencies.get(table_name, set()) & queries.keys()
+                failed = sorted(
+                    name
+                    for name in needs
+                    if name in results and results[name]["status"] != "success"
+                )
+                if failed:
+                    pending.remove(table_name)
+                    error = f"Dependency failed: {', '.join(failed)}"
+                    results[table_name] = {"status": "skipped", "error": error}
+                    if verbose:
+                        print(f"\n⏭️  Skipping {table_name}: {error}")
+                elif needs <= results.keys() and len(running) < max(1, jobs):
+                    pending.remove(table_name)
+                    if verbose:
+                        print(f"📝 Creating table: {table_name}")
+                    future = pool.submit(
+                        _build_table,
+                        conn,
+                        table_name,
+                        queries[table_name],
+                        (post_build or {}).get(table_name),
+                        search_path,
+                    )
+                    running[future] = table_name
+
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                table_name = running.pop(future)
+                try:
+                    row_count, started, ended = future.result()
+                except Exception as e:
+                    results[table_name] = {"status": "error", "error": str(e)}
+                    if verbose:
+                        print(f"   ❌ {table_name} failed: {e}")
+                    continue
+
+                results[table_name] = {
+                    "status": "success",
+                    "row_count": row_count,
+                    "start": started - build_start,
+                    "end": ended - build_start,
+                }
+                if verbose:
+                    print(
+                        f"   ✅ {table_name}: {row_count} rows created "
+                        f"({ended - started:.2f}s)"
+                    )
+
+    return results
+
+
+def critical_path(
+    dependencies: Dict[str, Set[str]], results: Dict[str, Dict[str, Any]]
+) -> Tuple[List[str], float]:
+    """
+    Find the chain of dependent builds with the largest total duration.
+
+    Args:
+        dependencies: Table name -> names of the tables it depends on
+        results: Build results returned by build_tables
+
+    Returns:
+        tuple: Table names along the path and its total seconds
+    """
+    built = {
+        name: result["end"] - result["start"]
+        for name, result in results.items()
+        if result["status"] == "success"
+    }
+    finish = {}
+    previous = {}
+    for name in topological_order(
+        {name: dependencies.get(name, set()) & built.keys() for name in built}
+    ):
+        needs = dependencies.get(name, set()) & built.keys()
+        before = max(needs, key=lambda dep: finish[dep], default=None)
+        previous[name] = before
+        finish[name] = built[name] + (finish[before] if before else 0.0)
+
+    if not finish:
+        return [], 0.0
+    name = max(finish, key=finish.get)
+    total = finish[name]
+    path = []
+    while name is not None:
+        path.append(name)
+        name = previous[name]
+    return path[::-1], total
+
+
+def plan_builds(
+    conn: duckdb.DuckDBPyConnection,
+    queries: Dict[str, str],
+    dependencies: Dict[str, Set[str]],
+    entries: Dict[str, Dict[str, Any]],
+    existing_tables: Set[str],
+    force_recreate: bool = False,
+    post_build: Optional[Dict[str, List[str]]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Decide which tables must be rebuilt from their build manifest records.
+
+    A table is rebuilt when it is missing, has no record, its query changed
+    or an input changed. Source inputs are fingerprinted by content, derived
+    inputs by their build hash, and every table downstream of a rebuilt
+    table is rebuilt too.
+
+    Fingerprinting a source scans the whole table, which dominates a run
+    that rebuilds nothing. The fingerprint is therefore cached in the
+    database and only recomputed after the source's storage changes (see
+    cached_fingerprint()).
+
+    Args:
+        conn: Connection to the target database
+        queries: Table name -> SQL creating it
+        dependencies: Table name -> names of the tables it depends on
+        entries: Records loaded with BuildManifest.entries()
+        existing_tables: Tables currently in the database
+        force_recreate: Rebuild every table
+        post_build: Table name -> statements run after creating it; they
+            are hashed with the query
+
+    Returns:
+        dict: Table name -> rebuild flag, reason, query_hash, inputs and
+            build_hash
+    """
+    plan = {}
+    source_fingerprints = {}
+
+    for table_name in topological_order(
+        {name: dependencies.get(name, set()) & queries.keys() for name in queries}
+    ):
+        query = queries[table_name]
+        referenced = referenced_tables(query)
+        derived = dependencies.get(table_name, set())
+
+        inputs = {}
+        for source in sorted((referenced or set()) - derived - {table_name}):
+            if source not in source_fingerprints:
+                try:
+                    source_fingerprints[source] = cached_fingerprint(conn, source)
+                except duckdb.Error:
+                    source_fingerprints[source] = None
+            inputs[source] = source_fingerprints[source]
+        for dependency in sorted(derived):
+            inputs[dependency] = plan.get(dependency, {}).get("build_hash")
+
+        table_query_hash = query_hash(
+            ";\n".join([query, *(post_build or {}).get(table_name, [])])
+        )
+        entry = entries.get(table_name)
+        changed = sorted(
+            name
+            for name in set(inputs) | set(entry["input_fingerprints"] if entry else {})
+            if entry is None
+            or inputs.get(name) is None
+            or entry["input_fingerprints"].get(name) != inputs.get(name)
+        )
+        upstream = sorted(
+            name for name in derived if plan.get(name, {"rebuild": True})["rebuild"]
+        )
+
+        if force_recreate:
+            reason = "force recreate"
+        elif table_name not in existing_tables:
+            reason = "table missing"
+        elif entry is None:
+            reason = "no build record"
+        elif referenced is None:
+            reason = "query references could not be parsed"
+        elif entry["query_hash"] != table_query_hash:
+            reason = "query changed"
+        elif changed:
+            reason = f"inputs changed: {', '.join(changed)}"
+        elif upstream:
+            reason = f"upstream rebuilt: {', '.join(upstream)}"
+        else:
+            reason = None
+
+        plan[table_name] = {
+            "rebuild": reason is not None,
+            "reason": reason or "up to date",
+            "query_hash": table_query_hash,
+            "inputs": inputs,
+            "build_hash": query_hash(
+                json.dumps([table_query_hash, inputs], sort_keys=True)
+            ),
+        }
+
+    return plan
+
+
+def execute_table_creation(
+    dataset_name, verbose=True, force_recreate=False, jobs=DEFAULT_BUILD_JOBS
+):
     """Execute all table creation queries for the given dataset."""
     print(f"🔧 Creating tables for dataset: {dataset_name}")
     if force_recreate:
@@ -86,103 +687,157 @@ def execute_table_creation(dataset_name, verbose=True, force_recreate=False):
         if verbose:
             print(f"   ⚠️  Could not check existing tables: {str(e)}")
 
-    # Handle existing tables based on force_recreate flag
-    if force_recreate:
-        print("🗑️  Dropping existing tables...")
-        for table_name in queries_data["tables"].keys():
-            if table_name in existing_tables:
-                try:
-                    drop_result = helper.execute_query(
-                        f"DROP TABLE IF EXISTS {table_name}"
-                    )
-                    if drop_result["status"] == "success":
-                        if verbose:
-                            print(f"   ✅ Dropped table: {table_name}")
-                    else:
-                        if verbose:
-                            print(
-                                f"   ⚠️  Could not drop table {table_name}: {drop_result.get('error', 'Unknown error')}"
-                            )
-                except Exception as e:
-                    if verbose:
-                        print(f"   ⚠️  Error dropping table {table_name}: {str(e)}")
-    else:
-        # In preserve mode, skip tables that already exist
-        existing_required_tables = [
-            t for t in queries_data["tables"].keys() if t in existing_tables
-        ]
-        if existing_required_tables:
-            if verbose:
-                print(
-                    f"📋 Skipping existing tables: {', '.join(existing_required_tables)}"
-                )
-
-    # Execute queries
+    # Expand every definition; invalid ones fail without stopping the rest
     successful_tables = []
     failed_tables = []
-
+    queries = {}
+    post_build = {}
     for table_name, table_info in queries_data["tables"].items():
-        # Skip table creation if it already exists and we're not force recreating
-        if not force_recreate and table_name in existing_tables:
-            # Get current row count
-            try:
-                count_result = helper.execute_query(
-                    f"SELECT COUNT(*) as count FROM {table_name}"
-                )
-                if count_result["status"] == "success":
-                    actual_count = count_result["data"].iloc[0]["count"]
-                    if verbose:
-                        print(f"\n📝 Table {table_name} already exists")
-                        print(f"   ✅ Preserved: {actual_count} rows exist")
-                    successful_tables.append((table_name, actual_count))
-                else:
-                    if verbose:
-                        print(f"\n📝 Table {table_name} already exists")
-                        print("   ✅ Preserved: Table exists (count unknown)")
-                    successful_tables.append((table_name, "preserved"))
-            except Exception:
-                if verbose:
-                    print(f"\n📝 Table {table_name} already exists")
-                    print("   ✅ Preserved: Table exists")
-                successful_tables.append((table_name, "preserved"))
-            continue
-        if verbose:
-            print(f"\n📝 Creating table: {table_name}")
-            print(f"   Purpose: {table_info.get('educational_purpose', 'N/A')}")
-            print(
-                f"   Expected rows: {table_info.get('row_count_estimate', 'Unknown')}"
+        try:
+            queries[table_name] = build_table_query(
+                table_info, queries_data.get("metadata")
+            )
+            post_build[table_name] = layout_statements(
+                table_name, table_info.get("layout")
             )
+        except ValueError as e:
+            if verbose:
+                print(f"\n❌ Invalid definition for {table_name}: {e}")
+            failed_tables.append((table_name, str(e)))
 
-        query = table_info["query"]
+    try:
+        dependencies = table_dependencies(
+            queries_data["tables"], queries_data.get("metadata")
+        )
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        helper.close()
+        return False
 
-        try:
-            # Execute the CREATE TABLE query
-            result = helper.execute_query(query)
+    # Tables built from an invalid definition would read its old copy
+    invalid = {table_name for table_name, _ in failed_tables}
+    skipped = transitive_dependents(dependencies, invalid)
+    for table_name in queries_data["tables"]:
+        if table_name not in skipped:
+            continue
+        failed = sorted(dependencies[table_name] & (invalid | skipped))
+        error = f"Dependency failed: {', '.join(failed)}"
+        del queries[table_name]
+        post_build.pop(table_name, None)
+        failed_tables.append((table_name, error))
+        if verbose:
+            print(f"\n⏭️  Skipping {table_name}: {error}")
+
+    # Compare against the build manifest to find stale tables
+    manifest = BuildManifest(helper.conn)
+    plan = plan_builds(
+        helper.conn,
+        queries,
+        dependencies,
+        manifest.entries(),
+        existing_tables,
+        force_recreate=force_recreate,
+        post_build=post_build,
+    )
+    stale = [name for name in queries if plan[name]["rebuild"]]
 
-            if result["status"] == "success":
-                # Get actual row count
-                count_result = helper.execute_query(
-                    f"SELECT COUNT(*) as count FROM {table_name}"
-                )
-                if count_result["status"] == "success":
-                    actual_count = count_result["data"].iloc[0]["count"]
+    # Drop stale tables so they can be created again
+    if force_recreate:
+        print("🗑️  Dropping existing tables...")
+    elif stale and verbose:
+        print(f"🔄 Rebuilding {len(stale)} tables:")
+        for table_name in stale:
+            print(f"   • {table_name}: {plan[table_name]['reason']}")
+    for table_name in stale:
+        manifest.remove(table_name)
+        if table_name in existing_tables:
+            try:
+                drop_result = helper.execute_query(f"DROP TABLE IF EXISTS {table_name}")
+                if drop_result["status"] == "success":
                     if verbose:
-                        print(f"   ✅ Success: {actual_count} rows created")
-                    successful_tables.append((table_name, actual_count))
+                        print(f"   ✅ Dropped table: {table_name}")
                 else:
                     if verbose:
-                        print("   ✅ Success: Table created (count unknown)")
-                    successful_tables.append((table_name, "unknown"))
-            else:
-                error_msg = result.get("error", "Unknown error")
+                        print(
+                            f"   ⚠️  Could not drop table {table_name}: {drop_result.get('error', 'Unknown error')}"
+                        )
+            except Exception as e:
                 if verbose:
-                    print(f"   ❌ Failed: {error_msg}")
-                failed_tables.append((table_name, error_msg))
+                    print(f"   ⚠️  Error dropping table {table_name}: {str(e)}")
+
+    # Up-to-date tables are kept as they are
+    up_to_date = [name for name in queries if not plan[name]["rebuild"]]
+    if up_to_date and verbose:
+        print(f"📋 Skipping up-to-date tables: {', '.join(up_to_date)}")
+    for table_name in up_to_date:
+        row_count = None
+        try:
+            count_result = helper.execute_query(
+                f"SELECT COUNT(*) as count FROM {table_name}"
+            )
+            if count_result["status"] == "success":
+                row_count = count_result["data"].iloc[0]["count"]
+        except Exception:
+            pass
+        if verbose:
+            print(f"\n📝 Table {table_name} is up to date")
+            print(
+                f"   ✅ Preserved: {row_count} rows exist"
+                if row_count is not None
+                else "   ✅ Preserved: Table exists (count unknown)"
+            )
+        successful_tables.append(
+            (table_name, row_count if row_count is not None else "preserved")
+        )
 
-        except Exception as e:
-            if verbose:
-                print(f"   ❌ Exception: {str(e)}")
-            failed_tables.append((table_name, str(e)))
+    queries = {name: queries[name] for name in stale}
+    if queries and verbose:
+        print(f"\n🧩 Building {len(queries)} tables with up to {jobs} at a time")
+        for table_name in queries:
+            needs = sorted(dependencies[table_name])
+            if needs:
+                print(f"   • {table_name} after {', '.join(needs)}")
+
+    build_start = time.perf_counter()
+    build_results = build_tables(
+        helper.conn,
+        queries,
+        dependencies,
+        jobs=jobs,
+        verbose=verbose,
+        post_build=post_build,
+    )
+    wall_time = time.perf_counter() - build_start
+
+    for table_name, result in build_results.items():
+        if result["status"] == "success":
+            successful_tables.append((table_name, result["row_count"]))
+            manifest.record(
+                table_name,
+                plan[table_name]["query_hash"],
+                plan[table_name]["inputs"],
+                result["row_count"],
+                result["end"] - result["start"],
+            )
+        else:
+            failed_tables.append((table_name, result["error"]))
+
+    path, path_time = critical_path(dependencies, build_results)
+    if path:
+        total_time = sum(
+            result["end"] - result["start"]
+            for result in build_results.values()
+            if result["status"] == "success"
+        )
+        steps = " → ".join(
+            f"{name} ({build_results[name]['end'] - build_results[name]['start']:.2f}s)"
+            for name in path
+        )
+        print("\n⏱️  Build timing:")
+        print(
+            f"   Wall clock: {wall_time:.2f}s (sum of table builds: {total_time:.2f}s)"
+        )
+        print(f"   Critical path: {steps} = {path_time:.2f}s")
 
     # Close database connection
     helper.close()
@@ -216,13 +871,22 @@ def main():
     parser.add_argument(
         "--force-recreate",
         action="store_true",
-        help="Drop existing tables before creating new ones",
+        help="Rebuild every table, even those the build manifest shows up to date",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_BUILD_JOBS,
+        help=f"Tables built concurrently when independent (default: {DEFAULT_BUILD_JOBS})",
     )
 
     args = parser.parse_args()
 
     success = execute_table_creation(
-        args.dataset, verbose=not args.quiet, force_recreate=args.force_recreate
+        args.dataset,
+        verbose=not args.quiet,
+        force_recreate=args.force_recreate,
+        jobs=args.jobs,
     )
 
     if success:
@@ -13,11 +13,23 @@ import argparse
 import json
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
+from scripts.core.inclusion_dependencies import (
+    InclusionDependencyFinder,
+    is_probable_foreign_key,
+)
 from scripts.core.sql_helper import SQLHelper
 
+# Rows of sample data shown per table
+SAMPLE_ROWS = 3
+
+# Sample queries running at the same time, each on its own cursor
+SAMPLE_WORKERS = 4
+
 
 def load_existing_artifacts(dataset_name):
     """Load existing JSON artifacts for context and enhancement."""
@@ -40,41 +52,168 @@ def load_existing_artifacts(dataset_name):
     return artifacts
 
 
-def detect_foreign_keys(column_name, table_name, all_tables):
-    """Detect foreign key relationships using naming conventions."""
-    if not column_name.endswith("_id"):
-        return ""
+def detect_foreign_keys(conn, table_names):
+    """
+    Detect foreign key relationships from the data via inclusion dependencies.
+
+    Every integer and string column of every table is tested for containment
+    in the unique columns of all tables. Each column keeps the probable
+    foreign key with the highest containment and coverage.
+
+    Returns:
+        dict: (table, column) -> inclusion dependency of the foreign key
+    """
+    print("🔗 Discovering foreign keys from inclusion dependencies...")
+    dependencies = InclusionDependencyFinder(conn).find(table_names)
+
+    foreign_keys = {}
+    for dependency in dependencies:
+        if not is_probable_foreign_key(dependency):
+            continue
+        key = (dependency["dependent_table"], dependency["dependent_column"])
+        target = (dependency["referenced_table"], dependency["referenced_column"])
+        reverse = foreign_keys.get(target)
+        if (
+            reverse
+            and (reverse["referenced_table"], reverse["referenced_column"]) == key
+        ):
+            # Equal one-to-one columns include each other; keep one direction
+            continue
+        # Results are sorted by containment and coverage, so keep the first
+        foreign_keys.setdefault(key, dependency)
+
+    for dependency in foreign_keys.values():
+        print(
+            f"  🔑 {dependency['dependent_table']}.{dependency['dependent_column']} -> "
+            f"{dependency['referenced_table']}.{dependency['referenced_column']} "
+            f"(containment {dependency['containment_ratio']:.1%})"
+        )
+
+    return foreign_keys
+
+
+def foreign_key_tables(table_names, artifacts):
+    """
+    Choose the tables searched for foreign keys.
+
+    Only the derived tables of the table creation queries are searched:
+    the raw source table is by far the largest, and keys pointing at it are
+    not part of the student schema. Without the queries all tables are used.
+
+    Returns:
+        list: Table names, in database order
+    """
+    derived = artifacts.get("table_queries", {}).get("tables")
+    if not derived:
+        return list(table_names)
+    return [name for name in table_names if name in derived]
+
+
+def fetch_columns(conn, table_names):
+    """
+    Fetch the columns of all tables in one catalog query.
+
+    Returns:
+        dict: Table name -> column records (column_name, column_type,
+            nullable, primary_key) in column order
+    """
+    rows = conn.execute(
+        """
+        SELECT c.table_name, c.column_name, c.data_type, c.is_nullable,
+            list_contains(coalesce(k.constraint_column_names, []), c.column_name)
+        FROM duckdb_columns() c
+        LEFT JOIN duckdb_constraints() k
+            ON k.database_name = c.database_name
+            AND k.schema_name = c.schema_name
+            AND k.table_name = c.table_name
+            AND k.constraint_type = 'PRIMARY KEY'
+        WHERE c.database_name = current_database()
+            AND c.schema_name = current_schema()
+            AND list_contains(?, c.table_name)
+        ORDER BY c.table_name, c.column_index
+        """,
+        [list(table_names)],
+    ).fetchall()
+
+    columns = {table_name: [] for table_name in table_names}
+    for table_name, column_name, column_type, nullable, primary_key in rows:
+        columns[table_name].append(
+            {
+                "column_name": column_name,
+                "column_type": column_type,
+                "nullable": bool(nullable),
+                "primary_key": bool(primary_key),
+            }
+        )
+    return columns
+
 
-    # Skip primary keys
-    if column_name == f"{table_name}_id":
-        return ""
+def fetch_row_counts(conn, table_names):
+    """
+    Count the rows of all tables in one UNION ALL query.
 
-    # Look for referenced table based on naming convention
-    potential_table = column_name.replace("_id", "s")  # e.g., company_id -> companies
-    if potential_table in all_tables:
-        return f"References {potential_table}.{column_name}"
+    Returns:
+        dict: Table name -> exact row count
+    """
+    if not table_names:
+        return {}
+    count_query = "\nUNION ALL\n".join(
+        f"SELECT {index} AS position, COUNT(*) AS row_count FROM {table_name}"
+        for index, table_name in enumerate(table_names)
+    )
+    rows = conn.execute(count_query).fetchall()
+    return {table_names[position]: int(row_count) for position, row_count in rows}
 
-    # Try singular form
-    potential_table = column_name.replace("_id", "")  # e.g., company_id -> company
-    if potential_table in all_tables:
-        return f"References {potential_table}.{column_name}"
 
-    return ""
+def fetch_samples(conn, table_names, workers=SAMPLE_WORKERS):
+    """
+    Fetch a few rows of every table concurrently, each on its own cursor.
+
+    Returns:
+        dict: Table name -> sample rows with values as strings
+    """
+
+    def sample(table_name):
+        cursor = conn.cursor()
+        try:
+            sample_df = cursor.execute(
+                f"SELECT * FROM {table_name} LIMIT {SAMPLE_ROWS}"
+            ).df()
+        finally:
+            cursor.close()
+        return sample_df.astype(str).to_dict("records")
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        return dict(zip(table_names, pool.map(sample, table_names)))
 
 
 def introspect_database(helper, artifacts):
-    """Introspect database to get comprehensive table information."""
+    """
+    Introspect database to get comprehensive table information.
+
+    Returns:
+        tuple: (tables_info, foreign_keys from detect_foreign_keys())
+    """
     print("🔍 Introspecting database structure...")
 
     # Get all tables
     tables_result = helper.execute_query("SHOW TABLES")
     if tables_result["status"] != "success":
         print("❌ Failed to get table list")
-        return []
-
-    table_names = [row["name"] for row in tables_result["data"].to_dict("records")]
+        return [], {}
+
+    # Tables starting with "_" (such as the build manifest) are internal
+    table_names = [
+        row["name"]
+        for row in tables_result["data"].to_dict("records")
+        if not row["name"].startswith("_")
+    ]
     print(f"📋 Found {len(table_names)} tables: {', '.join(table_names)}")
 
+    foreign_keys = detect_foreign_keys(
+        helper.conn, foreign_key_tables(table_names, artifacts)
+    )
+
     tables_info = []
     creation_queries = {}
 
@@ -85,40 +224,36 @@ def introspect_database(helper, artifacts):
             for name, data in artifacts["table_queries"]["tables"].items()
         }
 
-    for i, table_name in enumerate(table_names, 1):
-        print(f"📊 Processing table {i}/{len(table_names)}: {table_name}")
-
-        # Get table structure
-        describe_result = helper.execute_query(f"DESCRIBE {table_name}")
-        if describe_result["status"] != "success":
-            print(f"  ❌ Failed to describe {table_name}")
-            continue
-
-        # Get row count
-        count_result = helper.execute_query(
-            f"SELECT COUNT(*) as row_count FROM {table_name}"
-        )
-        row_count = 0
-        if count_result["status"] == "success":
-            row_count = int(count_result["data"].iloc[0]["row_count"])
+    # Catalog metadata, row counts and samples for all tables at once
+    started = time.perf_counter()
+    table_columns = fetch_columns(helper.conn, table_names)
+    row_counts = fetch_row_counts(helper.conn, table_names)
+    samples = fetch_samples(helper.conn, table_names)
+    print(
+        f"📊 Fetched columns, row counts and samples of {len(table_names)} tables "
+        f"({time.perf_counter() - started:.2f}s)"
+    )
 
-        # Get sample data
-        sample_result = helper.execute_query(f"SELECT * FROM {table_name} LIMIT 3")
-        sample_data = []
-        if sample_result["status"] == "success" and not sample_result["data"].empty:
-            sample_df = sample_result["data"].astype(str)
-            sample_data = sample_df.to_dict("records")
+    for i, table_name in enumerate(table_names, 1):
+        row_count = row_counts[table_name]
+        sample_data = samples[table_name]
 
         # Process columns
         columns = []
-        for col_info in describe_result["data"].to_dict("records"):
+        for col_info in table_columns[table_name]:
             col_name = col_info["column_name"]
             col_type = col_info["column_type"]
-            is_nullable = col_info["null"] == "YES"
-            is_primary_key = col_info["key"] == "PRI"
-
-            # Detect foreign keys
-            foreign_key_info = detect_foreign_keys(col_name, table_name, table_names)
+            is_nullable = col_info["nullable"]
+            is_primary_key = col_info["primary_key"]
+
+            # Foreign keys discovered from the data
+            foreign_key = foreign_keys.get((table_name, col_name))
+            foreign_key_info = ""
+            if foreign_key:
+                foreign_key_info = (
+                    f"References {foreign_key['referenced_table']}."
+                    f"{foreign_key['referenced_column']}"
+                )
 
             columns.append(
                 {
@@ -144,33 +279,32 @@ def introspect_database(helper, artifacts):
 
         tables_info.append(table_info)
 
-    return tables_info
+    return tables_info, foreign_keys
 
 
-def generate_relationships(tables_info):
-    """Generate relationship information based on foreign key detection."""
+def generate_relationships(tables_info, foreign_keys):
+    """Generate relationship information from the discovered foreign keys."""
     relationships = []
 
     for table in tables_info:
         for column in table["columns"]:
-            if column["foreign_key"]:
-                # Parse foreign key reference
-                if "References" in column["foreign_key"]:
-                    ref_parts = (
-                        column["foreign_key"].replace("References ", "").split(".")
-                    )
-                    if len(ref_parts) == 2:
-                        ref_table, ref_column = ref_parts
-                        relationships.append(
-                            {
-                                "type": "one-to-many",
-                                "from_table": ref_table,
-                                "from_column": ref_column,
-                                "to_table": table["name"],
-                                "to_column": column["name"],
-                                "description": "",  # Placeholder for agent enhancement
-                            }
-                        )
+            foreign_key = foreign_keys.get((table["name"], column["name"]))
+            if not foreign_key:
+                continue
+
+            relationships.append(
+                {
+                    "type": "one-to-one"
+                    if foreign_key["one_to_one"]
+                    else "one-to-many",
+                    "from_table": foreign_key["referenced_table"],
+                    "from_column": foreign_key["referenced_column"],
+                    "to_table": table["name"],
+                    "to_column": column["name"],
+                    "containment_ratio": foreign_key["containment_ratio"],
+                    "description": "",  # Placeholder for agent enhancement
+                }
+            )
 
     return relationships
 
@@ -338,6 +472,7 @@ def generate_agent_prompt(dataset_name, output_path, schema_data, artifacts):
 
 def generate_data_schema(dataset_name):
     """Generate comprehensive data schema with deterministic information."""
+    started = time.perf_counter()
     print(f"🔧 Generating data schema for dataset: {dataset_name}")
 
     # Load existing artifacts
@@ -373,7 +508,7 @@ def generate_data_schema(dataset_name):
     helper = SQLHelper(db_path)
 
     # Introspect database
-    tables_info = introspect_database(helper, artifacts)
+    tables_info, foreign_keys = introspect_database(helper, artifacts)
 
     # Close database connection
     helper.close()
@@ -383,7 +518,7 @@ def generate_data_schema(dataset_name):
         return False
 
     # Generate relationships
-    relationships = generate_relationships(tables_info)
+    relationships = generate_relationships(tables_info, foreign_keys)
 
     # Generate metadata
     metadata = generate_metadata(dataset_name, tables_info, artifacts)
@@ -430,6 +565,7 @@ def generate_data_schema(dataset_name):
     print(
         f"  📝 Needs Agent Enhancement: {len(schema_data['agent_enhancement_needed']['fields_to_enhance'])} field types"
     )
+    print(f"  ⏱️  Total runtime: {time.perf_counter() - started:.2f}s")
 
     # Generate agent enhancement prompt
     generate_agent_prompt(dataset_name, output_path, schema_data, artifacts)
@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+Parquet snapshots of derived tables.
+
+A snapshot is a directory with one sub-directory of ZSTD-compressed Parquet
+files per derived table and a ``snapshot.json`` manifest. Rows are written
+sorted (by the table's ``snapshot`` or ``layout`` sort_by, else its id
+column) so Parquet min/max statistics stay tight and range filters skip
+row groups, in row groups of the layout's ``row_group_size``; large tables
+can be hive-partitioned through ``partition_by``::
+
+    "job_postings": {
+        "query": "...",
+        "layout": {"sort_by": ["job_posted_date"], "row_group_size": 61440},
+        "snapshot": {"partition_by": ["job_title_short"]}
+    }
+
+The manifest records each table's columns, row count, content fingerprint
+and build record, so a snapshot can be restored into a database without
+rebuilding, compared with another build, or served directly as views.
+
+Usage:
+    python scripts/data_schema_generation/table_snapshots.py export data_jobs
+    python scripts/data_schema_generation/table_snapshots.py import data_jobs
+    python scripts/data_schema_generation/table_snapshots.py diff OLD_DIR NEW_DIR
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import duckdb
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from scripts.data_schema_generation.build_manifest import (  # noqa: E402
+    BuildManifest,
+    fingerprint_table,
+)
+from scripts.data_schema_generation.create_tables_from_queries import (  # noqa: E402
+    load_table_queries,
+)
+
+# Manifest written at the root of every snapshot
+SNAPSHOT_MANIFEST = "snapshot.json"
+
+# Bumped when the snapshot layout changes
+SNAPSHOT_VERSION = 1
+
+# Directory under the project root holding each dataset's default snapshot
+DEFAULT_SNAPSHOT_DIR = os.path.join("datasets", "snapshots")
+
+
+def default_snapshot_path(base_path: str, dataset_name: str) -> str:
+    """
+    Location of a dataset's default snapshot.
+
+    Args:
+        base_path: Project root
+        dataset_name: Database name without extension
+
+    Returns:
+        str: Snapshot directory
+    """
+    return os.path.join(base_path, DEFAULT_SNAPSHOT_DIR, dataset_name)
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _literal(value: str) -> str:
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _table_glob(snapshot_dir: str, table_name: str) -> str:
+    return os.path.join(snapshot_dir, table_name, "**", "*.parquet")
+
+
+def _read_parquet(snapshot_dir: str, table_name: str) -> str:
+    """SQL reading every Parquet file of a snapshot table."""
+    glob = _literal(_table_glob(snapshot_dir, table_name))
+    return f"read_parquet({glob}, hive_partitioning = false)"
+
+
+def load_snapshot_manifest(snapshot_dir: str) -> Dict[str, Any]:
+    """
+    Load a snapshot's manifest.
+
+    Args:
+        snapshot_dir: Snapshot directory
+
+    Returns:
+        dict: The manifest
+
+    Raises:
+        FileNotFoundError: If the directory holds no snapshot
+    """
+    path = os.path.join(snapshot_dir, SNAPSHOT_MANIFEST)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No snapshot found in {snapshot_dir}")
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def export_snapshot(
+    conn: duckdb.DuckDBPyConnection,
+    tables: Dict[str, Dict[str, Any]],
+    snapshot_dir: str,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Write tables to a Parquet snapshot, replacing any previous snapshot there.
+
+    The snapshot is written next to the target and swapped in when complete.
+
+    Args:
+        conn: Connection to the database holding the tables
+        tables: Table name -> table definition (its optional "snapshot"
+            block sets partition_by and sort_by, its "layout" block the
+            default sort_by and row_group_size)
+        snapshot_dir: Snapshot directory
+        metadata: Extra fields for the manifest (dataset, ...)
+
+    Returns:
+        dict: The manifest that was written
+    """
+    build_records = BuildManifest(conn).entries()
+    parent_dir = os.path.dirname(os.path.abspath(snapshot_dir))
+    os.makedirs(parent_dir, exist_ok=True)
+    temp_dir = tempfile.mkdtemp(dir=parent_dir, prefix=".snapshot-")
+
+    try:
+        table_manifest = {}
+        for table_name, table_info in tables.items():
+            options = table_info.get("snapshot", {})
+            layout = table_info.get("layout", {})
+            columns = conn.execute(f"DESCRIBE {_quote(table_name)}").fetchall()
+            sort_by = options.get("sort_by", layout.get("sort_by", [columns[0][0]]))
+            partition_by = options.get("partition_by", [])
+
+            table_dir = os.path.join(temp_dir, table_name)
+            os.makedirs(table_dir)
+            order = ", ".join(_quote(column) for column in sort_by)
+            copy_options = "FORMAT PARQUET, COMPRESSION ZSTD"
+            if layout.get("row_group_size"):
+                copy_options += f", ROW_GROUP_SIZE {int(layout['row_group_size'])}"
+            if partition_by:
+                target = table_dir
+                partitions = ", ".join(_quote(column) for column in partition_by)
+                copy_options += (
+                    f", PARTITION_BY ({partitions}), WRITE_PARTITION_COLUMNS true"
+                )
+            else:
+                target = os.path.join(table_dir, "data_0.parquet")
+            conn.execute(
+                f"COPY (SELECT * FROM {_quote(table_name)} ORDER BY {order}) "
+                f"TO {_literal(target)} ({copy_options})"
+            )
+
+            files = sorted(
+                os.path.relpath(os.path.join(root, name), temp_dir)
+                for root, _, names in os.walk(table_dir)
+                for name in names
+            )
+            record = build_records.get(table_name)
+            table_manifest[table_name] = {
+                "columns": [[column[0], column[1]] for column in columns],
+                "row_count": conn.execute(
+                    f"SELECT COUNT(*) FROM {_quote(table_name)}"
+                ).fetchone()[0],
+                "fingerprint": fingerprint_table(conn, table_name),
+                "sort_by": sort_by,
+                "partition_by": partition_by,
+                "files": files,
+                "size_bytes": sum(
+                    os.path.getsize(os.path.join(temp_dir, name)) for name in files
+                ),
+                "build_record": None,
+            }
+            if record is not None:
+                table_manifest[table_name]["build_record"] = {
+                    "query_hash": record["query_hash"],
+                    "input_fingerprints": record["input_fingerprints"],
+                    "build_seconds": record["build_seconds"],
+                }
+
+        manifest = {
+            "snapshot_version": SNAPSHOT_VERSION,
+            **(metadata or {}),
+            "duckdb_version": duckdb.__version__,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "tables": table_manifest,
+        }
+        with open(os.path.join(temp_dir, SNAPSHOT_MANIFEST), "w") as f:
+            json.dump(manifest, f, indent=2)
+
+        os.chmod(temp_dir, 0o755)
+        if os.path.exists(snapshot_dir):
+            shutil.rmtree(snapshot_dir)
+        os.replace(temp_dir, snapshot_dir)
+    except BaseException:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        raise
+
+    return manifest
+
+
+def import_snapshot(
+    conn: duckdb.DuckDBPyConnection,
+    snapshot_dir: str,
+    tables: Optional[List[str]] = None,
+) -> Dict[str, int]:
+    """
+    Restore snapshot tables into a database, replacing existing tables.
+
+    Rows are restored in sort order and each table is checked against the
+    fingerprint in the manifest. Build records are restored with the tables
+    so incremental builds treat them as up to date.
+
+    Args:
+        conn: Connection to the target database
+        snapshot_dir: Snapshot directory
+        tables: Tables to restore (default: all)
+
+    Returns:
+        dict: Table name -> restored row count
+
+    Raises:
+        ValueError: If a table is not in the snapshot or fails verification
+    """
+    manifest = load_snapshot_manifest(snapshot_dir)
+    names = tables if tables is not None else list(manifest["tables"])
+    missing = [name for name in names if name not in manifest["tables"]]
+    if missing:
+        raise ValueError(f"Tables not in snapshot: {', '.join(missing)}")
+
+    build_manifest = BuildManifest(conn)
+    restored = {}
+    for table_name in names:
+        info = manifest["tables"][table_name]
+        select_list = ", ".join(
+            f"CAST({_quote(name)} AS {column_type}) AS {_quote(name)}"
+            for name, column_type in info["columns"]
+        )
+        order = ", ".join(_quote(column) for column in info["sort_by"])
+        conn.execute(
+            f"CREATE OR REPLACE TABLE {_quote(table_name)} AS "
+            f"SELECT {select_list} FROM {_read_parquet(snapshot_dir, table_name)} "
+            f"ORDER BY {order}"
+        )
+
+        if fingerprint_table(conn, table_name) != info["fingerprint"]:
+            raise ValueError(f"Restored table {table_name} does not match snapshot")
+
+        record = info.get("build_record")
+        if record:
+            build_manifest.record(
+                table_name,
+                record["query_hash"],
+                record["input_fingerprints"],
+                info["row_count"],
+                record["build_seconds"],
+            )
+        else:
+            build_manifest.remove(table_name)
+        restored[table_name] = info["row_count"]
+    return restored
+
+
+def create_snapshot_views(
+    conn: duckdb.DuckDBPyConnection,
+    snapshot_dir: str,
+    tables: Optional[List[str]] = None,
+) -> List[str]:
+    """
+    Expose snapshot tables as views reading the Parquet files directly.
+
+    Args:
+        conn: Connection receiving the views (usually in-memory)
+        snapshot_dir: Snapshot directory
+        tables: Tables to expose (default: all)
+
+    Returns:
+        list: Names of the created views
+    """
+    manifest = load_snapshot_manifest(snapshot_dir)
+    names = [name for name in manifest["tables"] if tables is None or name in tables]
+    for table_name in names:
+        conn.execute(
+            f"CREATE OR REPLACE VIEW {_quote(table_name)} AS "
+            f"SELECT * FROM {_read_parquet(snapshot_dir, table_name)}"
+        )
+    return names
+
+
+def diff_snapshots(old_dir: str, new_dir: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Compare the tables of two snapshots.
+
+    Tables whose fingerprints differ are compared row by row (as multisets,
+    ignoring row order) when their schemas match.
+
+    Args:
+        old_dir: Snapshot of the earlier build
+        new_dir: Snapshot of the later build
+
+    Returns:
+        dict: Table name -> {"status": "added" | "removed" | "unchanged" |
+            "changed", ...}; changed tables report row counts, schema changes
+            and the number of rows only in each snapshot
+    """
+    old_tables = load_snapshot_manifest(old_dir)["tables"]
+    new_tables = load_snapshot_manifest(new_dir)["tables"]
+
+    conn = duckdb.connect()
+    try:
+        diff = {}
+        for table_name in sorted(set(old_tables) | set(new_tables)):
+            old_info = old_tables.get(table_name)
+            new_info = new_tables.get(table_name)
+            if old_info is None:
+                diff[table_name] = {
+                    "status": "added",
+                    "new_rows": new_info["row_count"],
+                }
+                continue
+            if new_info is None:
+                diff[table_name] = {
+                    "status": "removed",
+                    "old_rows": old_info["row_count"],
+                }
+                continue
+            if old_info["fingerprint"] == new_info["fingerprint"]:
+                diff[table_name] = {"status": "unchanged"}
+                continue
+
+            changes = {
+                "status": "changed",
+                "old_rows": old_info["row_count"],
+                "new_rows": new_info["row_count"],
+                "schema_changed": old_info["columns"] != new_info["columns"],
+            }
+            if not changes["schema_changed"]:
+                old_scan = f"SELECT * FROM {_read_parquet(old_dir, table_name)}"
+                new_scan = f"SELECT * FROM {_read_parquet(new_dir, table_name)}"
+                changes["only_in_old"], changes["only_in_new"] = conn.execute(
+                    f"SELECT (SELECT COUNT(*) FROM ({old_scan} EXCEPT ALL {new_scan})), "
+                    f"(SELECT COUNT(*) FROM ({new_scan} EXCEPT ALL {old_scan}))"
+                ).fetchone()
+            diff[table_name] = changes
+        return diff
+    finally:
+        conn.close()
+
+
+def _print_diff(diff: Dict[str, Dict[str, Any]]) -> None:
+    """Print a snapshot diff table by table."""
+    for table_name, changes in diff.items():
+        status = changes["status"]
+        if status == "unchanged":
+            print(f"   ✅ {table_name}: unchanged")
+        elif status == "added":
+            print(f"   ➕ {table_name}: added ({changes['new_rows']} rows)")
+        elif status == "removed":
+            print(f"   ➖ {table_name}: removed ({changes['old_rows']} rows)")
+        else:
+            print(
+                f"   🔄 {table_name}: {changes['old_rows']} → "
+                f"{changes['new_rows']} rows"
+            )
+            if changes["schema_changed"]:
+                print("      ⚠️  Schema changed")
+            else:
+                print(
+                    f"      {changes['only_in_old']} rows only in old, "
+                    f"{changes['only_in_new']} rows only in new"
+                )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Export, restore and compare Parquet snapshots of derived tables"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser(
+        "export", help="Write a dataset's derived tables to a snapshot"
+    )
+    import_parser = subparsers.add_parser(
+        "import", help="Restore derived tables from a snapshot"
+    )
+    for subparser in (export_parser, import_parser):
+        subparser.add_argument("dataset", help="Dataset name (e.g., data_jobs)")
+        subparser.add_argument(
+            "--snapshot-dir",
+            default=None,
+            help="Snapshot directory (default: datasets/snapshots/<dataset>)",
+        )
+    import_parser.add_argument(
+        "--tables", nargs="+", default=None, help="Tables to restore (default: all)"
+    )
+    diff_parser = subparsers.add_parser("diff", help="Compare two snapshots")
+    diff_parser.add_argument("old_dir", help="Snapshot of the earlier build")
+    diff_parser.add_argument("new_dir", help="Snapshot of the later build")
+
+    args = parser.parse_args()
+
+    if args.command == "diff":
+        try:
+            diff = diff_snapshots(args.old_dir, args.new_dir)
+        except FileNotFoundError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        print(f"🔍 Comparing {args.old_dir} → {args.new_dir}")
+        _print_diff(diff)
+        return
+
+    project_root = Path(__file__).resolve().parent.parent.parent
+    db_path = project_root / "datasets" / f"{args.dataset}.db"
+    snapshot_dir = args.snapshot_dir or default_snapshot_path(
+        str(project_root), args.dataset
+    )
+    if not db_path.exists() and args.command == "export":
+        print(f"❌ Database not found: {db_path}")
+        sys.exit(1)
+
+    conn = duckdb.connect(str(db_path))
+    try:
+        if args.command == "export":
+            try:
+                table_queries = load_table_queries(args.dataset)
+            except FileNotFoundError as e:
+                print(f"❌ {e}")
+                sys.exit(1)
+            existing = {row[0] for row in conn.execute("SHOW TABLES").fetchall()}
+            tables = {
+                name: info
+                for name, info in table_queries["tables"].items()
+                if name in existing
+            }
+            manifest = export_snapshot(
+                conn, tables, snapshot_dir, metadata={"dataset": args.dataset}
+            )
+            print(f"✅ Exported {len(tables)} tables to {snapshot_dir}")
+            for table_name, info in manifest["tables"].items():
+                print(
+                    f"   • {table_name}: {info['row_count']} rows, "
+                    f"{info['size_bytes'] / 1e6:.2f} MB in {len(info['files'])} files"
+                )
+        else:
+            try:
+                restored = import_snapshot(conn, snapshot_dir, args.tables)
+            except (FileNotFoundError, ValueError) as e:
+                print(f"❌ {e}")
+                sys.exit(1)
+            print(f"✅ Restored {len(restored)} tables from {snapshot_dir}")
+            for table_name, row_count in restored.items():
+                print(f"   • {table_name}: {row_count} rows")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
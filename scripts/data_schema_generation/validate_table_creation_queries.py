@@ -8,6 +8,10 @@ This script validates table creation query JSON files by:
 3. Providing preview results for each table creation query
 4. Generating comprehensive validation reports
 
+Queries run in an in-memory scratch database with the real database
+attached read-only, so validation never modifies it and can run while the
+app is serving. Independent tables are built concurrently (--jobs).
+
 Usage:
     python validate_table_creation_queries.py --input table_creation_queries_jobs.json
     python validate_table_creation_queries.py --input table_creation_queries_jobs.json --database ../datasets/data_jobs.db
@@ -16,11 +20,45 @@ Usage:
 import argparse
 import json
 import sys
-import traceback
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+import duckdb
+
 from scripts.core.sql_helper import SQLHelper
+from scripts.data_schema_generation.create_tables_from_queries import (
+    DEFAULT_BUILD_JOBS,
+    build_table_query,
+    build_tables,
+    candidate_rows_query,
+    layout_statements,
+    table_dependencies,
+)
+
+# Scratch tables shadow the attached source's tables of the same name
+SCRATCH_SEARCH_PATH = "memory.main,source.main"
+
+
+def open_scratch_database(database_path: str) -> duckdb.DuckDBPyConnection:
+    """
+    Open an in-memory database that reads a real database attached read-only.
+
+    Tables created in it are discarded on close; unqualified names resolve
+    to scratch tables first, then to the source's.
+
+    Args:
+        database_path: Database holding the source tables
+
+    Returns:
+        Connection to the scratch database
+    """
+    if not Path(database_path).exists():
+        raise FileNotFoundError(f"Database file not found: {database_path}")
+    conn = duckdb.connect()
+    escaped_path = str(database_path).replace("'", "''")
+    conn.execute(f"ATTACH '{escaped_path}' AS source (READ_ONLY)")
+    conn.execute(f"SET search_path = '{SCRATCH_SEARCH_PATH}'")
+    return conn
 
 
 class TableCreationValidator:
@@ -28,16 +66,23 @@ class TableCreationValidator:
     Validates table creation query JSON files for structure and SQL validity.
     """
 
-    def __init__(self, input_file: str, database_path: str = None):
+    def __init__(
+        self,
+        input_file: str,
+        database_path: str = None,
+        jobs: int = DEFAULT_BUILD_JOBS,
+    ):
         """
         Initialize the validator.
 
         Args:
             input_file: Path to the JSON file to validate
             database_path: Path to the database file (optional)
+            jobs: Maximum number of tables built at the same time
         """
         self.input_file = Path(input_file)
         self.database_path = database_path
+        self.jobs = jobs
         self.sql_helper = None
         self.validation_results = {
             "schema_validation": {"passed": False, "errors": [], "warnings": []},
@@ -67,22 +112,23 @@ class TableCreationValidator:
         if self.database_path:
             self._initialize_sql_helper()
 
-        # Step 4: Preview row counts (new feature)
-        if self.sql_helper:
-            self.preview_row_counts(json_data)
-
-        # Step 5: Validate SQL queries
+        # Step 4: Validate SQL queries
         if self.sql_helper:
             self._validate_sql_queries(json_data)
         else:
             print("⚠️  Database not provided - skipping SQL query validation")
 
+        # Step 5: Preview row counts (after the build, so queries reading
+        # derived tables find them in the scratch database)
+        if self.sql_helper:
+            self.preview_row_counts(json_data)
+
         # Step 6: Generate summary report
         self._generate_summary_report()
 
-        # Step 7: Clean up test tables
+        # Step 7: Discard the scratch database
         if self.sql_helper:
-            self._cleanup_test_tables(json_data)
+            self.sql_helper.close()
 
         return self.validation_results
 
@@ -236,13 +282,51 @@ class TableCreationValidator:
                 self.validation_results["schema_validation"]["errors"].append(error_msg)
                 print(f"❌ {error_msg}")
 
+        sampling = table_config.get("sampling")
+        if sampling is not None:
+            if not isinstance(sampling, dict):
+                error_msg = f"Table '{table_name}' sampling must be an object"
+            elif ("limit" in sampling) == ("fraction" in sampling):
+                error_msg = (
+                    f"Table '{table_name}' sampling needs exactly one of "
+                    "'limit' or 'fraction'"
+                )
+            else:
+                error_msg = None
+            if error_msg:
+                self.validation_results["schema_validation"]["errors"].append(error_msg)
+                print(f"❌ {error_msg}")
+
+        layout = table_config.get("layout")
+        if layout is not None:
+            if not isinstance(layout, dict):
+                error_msg = f"Table '{table_name}' layout must be an object"
+            elif not isinstance(layout.get("sort_by", []), list):
+                error_msg = f"Table '{table_name}' layout sort_by must be a list"
+            elif not isinstance(layout.get("indexes", []), list):
+                error_msg = f"Table '{table_name}' layout indexes must be a list"
+            elif not isinstance(layout.get("row_group_size", 1), int):
+                error_msg = (
+                    f"Table '{table_name}' layout row_group_size must be an integer"
+                )
+            else:
+                error_msg = None
+            if error_msg:
+                self.validation_results["schema_validation"]["errors"].append(error_msg)
+                print(f"❌ {error_msg}")
+
         print(f"  ✅ Table '{table_name}' structure valid")
 
     def _initialize_sql_helper(self) -> None:
-        """Initialize SQL helper with database connection."""
+        """Initialize SQL helper on a scratch database reading the real one."""
         try:
-            self.sql_helper = SQLHelper(self.database_path)
-            print(f"✅ SQL Helper initialized with database: {self.database_path}")
+            self.sql_helper = SQLHelper.from_connection(
+                open_scratch_database(self.database_path)
+            )
+            print(
+                f"✅ SQL Helper initialized on a scratch database "
+                f"(read-only source: {self.database_path})"
+            )
         except Exception as e:
             error_msg = f"Failed to initialize SQL Helper: {e}"
             self.validation_results["query_validation"]["errors"].append(error_msg)
@@ -257,12 +341,45 @@ class TableCreationValidator:
             return
 
         tables = data["tables"]
-        successful_queries = 0
+        metadata = data.get("metadata")
 
+        queries = {}
+        post_build = {}
         for table_name, table_config in tables.items():
             if "query" not in table_config:
                 continue
+            try:
+                queries[table_name] = build_table_query(table_config, metadata)
+                post_build[table_name] = layout_statements(
+                    table_name, table_config.get("layout")
+                )
+            except ValueError as e:
+                error_msg = f"Invalid sampling or layout for table '{table_name}': {e}"
+                self.validation_results["query_validation"]["errors"].append(error_msg)
+                print(f"   ❌ {error_msg}")
+
+        try:
+            dependencies = table_dependencies(tables, metadata)
+        except ValueError as e:
+            error_msg = f"Invalid table dependencies: {e}"
+            self.validation_results["query_validation"]["errors"].append(error_msg)
+            print(f"❌ {error_msg}")
+            return
+
+        print(f"🧪 Building {len(queries)} tables in a scratch database")
+        build_results = build_tables(
+            self.sql_helper.conn,
+            queries,
+            dependencies,
+            jobs=self.jobs,
+            verbose=False,
+            post_build=post_build,
+            search_path=SCRATCH_SEARCH_PATH,
+        )
 
+        successful_queries = 0
+        for table_name in queries:
+            table_config = tables[table_name]
             print(f"\n📋 Testing table: {table_name}")
             print(
                 f"   Description: {table_config.get('description', 'No description')}"
@@ -270,9 +387,7 @@ class TableCreationValidator:
             print(
                 f"   Expected rows: {table_config.get('row_count_estimate', 'Unknown')}"
             )
-
-            success = self._test_single_query(table_name, table_config["query"])
-            if success:
+            if self._record_query_result(table_name, build_results[table_name]):
                 successful_queries += 1
 
         # Set query validation status
@@ -285,102 +400,52 @@ class TableCreationValidator:
                 f"\n❌ {successful_queries}/{total_queries} queries validated successfully"
             )
 
-    def _test_single_query(self, table_name: str, query: str) -> bool:
-        """Test a single SQL query."""
-        try:
-            # Drop table if it exists (for testing purposes)
-            drop_query = f"DROP TABLE IF EXISTS {table_name}"
-            drop_result = self.sql_helper.execute_query(drop_query)
-            if drop_result["status"] == "success":
-                print(f"   🗑️  Dropped existing table: {table_name}")
-
-            # Execute the query
-            result = self.sql_helper.execute_query(query)
-
-            if result["status"] == "success":
-                # Store results
-                self.validation_results["query_results"][table_name] = {
-                    "status": "success",
-                    "row_count": result["row_count"],
-                    "columns": result["columns"],
-                    "execution_time": result["execution_time"],
-                    "sample_data": result["data"].head(5).to_dict("records")
-                    if result["data"] is not None
-                    else [],
-                }
-
-                print("   ✅ Query executed successfully")
-                print(
-                    f"   📊 Created {result['row_count']} rows, {len(result['columns'])} columns"
-                )
-                print(f"   ⏱️  Execution time: {result['execution_time']}s")
-                print(f"   📋 Columns: {', '.join(result['columns'])}")
-
-                # Show sample data
-                if result["data"] is not None and not result["data"].empty:
-                    print("   📄 Sample data (first 5 rows):")
-                    sample_data = result["data"].head(5)
-                    for i, row in sample_data.iterrows():
-                        print(f"      Row {i+1}: {dict(row)}")
-                else:
-                    print("   📭 No data returned")
-
-                return True
-
-            else:
-                # Query failed
-                error_msg = f"Query failed for table '{table_name}': {result['error']}"
-                self.validation_results["query_validation"]["errors"].append(error_msg)
-
-                self.validation_results["query_results"][table_name] = {
-                    "status": "error",
-                    "error": result["error"],
-                    "error_type": result.get("error_type", "Unknown"),
-                }
-
-                print(f"   ❌ Query failed: {result['error']}")
-                if result.get("error_type"):
-                    print(f"   🔍 Error type: {result['error_type']}")
-
-                return False
-
-        except Exception as e:
-            error_msg = f"Exception testing query for table '{table_name}': {e}"
+    def _record_query_result(
+        self, table_name: str, build_result: Dict[str, Any]
+    ) -> bool:
+        """Record and print the outcome of building one table in the scratch database."""
+        if build_result["status"] != "success":
+            error_msg = (
+                f"Query failed for table '{table_name}': {build_result['error']}"
+            )
             self.validation_results["query_validation"]["errors"].append(error_msg)
-
             self.validation_results["query_results"][table_name] = {
-                "status": "exception",
-                "error": str(e),
-                "traceback": traceback.format_exc(),
+                "status": build_result["status"],
+                "error": build_result["error"],
             }
-
-            print(f"   ❌ Exception: {e}")
+            print(f"   ❌ Query failed: {build_result['error']}")
             return False
 
-    def _cleanup_test_tables(self, data: Dict[str, Any]) -> None:
-        """Clean up test tables created during validation."""
-        print("\n🧹 CLEANING UP TEST TABLES")
-        print("-" * 40)
-
-        if "tables" not in data:
-            return
-
-        tables = data["tables"]
-        cleaned_count = 0
+        sample = self.sql_helper.execute_query(f"SELECT * FROM {table_name} LIMIT 5")
+        sample_data = sample["data"] if sample["status"] == "success" else None
+        execution_time = round(build_result["end"] - build_result["start"], 3)
+        self.validation_results["query_results"][table_name] = {
+            "status": "success",
+            "row_count": build_result["row_count"],
+            "columns": sample["columns"],
+            "execution_time": execution_time,
+            "sample_data": sample_data.to_dict("records")
+            if sample_data is not None
+            else [],
+        }
 
-        for table_name in tables.keys():
-            try:
-                drop_query = f"DROP TABLE IF EXISTS {table_name}"
-                result = self.sql_helper.execute_query(drop_query)
-                if result["status"] == "success":
-                    print(f"   🗑️  Cleaned up table: {table_name}")
-                    cleaned_count += 1
-                else:
-                    print(f"   ⚠️  Could not clean up table: {table_name}")
-            except Exception as e:
-                print(f"   ❌ Error cleaning table {table_name}: {e}")
+        print("   ✅ Query executed successfully")
+        print(
+            f"   📊 Created {build_result['row_count']} rows, "
+            f"{len(sample['columns'])} columns"
+        )
+        print(f"   ⏱️  Execution time: {execution_time}s")
+        print(f"   📋 Columns: {', '.join(sample['columns'])}")
+
+        # Show sample data
+        if sample_data is not None and not sample_data.empty:
+            print("   📄 Sample data (first 5 rows):")
+            for i, row in sample_data.iterrows():
+                print(f"      Row {i + 1}: {dict(row)}")
+        else:
+            print("   📭 No data returned")
 
-        print(f"✅ Cleaned up {cleaned_count}/{len(tables)} test tables")
+        return True
 
     def _generate_summary_report(self) -> None:
         """Generate final validation summary report."""
@@ -440,7 +505,14 @@ class TableCreationValidator:
                 print(f"  - Query: {error}")
 
     def preview_row_counts(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Preview expected vs available row counts for each table."""
+        """
+        Preview sampled vs available row counts for each table.
+
+        Tables built in the scratch database report their built row count.
+        Otherwise the count is estimated from the limit, or from the
+        fraction, which hash sampling only meets approximately unless the
+        sample is declared exact.
+        """
         print("\n📊 PREVIEWING ROW COUNTS AND VALIDATING 75% MINIMUM")
         print("-" * 60)
 
@@ -448,32 +520,62 @@ class TableCreationValidator:
             print("⚠️  Cannot preview - no database or tables found")
             return {}
 
+        # Sampled tables: a sampling block or a final LIMIT
+        candidates = {}
+        limits = {}
+        for table_name, table_config in data["tables"].items():
+            try:
+                select, limit = candidate_rows_query(table_config.get("query", ""))
+            except ValueError:
+                select = limit = None
+            if table_config.get("sampling") or limit is not None:
+                candidates[table_name] = select
+                limits[table_name] = limit
+
+        available_counts = self._count_available_rows(
+            {name: select for name, select in candidates.items() if select}
+        )
+
         preview_results = {}
         validation_errors = []
 
         for table_name, table_config in data["tables"].items():
             print(f"\n📋 Analyzing table: {table_name}")
 
-            query = table_config.get("query", "")
-            expected_count = table_config.get("row_count_estimate", 0)
-
-            # Skip salary_ranges as it's reference data, not sampled
-            if table_name == "salary_ranges":
-                print(f"   ⚠️  Skipping {table_name} - reference data table")
+            if table_name not in candidates:
+                print("   ✅ Not sampled - uses all available rows")
                 continue
 
-            # Extract the counting logic based on table type
-            available_count = self._count_available_rows(table_name, query)
-
-            if available_count > 0:
-                percentage_used = (
-                    (expected_count / available_count * 100)
-                    if available_count > 0
-                    else 0
-                )
+            query = table_config.get("query", "")
+            sampling = table_config.get("sampling") or {}
+            available_count = available_counts.get(table_name)
+
+            if available_count:
+                built = self.validation_results["query_results"].get(table_name, {})
+                if built.get("row_count") is not None:
+                    expected_count = built["row_count"]
+                    count_label = "Built rows"
+                elif "fraction" in sampling and sampling.get("exact"):
+                    expected_count = int(
+                        available_count * min(sampling["fraction"], 1) + 0.5
+                    )
+                    count_label = "Expected rows"
+                elif "fraction" in sampling:
+                    expected_count = int(available_count * min(sampling["fraction"], 1))
+                    count_label = "Expected rows (approximate)"
+                else:
+                    limit = sampling.get("limit", limits[table_name])
+                    expected_count = min(int(limit), available_count)
+                    count_label = "Expected rows"
+                percentage_used = expected_count / available_count * 100
 
                 print(f"   📊 Available rows: {available_count:,}")
-                print(f"   🎯 Expected rows: {expected_count:,}")
+                print(f"   🎯 {count_label}: {expected_count:,}")
+                if "fraction" in sampling and not sampling.get("exact"):
+                    print(
+                        f"   🎲 Hash sample of ~{sampling['fraction']:.0%} "
+                        "(row count is approximate)"
+                    )
                 print(f"   📈 Percentage used: {percentage_used:.1f}%")
 
                 # Validate 75% minimum requirement (use >= to handle floating point precision)
@@ -485,8 +587,12 @@ class TableCreationValidator:
                     print(f"   ❌ {error_msg}")
 
                 # Check if it's using random sampling
-                randomness_check = self._validate_randomness(table_name, query)
-                if randomness_check["has_random"]:
+                randomness_check = self._validate_randomness(
+                    table_name, query, table_config.get("sampling")
+                )
+                if randomness_check["has_hash_sampling"]:
+                    print("   ✅ Uses seeded hash sampling (thread-count invariant)")
+                elif randomness_check["has_random"]:
                     print("   ✅ Uses random sampling")
                     if randomness_check["has_seed"]:
                         print("   ✅ Uses deterministic seeding")
@@ -530,35 +636,57 @@ class TableCreationValidator:
 
         return preview_results
 
-    def _count_available_rows(self, table_name: str, query: str) -> int:
-        """Count available rows for a specific table type."""
-        try:
-            # Extract the core counting logic for each table type
-            if table_name == "companies":
-                count_query = "SELECT COUNT(DISTINCT company_name) as count FROM data_jobs WHERE company_name IS NOT NULL"
-            elif table_name == "locations":
-                count_query = "SELECT COUNT(DISTINCT job_location) as count FROM data_jobs WHERE job_location IS NOT NULL AND job_country IS NOT NULL"
-            elif table_name == "job_platforms":
-                count_query = "SELECT COUNT(DISTINCT job_via) as count FROM data_jobs WHERE job_via IS NOT NULL"
-            elif table_name == "job_postings":
-                count_query = "SELECT COUNT(*) as count FROM data_jobs WHERE job_posted_date IS NOT NULL"
-            else:
-                return 0
+    def _count_available_rows(self, candidates: Dict[str, str]) -> Dict[str, int]:
+        """
+        Count the candidate rows of each sampled table in one batched query.
+
+        If the batch fails, tables are counted one by one so a single broken
+        query only loses its own count.
 
-            result = self.sql_helper.execute_query(count_query)
+        Args:
+            candidates: Table name -> SELECT its rows are sampled from
+
+        Returns:
+            dict: Table name -> available rows, for the tables that could be counted
+        """
+        counts = {}
+        if not candidates:
+            return counts
+
+        def count_query(table_name: str, select: str) -> str:
+            literal = table_name.replace("'", "''")
+            return f"SELECT '{literal}' AS table_name, COUNT(*) AS available FROM ({select})"
+
+        batch = "\nUNION ALL\n".join(
+            count_query(table_name, select) for table_name, select in candidates.items()
+        )
+        result = self.sql_helper.execute_query(batch)
+        if result["status"] == "success":
+            for row in result["data"].itertuples(index=False):
+                counts[row.table_name] = int(row.available)
+            return counts
+
+        for table_name, select in candidates.items():
+            result = self.sql_helper.execute_query(count_query(table_name, select))
             if result["status"] == "success":
-                return int(result["data"].iloc[0]["count"])
+                counts[table_name] = int(result["data"].iloc[0]["available"])
             else:
-                print(f"   ❌ Error counting available rows: {result['error']}")
-                return 0
-
-        except Exception as e:
-            print(f"   ❌ Exception counting available rows: {e}")
-            return 0
+                print(
+                    f"   ❌ Error counting available rows for {table_name}: "
+                    f"{result['error']}"
+                )
+        return counts
 
-    def _validate_randomness(self, table_name: str, query: str) -> Dict[str, bool]:
+    def _validate_randomness(
+        self, table_name: str, query: str, sampling: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, bool]:
         """Validate that randomness is properly implemented and deterministic."""
-        result = {"has_random": False, "has_seed": False, "seed_works": False}
+        result = {
+            "has_random": False,
+            "has_seed": False,
+            "seed_works": False,
+            "has_hash_sampling": bool(sampling),
+        }
 
         # Check for RANDOM() function (case insensitive)
         query_upper = query.upper()
@@ -618,6 +746,12 @@ def main():
     parser.add_argument(
         "--database", help="Path to the database file for SQL validation (optional)"
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_BUILD_JOBS,
+        help=f"Tables validated at the same time (default: {DEFAULT_BUILD_JOBS})",
+    )
 
     args = parser.parse_args()
 
@@ -636,7 +770,7 @@ def main():
                 break
 
     # Create validator and run validation
-    validator = TableCreationValidator(args.input, args.database)
+    validator = TableCreationValidator(args.input, args.database, jobs=args.jobs)
     results = validator.validate_all()
 
     # Exit with appropriate code
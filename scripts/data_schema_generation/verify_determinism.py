@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Verify that a dataset's table creation queries are deterministic.
+
+Every derived table is built twice, each time in a fresh in-memory scratch
+database reading the real database read-only, optionally at different
+DuckDB thread counts. The builds are compared by order-independent content
+fingerprints (a single streaming sum of row hashes per table), so even the
+largest tables are checked without sorting or exporting them.
+
+The first differing table whose dependencies match is reported as the
+source of the nondeterminism; tables built from it are listed as well.
+
+Usage:
+    python scripts/data_schema_generation/verify_determinism.py data_jobs
+    python scripts/data_schema_generation/verify_determinism.py data_jobs --threads 1 8
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from scripts.data_schema_generation.build_manifest import (  # noqa: E402
+    fingerprint_table,
+)
+from scripts.data_schema_generation.create_tables_from_queries import (  # noqa: E402
+    DEFAULT_BUILD_JOBS,
+    build_table_query,
+    build_tables,
+    load_table_queries,
+    table_dependencies,
+)
+from scripts.data_schema_generation.validate_table_creation_queries import (  # noqa: E402
+    SCRATCH_SEARCH_PATH,
+    open_scratch_database,
+)
+
+# Thread counts of the two builds: serial, then parallel
+DEFAULT_THREADS = (1, 4)
+
+
+def build_fingerprints(
+    source_path: str,
+    queries: Dict[str, str],
+    dependencies: Dict[str, Set[str]],
+    threads: int,
+    jobs: int = DEFAULT_BUILD_JOBS,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Build tables in a scratch database and fingerprint them.
+
+    Args:
+        source_path: Database holding the source tables
+        queries: Table name -> SQL creating it, in file order
+        dependencies: Table name -> names of the tables it depends on
+        threads: DuckDB thread count of the build
+        jobs: Maximum number of tables built at the same time
+
+    Returns:
+        dict: Table name -> build result, with a "fingerprint" on success
+    """
+    conn = open_scratch_database(source_path)
+    try:
+        conn.execute(f"SET threads = {int(threads)}")
+        results = build_tables(
+            conn,
+            queries,
+            dependencies,
+            jobs=jobs,
+            verbose=False,
+            search_path=SCRATCH_SEARCH_PATH,
+        )
+        for table_name, result in results.items():
+            if result["status"] == "success":
+                result["fingerprint"] = fingerprint_table(conn, table_name)
+        return results
+    finally:
+        conn.close()
+
+
+def verify_determinism(
+    source_path: str,
+    tables: Dict[str, Dict[str, Any]],
+    metadata: Optional[Dict[str, Any]] = None,
+    threads: Sequence[int] = DEFAULT_THREADS,
+    jobs: int = DEFAULT_BUILD_JOBS,
+) -> Dict[str, Any]:
+    """
+    Build every table twice and compare the builds.
+
+    Args:
+        source_path: Database holding the source tables
+        tables: Table entries of the table creation queries JSON
+        metadata: The JSON's metadata, for the default sampling seed
+        threads: Thread counts of the first and second build
+        jobs: Maximum number of tables built at the same time
+
+    Returns:
+        dict: Per table status ("identical", "different" or "error") and
+            row counts, plus "first_difference" (the table to investigate,
+            or None) and the seconds each build took
+    """
+    queries = {
+        name: build_table_query(info, metadata)
+        for name, info in tables.items()
+        if "query" in info
+    }
+    dependencies = table_dependencies(tables, metadata)
+
+    builds = []
+    seconds = []
+    for thread_count in threads[:2]:
+        started = time.perf_counter()
+        builds.append(
+            build_fingerprints(source_path, queries, dependencies, thread_count, jobs)
+        )
+        seconds.append(time.perf_counter() - started)
+
+    report = {}
+    for table_name in queries:
+        first, second = builds[0][table_name], builds[1][table_name]
+        if first["status"] != "success" or second["status"] != "success":
+            error = first.get("error") or second.get("error")
+            report[table_name] = {"status": "error", "error": error}
+            continue
+        identical = first["fingerprint"] == second["fingerprint"]
+        report[table_name] = {
+            "status": "identical" if identical else "different",
+            "row_counts": [first["row_count"], second["row_count"]],
+        }
+
+    # A table differing while its own dependencies match is the root cause
+    first_difference = None
+    for table_name, result in report.items():
+        if result["status"] != "different":
+            continue
+        upstream = dependencies.get(table_name, set()) & report.keys()
+        if all(report[name]["status"] == "identical" for name in upstream):
+            first_difference = table_name
+            break
+
+    return {
+        "tables": report,
+        "first_difference": first_difference,
+        "threads": list(threads[:2]),
+        "build_seconds": seconds,
+    }
+
+
+def _print_report(verification: Dict[str, Any]) -> List[str]:
+    """Print a verification report; return the tables that are not identical."""
+    first, second = verification["threads"]
+    print(
+        f"🧵 Builds at {first} and {second} threads: "
+        + ", ".join(f"{s:.1f}s" for s in verification["build_seconds"])
+    )
+    failed = []
+    for table_name, result in verification["tables"].items():
+        if result["status"] == "identical":
+            print(f"   ✅ {table_name}: identical ({result['row_counts'][0]:,} rows)")
+            continue
+        failed.append(table_name)
+        if result["status"] == "error":
+            print(f"   ❌ {table_name}: build failed: {result['error']}")
+        else:
+            counts = " vs ".join(f"{count:,}" for count in result["row_counts"])
+            print(f"   ❌ {table_name}: contents differ ({counts} rows)")
+    if verification["first_difference"]:
+        print(f"\n🔍 First nondeterministic table: {verification['first_difference']}")
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build a dataset's tables twice and compare their contents"
+    )
+    parser.add_argument("dataset", help="Dataset name (e.g., data_jobs)")
+    parser.add_argument(
+        "--threads",
+        type=int,
+        nargs=2,
+        default=list(DEFAULT_THREADS),
+        metavar=("FIRST", "SECOND"),
+        help="DuckDB thread counts of the two builds (default: 1 4)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_BUILD_JOBS,
+        help=f"Tables built concurrently when independent (default: {DEFAULT_BUILD_JOBS})",
+    )
+    args = parser.parse_args()
+
+    project_root = Path(__file__).resolve().parent.parent.parent
+    db_path = project_root / "datasets" / f"{args.dataset}.db"
+    try:
+        queries_data = load_table_queries(args.dataset)
+        verification = verify_determinism(
+            str(db_path),
+            queries_data["tables"],
+            queries_data.get("metadata"),
+            threads=args.threads,
+            jobs=args.jobs,
+        )
+    except (FileNotFoundError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    failed = _print_report(verification)
+    if failed:
+        print(f"\n💥 {len(failed)} tables are not deterministic: {', '.join(failed)}")
+        sys.exit(1)
+    print(f"\n🎉 All {len(verification['tables'])} tables are deterministic")
+
+
+if __name__ == "__main__":
+    main()
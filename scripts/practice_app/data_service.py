@@ -4,7 +4,13 @@ Data service for loading exercise data and table schemas for the SQL practice ap
 
 import json
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from scripts.utilities.student_database import (
+    manifest_path,
+    student_database_path,
+    verify_student_database,
+)
 
 
 class DataService:
@@ -23,6 +29,9 @@ class DataService:
         self.exercises_data = None
         self.schema_data = None
         self.current_dataset = None
+        self.using_student_database = False
+        # (file signatures, result) of the last slim database verification
+        self._student_database_check: Optional[Tuple[tuple, bool]] = None
 
     def load_exercises(self, week: int = None) -> Dict[str, Any]:
         """
@@ -235,8 +244,66 @@ class DataService:
 
     def get_database_path(self) -> str:
         """
-        Get the path to the database file.
-        Auto-detects the correct database based on the current dataset.
+        Get the path to the database file students query.
+        Prefers the week's slim student database when its checksum matches,
+        otherwise auto-detects the full database of the current dataset.
+
+        Returns:
+            Path to the database file
+        """
+        student_db = self.get_student_database_path()
+        self.using_student_database = student_db is not None
+        if student_db is not None:
+            return student_db
+        return self.get_source_database_path()
+
+    def get_student_database_path(self) -> Optional[str]:
+        """
+        Get the path to the week's slim student database, if a valid one exists.
+
+        The verification hashes the slim database and compares it with the
+        full one, so its result is reused until any of the files changes.
+
+        Returns:
+            Path to the database file, or None if it is missing, fails its
+            manifest checksum or is older than the full database's tables
+        """
+        db_path = student_database_path(self.base_path, self.week)
+        if not os.path.exists(db_path):
+            return None
+
+        exercises_data = self.load_exercises()
+        schema_tables = exercises_data.get("metadata", {}).get("schema_tables", [])
+        try:
+            source_path = self.get_source_database_path()
+        except FileNotFoundError:
+            # Deployments may ship only the slim database
+            source_path = None
+
+        checked_paths = [db_path, manifest_path(db_path)]
+        if source_path is not None:
+            checked_paths += [source_path, f"{source_path}.wal"]
+        signatures = tuple(self._file_signature(path) for path in checked_paths)
+        if (
+            self._student_database_check is None
+            or self._student_database_check[0] != signatures
+        ):
+            valid = verify_student_database(db_path, schema_tables, source_path)
+            self._student_database_check = (signatures, valid)
+        return db_path if self._student_database_check[1] else None
+
+    @staticmethod
+    def _file_signature(path: str) -> Optional[Tuple[int, int]]:
+        """Modification time and size of a file, or None if it does not exist."""
+        try:
+            stat_result = os.stat(path)
+        except OSError:
+            return None
+        return stat_result.st_mtime_ns, stat_result.st_size
+
+    def get_source_database_path(self) -> str:
+        """
+        Get the path to the full database the week's tables are built in.
 
         Returns:
             Path to the database file
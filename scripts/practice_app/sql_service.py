@@ -2,35 +2,94 @@
 SQL execution service for running student queries against the DuckDB database.
 """
 
+import atexit
+import os
+import shutil
+import tempfile
 import time
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 import duckdb
 
+from scripts.core.query_profile import run_with_profile
+from scripts.data_schema_generation.table_snapshots import create_snapshot_views
+
 
 class SQLService:
     """Service for executing SQL queries against the DuckDB database."""
 
-    def __init__(self, db_path: str):
+    def __init__(
+        self,
+        db_path: str,
+        telemetry=None,
+        read_only: bool = False,
+        snapshot_dir: Optional[str] = None,
+    ):
         """
         Initialize the SQL service.
 
         Args:
             db_path: Path to the DuckDB database file
+            telemetry: Optional QueryTelemetry that receives one event per
+                executed query
+            read_only: Open the database read-only (slim student databases)
+            snapshot_dir: Serve tables as views over this Parquet snapshot
+                instead of opening db_path
         """
         self.db_path = db_path
-
-    def execute_query(self, query: str, limit: int = 1000) -> Dict[str, Any]:
+        self.telemetry = telemetry
+        self.read_only = read_only
+        self.snapshot_dir = snapshot_dir
+
+        # Snapshot views are created once in a catalog file that requests
+        # open read-only, so student queries cannot drop or replace them
+        self._views_dir = None
+        self._views_path = None
+        if snapshot_dir is not None:
+            self._views_dir = tempfile.mkdtemp(prefix="sql_snapshot_views_")
+            self._views_path = os.path.join(self._views_dir, "views.db")
+            with duckdb.connect(self._views_path) as conn:
+                create_snapshot_views(conn, os.path.abspath(snapshot_dir))
+            atexit.register(self.close)
+
+    def close(self) -> None:
+        """Remove the snapshot view catalog, if any."""
+        if self._views_dir is not None:
+            shutil.rmtree(self._views_dir, ignore_errors=True)
+            self._views_dir = None
+            self._views_path = None
+
+    def execute_query(
+        self,
+        query: str,
+        limit: int = 1000,
+        profile: bool = False,
+        exercise_id: Optional[int] = None,
+        source: str = "student",
+    ) -> Dict[str, Any]:
         """
         Execute a SQL query and return results with metadata.
 
         Args:
             query: SQL query to execute
             limit: Maximum number of rows to return
+            profile: Include DuckDB's query profile (plan tree with
+                per-operator timings and cardinalities) under "profile"
+            exercise_id: Exercise the query belongs to (for telemetry)
+            source: Origin of the query (for telemetry)
 
         Returns:
             Dictionary containing query results, metadata, and any errors
         """
+        result = self._run_query(query, limit, profile)
+
+        if self.telemetry is not None:
+            self.telemetry.record(query, result, exercise_id, source)
+
+        return result
+
+    def _run_query(self, query: str, limit: int, profile: bool) -> Dict[str, Any]:
+        """Execute a query and build the response dictionary."""
         start_time = time.time()
 
         try:
@@ -54,13 +113,14 @@ class SQLService:
                 query = f"{query} LIMIT {limit}"
 
             # Execute the query
-            with duckdb.connect(self.db_path) as conn:
-                result = conn.execute(query).fetchall()
-
-                # Get column names from the query description
-                columns = (
-                    [desc[0] for desc in conn.description] if conn.description else []
-                )
+            with self._connect() as conn:
+                query_profile = None
+                if profile:
+                    (result, columns), query_profile = run_with_profile(
+                        conn, query, self._fetch_rows
+                    )
+                else:
+                    result, columns = self._fetch_rows(conn.execute(query))
 
                 # Convert results to list of dictionaries
                 data = []
@@ -70,7 +130,7 @@ class SQLService:
 
                 execution_time = time.time() - start_time
 
-                return {
+                response = {
                     "success": True,
                     "error": None,
                     "data": data,
@@ -78,18 +138,36 @@ class SQLService:
                     "row_count": len(data),
                     "execution_time": round(execution_time, 4),
                 }
+                if query_profile is not None:
+                    response["profile"] = query_profile
+                return response
 
         except Exception as e:
             execution_time = time.time() - start_time
             return {
                 "success": False,
                 "error": str(e),
+                "error_type": type(e).__name__,
                 "data": [],
                 "columns": [],
                 "row_count": 0,
                 "execution_time": round(execution_time, 4),
             }
 
+    def _connect(self) -> duckdb.DuckDBPyConnection:
+        """Open a connection to the database, or to the snapshot views."""
+        if self._views_path is not None:
+            return duckdb.connect(self._views_path, read_only=True)
+        return duckdb.connect(self.db_path, read_only=self.read_only)
+
+    def _fetch_rows(self, cursor) -> Tuple[List[tuple], List[str]]:
+        """Fetch all rows and column names from an executed cursor."""
+        rows = cursor.fetchall()
+
+        # Get column names from the query description
+        columns = [desc[0] for desc in cursor.description] if cursor.description else []
+        return rows, columns
+
     def get_table_info(self) -> List[Dict[str, Any]]:
         """
         Get information about all tables in the database.
@@ -98,10 +176,12 @@ class SQLService:
             List of table information dictionaries
         """
         try:
-            with duckdb.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 # Get all table names
                 tables_result = conn.execute("SHOW TABLES").fetchall()
-                tables = [table[0] for table in tables_result]
+                tables = [
+                    table[0] for table in tables_result if not table[0].startswith("_")
+                ]
 
                 table_info = []
                 for table_name in tables:
@@ -150,7 +230,7 @@ class SQLService:
             Dictionary containing sample data
         """
         query = f"SELECT * FROM {table_name} LIMIT {limit}"
-        return self.execute_query(query)
+        return self.execute_query(query, source="sample")
 
     def validate_query(self, query: str) -> Dict[str, Any]:
         """
@@ -163,7 +243,7 @@ class SQLService:
             Dictionary containing validation results
         """
         try:
-            with duckdb.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 # Use EXPLAIN to validate without executing
                 conn.execute(f"EXPLAIN {query}")
                 return {"valid": True, "error": None}
@@ -189,7 +269,7 @@ class SQLService:
             Dictionary containing table schema information
         """
         try:
-            with duckdb.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 # Get table schema
                 desc_result = conn.execute(f"DESCRIBE {table_name}").fetchall()
 
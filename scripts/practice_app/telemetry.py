@@ -0,0 +1,230 @@
+"""
+Query telemetry for the SQL practice app.
+
+Records one event per query execution into an in-memory ring buffer and
+flushes it from a background thread in batches to Parquet files, so logging
+adds no latency to the request path. The log can be queried with DuckDB:
+
+    SELECT * FROM read_parquet('telemetry/*.parquet')
+"""
+
+import atexit
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import duckdb
+import pandas as pd
+
+from scripts.core.query_fingerprint import fingerprint_query, normalize_query
+
+# Columns of the Parquet event log and their DuckDB types
+EVENT_SCHEMA = {
+    "event_time": "TIMESTAMPTZ",
+    "fingerprint": "VARCHAR",
+    "normalized_query": "VARCHAR",
+    "exercise_id": "INTEGER",
+    "source": "VARCHAR",
+    "latency_ms": "DOUBLE",
+    "row_count": "BIGINT",
+    "success": "BOOLEAN",
+    "error_class": "VARCHAR",
+    "cache_hit": "BOOLEAN",
+}
+
+
+def _as_int(value: Any) -> Optional[int]:
+    """Coerce a client-supplied id to an INTEGER, or None if it is not one."""
+    if isinstance(value, float) and not value.is_integer():
+        return None
+    try:
+        number = int(value)
+    except (TypeError, ValueError, OverflowError):
+        return None
+    return number if -(2**31) <= number < 2**31 else None
+
+
+class QueryTelemetry:
+    """Asynchronous, batched query event log backed by Parquet files."""
+
+    def __init__(
+        self,
+        log_dir: str,
+        batch_size: int = 500,
+        flush_interval: float = 5.0,
+        capacity: int = 10000,
+    ):
+        """
+        Initialize the telemetry log and start the background writer.
+
+        Args:
+            log_dir: Directory that receives one Parquet file per flushed batch
+            batch_size: Number of buffered events that triggers an early flush
+            flush_interval: Maximum seconds between flushes
+            capacity: Ring buffer size; the oldest events are dropped when full
+        """
+        self.log_dir = log_dir
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.capacity = capacity
+        self.dropped_events = 0
+
+        self._buffer = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+
+        os.makedirs(self.log_dir, exist_ok=True)
+        self._writer = threading.Thread(
+            target=self._run, name="query-telemetry-writer", daemon=True
+        )
+        self._writer.start()
+        atexit.register(self.close)
+
+    def record(
+        self,
+        query: str,
+        result: Dict[str, Any],
+        exercise_id: Optional[int] = None,
+        source: str = "student",
+    ) -> None:
+        """
+        Buffer one execution event. Never blocks on I/O.
+
+        Fingerprinting is deferred to the writer thread.
+
+        Args:
+            query: Query text as submitted
+            result: Result dictionary returned by SQLService.execute_query
+            exercise_id: Exercise the query was written for, if any
+            source: Origin of the query ("student", "solution", "sample", ...)
+        """
+        if self._stopped.is_set():
+            return
+
+        execution_time = result.get("execution_time") or 0
+        event = (
+            datetime.now(timezone.utc),
+            query,
+            _as_int(exercise_id),
+            source,
+            round(execution_time * 1000, 3),
+            result.get("row_count", 0),
+            bool(result.get("success")),
+            result.get("error_type"),
+            bool(result.get("cache_hit", False)),
+        )
+
+        with self._lock:
+            if len(self._buffer) == self.capacity:
+                self.dropped_events += 1
+            self._buffer.append(event)
+            buffered = len(self._buffer)
+
+        if buffered >= self.batch_size:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """
+        Write all buffered events to a new Parquet file.
+
+        A batch that fails to write is put back in the buffer and retried
+        on the next flush.
+
+        Returns:
+            Number of events written
+        """
+        with self._flush_lock:
+            with self._lock:
+                events = list(self._buffer)
+                self._buffer.clear()
+
+            if not events:
+                return 0
+
+            try:
+                self._write_batch(events)
+            except Exception:
+                self._requeue(events)
+                raise
+
+            return len(events)
+
+    def _write_batch(self, events: List[tuple]) -> None:
+        """Write events to a new Parquet file."""
+        rows = self._build_rows(events)
+        df = pd.DataFrame(rows, columns=list(EVENT_SCHEMA))
+        file_name = (
+            f"events_{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}.parquet"
+        )
+        path = os.path.join(self.log_dir, file_name)
+
+        # Cast explicitly so all-NULL batches keep a stable file schema
+        select_list = ", ".join(
+            f"CAST({name} AS {sql_type}) AS {name}"
+            for name, sql_type in EVENT_SCHEMA.items()
+        )
+        escaped_path = path.replace("'", "''")
+        with duckdb.connect() as conn:
+            conn.register("events_batch", df)
+            conn.execute(
+                f"COPY (SELECT {select_list} FROM events_batch) "
+                f"TO '{escaped_path}' (FORMAT PARQUET, COMPRESSION ZSTD)"
+            )
+
+    def _requeue(self, events: List[tuple]) -> None:
+        """Put a batch that failed to write back ahead of newer events."""
+        with self._lock:
+            pending = events + list(self._buffer)
+            overflow = max(0, len(pending) - self.capacity)
+            self.dropped_events += overflow
+            self._buffer.clear()
+            self._buffer.extend(pending[overflow:])
+
+    def close(self) -> None:
+        """
+        Stop the background writer and flush remaining events.
+
+        Runs at interpreter exit, so a failing final flush is reported
+        instead of raised.
+        """
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        self._wake.set()
+        self._writer.join(timeout=self.flush_interval + 5)
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"⚠️  Query telemetry lost {len(self._buffer)} events on close: {e}")
+
+    def _run(self) -> None:
+        """Background loop flushing on interval or when a batch is full."""
+        while not self._stopped.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"⚠️  Query telemetry flush failed: {e}")
+
+    def _build_rows(self, events: List[tuple]) -> List[list]:
+        """Fingerprint buffered events and shape them as log rows."""
+        rows = []
+        for event_time, query, exercise_id, source, *metrics in events:
+            rows.append(
+                [
+                    event_time,
+                    fingerprint_query(query),
+                    normalize_query(query),
+                    exercise_id,
+                    source,
+                    *metrics,
+                ]
+            )
+        return rows
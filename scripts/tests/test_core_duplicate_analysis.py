@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Tests for hash-based duplicate and near-duplicate detection.
+"""
+
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+import duckdb
+import pandas as pd
+
+from scripts.core.duplicate_analysis import DuplicateAnalyzer
+from scripts.core.explore_dataset import DatasetExplorer
+
+
+class TestDuplicateAnalyzer(unittest.TestCase):
+    """Test cases for the duplicate analyzer."""
+
+    def setUp(self):
+        """Create postings with exact, whitespace/case and edited duplicates."""
+        self.temp_dir = tempfile.mkdtemp()
+        titles = [f"Data Analyst {i}" for i in range(40)]
+        rng = random.Random(42)
+        vocabulary = [f"skill{i}" for i in range(500)]
+        descriptions = [" ".join(rng.sample(vocabulary, 12)) for _ in range(40)]
+        self.df = pd.DataFrame(
+            {
+                "title": titles
+                + [
+                    "Data Analyst 0",
+                    "  DATA   analyst 1",
+                    "Data Analyst 2",
+                    None,
+                    None,
+                ],
+                "description": descriptions
+                + [
+                    descriptions[0],
+                    descriptions[1].upper(),
+                    descriptions[2] + "!",
+                    "no title",
+                    "no title",
+                ],
+            }
+        )
+        self.conn = duckdb.connect()
+        self.conn.register("postings", self.df)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.conn.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_exact_duplicates_match_pandas(self):
+        """Row-hash grouping counts the same duplicates as pandas, NULLs included."""
+        stats = DuplicateAnalyzer(self.conn, "postings").exact_duplicates()
+
+        self.assertEqual(stats["duplicate_records"], int(self.df.duplicated().sum()))
+        self.assertEqual(stats["duplicate_records"], 2)
+        self.assertEqual(stats["duplicate_clusters"], 2)
+        self.assertEqual(stats["largest_cluster"], 2)
+
+    def test_near_duplicates_cluster_normalized_and_similar_rows(self):
+        """Whitespace/case variants and small edits form near-duplicate clusters."""
+        stats = DuplicateAnalyzer(self.conn, "postings").near_duplicates()
+
+        # Rows 0 and 3 are exact, row 1 differs in case/whitespace, row 2 in one
+        # character, so four clusters of two rows each
+        self.assertEqual(stats["near_duplicate_clusters"], 4)
+        self.assertEqual(stats["near_duplicate_records"], 4)
+        self.assertEqual(stats["largest_cluster"], 2)
+
+    def test_export_clusters(self):
+        """Exported clusters carry their kind, id and original rows."""
+        analyzer = DuplicateAnalyzer(self.conn, "postings")
+        analyzer.near_duplicates()
+        output_path = os.path.join(self.temp_dir, "clusters.parquet")
+
+        row_count = analyzer.export_clusters(output_path)
+
+        exported = self.conn.execute(
+            "SELECT cluster_kind, cluster_id, title FROM read_parquet(?)",
+            [output_path],
+        ).fetchall()
+        self.assertEqual(row_count, len(exported))
+        self.assertEqual(sum(1 for row in exported if row[0] == "exact"), 4)
+        self.assertEqual(sum(1 for row in exported if row[0] == "near"), 8)
+        self.assertIn("  DATA   analyst 1", [row[2] for row in exported])
+        with self.assertRaises(ValueError):
+            analyzer.export_clusters(os.path.join(self.temp_dir, "clusters.xlsx"))
+
+    def test_explorer_reports_near_duplicates(self):
+        """The explorer adds cluster statistics to the data quality section."""
+        explorer = DatasetExplorer("test/postings", near_duplicates=True)
+        explorer.df = self.df
+
+        data_quality = explorer.analyze_dataset()["data_quality"]
+
+        self.assertEqual(data_quality["duplicate_records"], 2)
+        self.assertEqual(data_quality["duplicate_clusters"], 2)
+        self.assertEqual(data_quality["near_duplicates"]["near_duplicate_records"], 4)
+
+    def test_explorer_counts_duplicates_of_mixed_type_columns(self):
+        """Unconvertible DataFrames keep pandas counts and skip near duplicates."""
+        df = pd.DataFrame({"code": ["x", 1, "y", 2.5, "x", 1], "n": [1, 2, 3, 4, 1, 2]})
+        for near_duplicates in (False, True):
+            explorer = DatasetExplorer("test/mixed", near_duplicates=near_duplicates)
+            explorer.df = df
+
+            data_quality = explorer.analyze_dataset()["data_quality"]
+
+            self.assertEqual(data_quality["duplicate_records"], 2)
+            self.assertNotIn("near_duplicates", data_quality)
+
+
+if __name__ == "__main__":
+    unittest.main()
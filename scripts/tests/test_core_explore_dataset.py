@@ -16,8 +16,10 @@ import tempfile
 import unittest
 from unittest.mock import patch
 
+import duckdb
 import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
 
 from scripts.core.explore_dataset import DatasetExplorer
 
@@ -358,6 +360,28 @@ class TestDatasetExplorer(unittest.TestCase):
         for sample in columns["long_text"]["sample_values"]:
             self.assertLessEqual(len(sample), 53)  # 50 chars + "..."
 
+    def test_parallel_analysis_matches_serial(self):
+        """Parallel column analysis produces the same results as a serial run."""
+        mock_data = {
+            "id": range(1, 501),
+            "category": ["A", "B", "C", "D"] * 125,
+            "value": np.random.normal(100, 15, 500),
+            "date": pd.date_range("2023-01-01", periods=500),
+            "text": [f"item_{i}" for i in range(500)],
+            "all_null": [None] * 500,
+        }
+        df = self.create_mock_dataset(mock_data).iloc[::-1]
+
+        results = {}
+        for jobs in (1, 2):
+            explorer = DatasetExplorer("test/parallel", jobs=jobs)
+            explorer.df = df
+            analysis = explorer.analyze_dataset()
+            analysis["metadata"].pop("analysis_date")
+            results[jobs] = json.dumps(analysis, ensure_ascii=False, default=str)
+
+        self.assertEqual(results[1], results[2])
+
     @patch("core.explore_dataset.load_dataset")
     def test_dataset_loading_error(self, mock_load_dataset):
         """Test error handling when dataset loading fails."""
@@ -370,6 +394,227 @@ class TestDatasetExplorer(unittest.TestCase):
         self.assertIsNone(explorer.df)
 
 
+class TestDuckDBEngine(unittest.TestCase):
+    """Test that the duckdb engine reproduces the pandas analysis."""
+
+    def setUp(self):
+        """Write a mixed-type dataset to Parquet and to a DuckDB table."""
+        self.temp_dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(42)
+        size = 1000
+
+        df = pd.DataFrame(
+            {
+                "id": np.arange(1, size + 1),
+                "company": rng.choice(["A", "B", "C", "D", "E"], size),
+                "city": [f"city_{i % 200}" for i in range(size)],
+                "salary": np.where(
+                    rng.random(size) < 0.6, np.nan, rng.normal(100, 15, size)
+                ),
+                "remote": rng.random(size) < 0.5,
+                "posted": pd.date_range("2023-01-01", periods=size, freq="h"),
+                "title": [f"title_{i}" for i in range(size)],
+            }
+        )
+        self.df = pd.concat([df, df.head(5)], ignore_index=True)
+
+        self.parquet_path = os.path.join(self.temp_dir, "dataset.parquet")
+        self.df.to_parquet(self.parquet_path)
+
+        self.db_path = os.path.join(self.temp_dir, "dataset.db")
+        conn = duckdb.connect(self.db_path)
+        conn.execute(
+            "CREATE TABLE jobs AS SELECT * FROM read_parquet(?)", [self.parquet_path]
+        )
+        conn.close()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        import shutil
+
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _pandas_results(self):
+        explorer = DatasetExplorer("test/engines")
+        explorer.df = pd.read_parquet(self.parquet_path)
+        return explorer.analyze_dataset()
+
+    def _assert_same_analysis(self, expected, actual):
+        # Sample values are drawn differently, and float aggregates may differ
+        # in the last digit, so compare everything else exactly
+        for exp_col, act_col in zip(expected["columns"], actual["columns"]):
+            for key in exp_col:
+                if key in ("sample_values", "statistics"):
+                    continue
+                self.assertEqual(exp_col[key], act_col[key], f"{exp_col['name']}.{key}")
+            for key, value in exp_col["statistics"].items():
+                self.assertAlmostEqual(value, act_col["statistics"][key], places=6)
+            self.assertEqual(
+                len(exp_col["sample_values"]), len(act_col["sample_values"])
+            )
+
+        for section in ("data_quality", "relationships", "educational_assessment"):
+            self.assertEqual(expected[section], actual[section], section)
+
+        for key in ("total_records", "total_columns", "column_names"):
+            self.assertEqual(expected["metadata"][key], actual["metadata"][key])
+
+    def test_parquet_source_matches_pandas(self):
+        """Profiling Parquet with DuckDB yields the pandas analysis."""
+        explorer = DatasetExplorer("test/engines", engine="duckdb")
+        self.assertTrue(explorer.load_parquet(self.parquet_path))
+
+        results = explorer.analyze_dataset()
+
+        self.assertIsNone(explorer.df)
+        self.assertEqual(results["data_quality"]["duplicate_records"], 5)
+        self._assert_same_analysis(self._pandas_results(), results)
+
+    def test_table_source_matches_pandas(self):
+        """Profiling a DuckDB table yields the pandas analysis."""
+        explorer = DatasetExplorer(
+            "test/engines", engine="duckdb", memory_limit="256MB"
+        )
+        self.assertTrue(explorer.load_table(self.db_path, "jobs"))
+
+        self._assert_same_analysis(self._pandas_results(), explorer.analyze_dataset())
+
+    def test_approximate_mode_reports_error_bounds(self):
+        """Approximate metrics stay within their reported error bounds."""
+        exact = self._pandas_results()
+
+        explorer = DatasetExplorer("test/engines", approximate=True)
+        explorer.df = pd.read_parquet(self.parquet_path)
+        results = explorer.analyze_dataset()
+
+        self.assertTrue(results["metadata"]["approximate"])
+        self.assertEqual(results["data_quality"]["duplicate_records"], 5)
+        self.assertIn("duplicate_records", results["data_quality"]["error_bounds"])
+
+        for exact_col, approx_col in zip(exact["columns"], results["columns"]):
+            bounds = approx_col["error_bounds"]["unique_count"]
+            low, high = bounds["confidence_interval"]
+            self.assertLessEqual(low, exact_col["unique_count"], approx_col["name"])
+            self.assertGreaterEqual(high, exact_col["unique_count"], approx_col["name"])
+
+        columns = {col["name"]: col for col in results["columns"]}
+        self.assertEqual(columns["salary"]["error_bounds"]["median"]["rank_error"], 0)
+        self.assertEqual(
+            columns["company"]["error_bounds"]["top_values"]["method"], "space_saving"
+        )
+
+    def test_columns_named_like_query_aliases(self):
+        """Dataset columns such as "v" do not capture the profiler's aliases."""
+        df = pd.DataFrame(
+            {
+                "id": np.arange(300),
+                "cat": [f"cat_{i % 4}" for i in range(300)],
+                "d": [f"text_{i}" for i in range(300)],
+                "v": np.arange(300) % 7,
+            }
+        )
+        parquet_path = os.path.join(self.temp_dir, "aliases.parquet")
+        df.to_parquet(parquet_path)
+
+        for approximate in (False, True):
+            explorer = DatasetExplorer(
+                "test/aliases", engine="duckdb", approximate=approximate
+            )
+            self.assertTrue(explorer.load_parquet(parquet_path))
+
+            columns = {
+                col["name"]: col for col in explorer.analyze_dataset()["columns"]
+            }
+
+            self.assertEqual(columns["cat"]["sample_values"][0], "cat_0")
+            self.assertEqual(len(columns["d"]["sample_values"]), 5)
+            self.assertEqual(len(columns["id"]["sample_values"]), 5)
+
+    def test_create_database_streams_arrow_batches(self):
+        """The Arrow ingestion path creates the same table as the source."""
+        explorer = DatasetExplorer("test/arrow-ingest", engine="duckdb")
+        explorer.arrow_table = pq.read_table(self.parquet_path)
+        db_path = os.path.join(self.temp_dir, "ingested.db")
+
+        self.assertTrue(explorer.create_database(db_path, batch_size=100))
+
+        conn = duckdb.connect(db_path, read_only=True)
+        try:
+            row_count = conn.execute("SELECT COUNT(*) FROM arrow_ingest").fetchone()[0]
+            columns = conn.table("arrow_ingest").columns
+        finally:
+            conn.close()
+        self.assertEqual(row_count, len(self.df))
+        self.assertEqual(columns, list(self.df.columns))
+
+    def test_invalid_engine(self):
+        """Unknown engines are rejected."""
+        with self.assertRaises(ValueError):
+            DatasetExplorer("test/engines", engine="spark")
+
+
+class TestExplorationCache(unittest.TestCase):
+    """Test the content-addressed exploration result cache."""
+
+    def setUp(self):
+        """Write a small Parquet source and an empty cache directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.temp_dir, "cache")
+        self.parquet_path = os.path.join(self.temp_dir, "dataset.parquet")
+        pd.DataFrame(
+            {
+                "id": range(200),
+                "company": [f"company_{i % 7}" for i in range(200)],
+                "salary": [float(i % 50) for i in range(200)],
+            }
+        ).to_parquet(self.parquet_path)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        import shutil
+
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _explore(self):
+        explorer = DatasetExplorer("test/cache", cache_dir=self.cache_dir)
+        if not explorer.restore_cached_analysis(parquet=self.parquet_path):
+            self.assertTrue(explorer.load_parquet(self.parquet_path))
+        return explorer, explorer.analyze_dataset()
+
+    def test_rerun_reuses_cached_results(self):
+        """A second run on unchanged data is served without loading it."""
+        _, first = self._explore()
+
+        explorer, second = self._explore()
+
+        self.assertIsNone(explorer.profiler)
+        self.assertEqual(json.loads(json.dumps(first, default=str)), second)
+
+    def test_version_bump_recomputes_only_stale_sections(self):
+        """Bumping a derived section's version recomputes it from cached columns."""
+        _, first = self._explore()
+
+        versions = dict(DatasetExplorer.ANALYSIS_VERSIONS, relationships=2)
+        with patch.object(DatasetExplorer, "ANALYSIS_VERSIONS", versions):
+            explorer, second = self._explore()
+            self.assertIsNone(explorer.profiler)
+            self.assertEqual(first["relationships"], second["relationships"])
+
+            with patch.object(
+                DatasetExplorer, "_detect_relationships", side_effect=AssertionError
+            ):
+                self._explore()
+
+    def test_changed_data_misses_cache(self):
+        """Changing the source content changes its fingerprint."""
+        self._explore()
+
+        pd.DataFrame({"id": range(10)}).to_parquet(self.parquet_path)
+        explorer = DatasetExplorer("test/cache", cache_dir=self.cache_dir)
+
+        self.assertFalse(explorer.restore_cached_analysis(parquet=self.parquet_path))
+
+
 class TestDatasetExplorerIntegration(unittest.TestCase):
     """Integration tests with real datasets (if available)."""
 
@@ -426,9 +671,9 @@ def run_comprehensive_tests():
     result = runner.run(suite)
 
     # Print summary
-    print(f"\n{'='*60}")
+    print(f"\n{'=' * 60}")
     print("🧪 TEST SUMMARY")
-    print(f"{'='*60}")
+    print(f"{'=' * 60}")
     print(f"Tests run: {result.testsRun}")
     print(f"Failures: {len(result.failures)}")
     print(f"Errors: {len(result.errors)}")
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Tests for inclusion-dependency based foreign-key discovery.
+"""
+
+import unittest
+
+import duckdb
+import pandas as pd
+
+from scripts.core.explore_dataset import DatasetExplorer
+from scripts.core.inclusion_dependencies import (
+    InclusionDependencyFinder,
+    is_probable_foreign_key,
+)
+
+
+class TestInclusionDependencyFinder(unittest.TestCase):
+    """Test cases for the inclusion dependency finder."""
+
+    def setUp(self):
+        """Create a small star schema with string and integer keys."""
+        self.conn = duckdb.connect()
+        self.conn.execute(
+            """
+            CREATE TABLE companies AS
+            SELECT range + 1 AS company_id, 'company_' || range AS company_name
+            FROM range(100)
+            """
+        )
+        self.conn.execute(
+            """
+            CREATE TABLE job_postings AS
+            SELECT range + 1 AS job_id,
+                   range % 100 + 1 AS company_id,
+                   'company_' || (range % 100) AS company_name,
+                   range % 7 + 1 AS rating
+            FROM range(1000)
+            """
+        )
+
+    def tearDown(self):
+        """Close the connection."""
+        self.conn.close()
+
+    def _find(self, **kwargs):
+        finder = InclusionDependencyFinder(self.conn, **kwargs)
+        dependencies = finder.find(["companies", "job_postings"], verbose=False)
+        return finder, {
+            (
+                d["dependent_table"],
+                d["dependent_column"],
+                d["referenced_table"],
+                d["referenced_column"],
+            ): d
+            for d in dependencies
+        }
+
+    def test_discovers_string_and_integer_foreign_keys(self):
+        """Contained columns are found with their containment and coverage."""
+        _, found = self._find()
+
+        by_name = found["job_postings", "company_name", "companies", "company_name"]
+        by_id = found["job_postings", "company_id", "companies", "company_id"]
+        self.assertEqual(by_name["containment_ratio"], 1.0)
+        self.assertEqual(by_name["referenced_coverage"], 1.0)
+        self.assertFalse(by_id["one_to_one"])
+
+        # Referenced columns must be unique
+        self.assertNotIn(
+            ("companies", "company_id", "job_postings", "company_id"), found
+        )
+
+    def test_partial_containment_is_measured(self):
+        """Dependents with orphan values report their real containment ratio."""
+        self.conn.execute("UPDATE job_postings SET company_id = 101 WHERE job_id <= 3")
+        self.conn.execute("INSERT INTO companies VALUES (500, 'company_500')")
+
+        _, strict = self._find(min_containment=1.0)
+        _, relaxed = self._find(min_containment=0.9)
+
+        key = ("job_postings", "company_id", "companies", "company_id")
+        self.assertNotIn(key, strict)
+        self.assertAlmostEqual(relaxed[key]["containment_ratio"], 100 / 101, places=4)
+        self.assertEqual(relaxed[key]["missing_values"], 1)
+
+    def test_minhash_prunes_disjoint_columns_with_overlapping_ranges(self):
+        """Disjoint value sets are pruned before the anti-join runs."""
+        self.conn.execute(
+            "CREATE TABLE odd AS SELECT 2 * range + 1 AS odd_id FROM range(1000)"
+        )
+        self.conn.execute(
+            "CREATE TABLE even AS SELECT 2 * range + 2 AS value FROM range(500)"
+        )
+
+        finder = InclusionDependencyFinder(self.conn, min_containment=1.0)
+        dependencies = finder.find(["odd", "even"], verbose=False)
+
+        self.assertEqual(dependencies, [])
+        self.assertEqual(finder.pruning_stats["statistics"], 1)
+        self.assertEqual(finder.pruning_stats["minhash"], 0)
+
+    def test_probable_foreign_keys_exclude_accidental_containment(self):
+        """Small counts contained in a surrogate key range are not foreign keys."""
+        _, found = self._find()
+
+        self.assertTrue(
+            is_probable_foreign_key(
+                found["job_postings", "company_id", "companies", "company_id"]
+            )
+        )
+        self.assertFalse(
+            is_probable_foreign_key(
+                found["job_postings", "rating", "job_postings", "job_id"]
+            )
+        )
+        self.assertFalse(
+            is_probable_foreign_key(
+                found["companies", "company_id", "job_postings", "job_id"]
+            )
+        )
+
+    def test_explorer_reports_self_references(self):
+        """The explorer reports columns contained in a unique column."""
+        explorer = DatasetExplorer("test/employees")
+        explorer.df = pd.DataFrame(
+            {
+                "employee_id": range(1, 51),
+                "manager_id": pd.array(
+                    [None] + [(i // 5) + 1 for i in range(1, 50)], dtype="Int64"
+                ),
+            }
+        )
+
+        relationships = explorer.analyze_dataset()["relationships"]
+
+        self.assertIn(
+            {
+                "column": "manager_id",
+                "referenced_column": "employee_id",
+                "containment_ratio": 1.0,
+                "referenced_coverage": 0.2,
+            },
+            relationships["inclusion_dependencies"],
+        )
+
+    def test_explorer_skips_unconvertible_dataframes(self):
+        """Mixed-type object columns skip discovery instead of failing."""
+        explorer = DatasetExplorer("test/mixed")
+        explorer.df = pd.DataFrame(
+            {
+                "employee_id": range(1, 9),
+                "code": ["x", 1, "y", 2.5, "x", 1, "z", 3],
+            }
+        )
+
+        columns = [{"name": "employee_id", "unique_count": 8, "null_count": 0}]
+
+        self.assertEqual(explorer._find_inclusion_dependencies(columns), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
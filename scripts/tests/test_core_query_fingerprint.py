@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Tests for query normalization, fingerprinting and table extraction.
+"""
+
+import unittest
+
+from scripts.core.query_fingerprint import (
+    extract_tables,
+    fingerprint_query,
+    normalize_query,
+)
+
+
+class TestQueryFingerprint(unittest.TestCase):
+    """Test cases for the query fingerprint helpers."""
+
+    def test_literals_and_formatting_are_normalized(self):
+        """Queries differing only in literals, case and whitespace share a shape."""
+        first = "SELECT * FROM jobs WHERE salary > 100000 AND title = 'Data Analyst';"
+        second = """
+            select *   from "JOBS"  -- filter high earners
+            where salary > 5e4 and title = 'O''Brien'
+        """
+
+        self.assertEqual(
+            normalize_query(first), "select * from jobs where salary > ? and title = ?"
+        )
+        self.assertEqual(fingerprint_query(first), fingerprint_query(second))
+
+    def test_in_lists_collapse(self):
+        """IN lists of different lengths produce the same fingerprint."""
+        self.assertEqual(
+            fingerprint_query("SELECT * FROM t WHERE id IN (1, 2, 3)"),
+            fingerprint_query("SELECT * FROM t WHERE id IN (7)"),
+        )
+
+    def test_identifier_digits_are_kept(self):
+        """Digits inside identifiers are not treated as literals."""
+        self.assertEqual(
+            normalize_query("SELECT col1 FROM table_2"), "select col1 from table_2"
+        )
+
+    def test_extract_tables_skips_ctes_and_table_functions(self):
+        """Only base tables from FROM and JOIN clauses are reported."""
+        query = """
+            WITH ranked AS (SELECT * FROM job_postings)
+            SELECT * FROM ranked r
+            JOIN main.companies c ON r.company_id = c.company_id
+            LEFT JOIN read_parquet('extra.parquet') p ON TRUE
+        """
+        self.assertEqual(extract_tables(query), ["companies", "job_postings"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,8 +4,16 @@ Comprehensive test script for SQL helper function.
 Tests actual queries from week 4 practice solutions to ensure everything works correctly.
 """
 
+import os
+import shutil
+import tempfile
 import traceback
+import unittest
+from unittest import mock
 
+import duckdb
+
+from scripts.core import sql_helper
 from scripts.core.sql_helper import SQLHelper
 
 
@@ -56,6 +64,181 @@ def test_query(helper, query_name, query, expected_min_rows=0, expected_columns=
         traceback.print_exc()
 
 
+class TestSQLHelperOutputFormats(unittest.TestCase):
+    """Test native result fetching against a small temporary database."""
+
+    def setUp(self):
+        """Create a temporary database with a single numeric table."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "test.db")
+        with duckdb.connect(self.db_path) as conn:
+            conn.execute(
+                "CREATE TABLE numbers AS SELECT range AS n, range % 3 AS bucket "
+                "FROM range(250)"
+            )
+        self.helper = SQLHelper(self.db_path)
+
+    def tearDown(self):
+        """Close the helper and remove the temporary database."""
+        self.helper.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_pandas_output(self):
+        """Default output is a pandas DataFrame."""
+        result = self.helper.execute_query("SELECT * FROM numbers")
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["row_count"], 250)
+        self.assertEqual(result["columns"], ["n", "bucket"])
+        self.assertEqual(len(result["data"]), 250)
+        self.assertIn("summary", result)
+
+    def test_arrow_output(self):
+        """Arrow output returns a pyarrow Table with matching metadata."""
+        result = self.helper.execute_query(
+            "SELECT * FROM numbers WHERE bucket = 0", output_format="arrow"
+        )
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["row_count"], 84)
+        self.assertEqual(result["data"].num_rows, 84)
+        self.assertEqual(result["columns"], ["n", "bucket"])
+
+    def test_batches_output(self):
+        """Batch output streams record batches that survive later queries."""
+        result = self.helper.execute_query(
+            "SELECT * FROM numbers", output_format="batches", batch_size=100
+        )
+        self.assertEqual(result["status"], "success")
+        self.assertIsNone(result["row_count"])
+        self.assertEqual(result["columns"], ["n", "bucket"])
+
+        # Running another query must not invalidate the open stream
+        self.helper.execute_query("SELECT 1 AS one")
+        self.assertEqual(sum(batch.num_rows for batch in result["data"]), 250)
+
+    def test_batches_close_their_cursor_when_exhausted(self):
+        """The dedicated cursor of a stream is closed after the last batch."""
+        connection = self.helper.conn
+        cursors = []
+
+        def cursor():
+            cursors.append(connection.cursor())
+            return cursors[-1]
+
+        self.helper.conn = mock.Mock(wraps=connection, cursor=cursor)
+        try:
+            result = self.helper.execute_query(
+                "SELECT * FROM numbers", output_format="batches", batch_size=100
+            )
+        finally:
+            self.helper.conn = connection
+
+        self.assertEqual(result["data"].read_all().num_rows, 250)
+        with self.assertRaises(duckdb.ConnectionException):
+            cursors[0].execute("SELECT 1")
+
+    def test_invalid_output_format(self):
+        """Unknown output formats are reported as errors."""
+        result = self.helper.execute_query("SELECT 1", output_format="csv")
+        self.assertEqual(result["status"], "error")
+        self.assertEqual(result["error_type"], "ValueError")
+
+    def test_profile(self):
+        """Profiling attaches a plan tree with operator cardinalities."""
+        result = self.helper.execute_query(
+            "SELECT bucket, COUNT(*) AS c FROM numbers GROUP BY bucket", profile=True
+        )
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["row_count"], 3)
+
+        profile = result["profile"]
+        self.assertEqual(profile["rows_returned"], 3)
+        self.assertTrue(profile["plan"])
+
+        def operator_names(node):
+            names = [node["name"]]
+            for child in node["children"]:
+                names.extend(operator_names(child))
+            return names
+
+        self.assertIn("SEQ_SCAN", operator_names(profile["plan"][0]))
+
+    def test_ddl_statement(self):
+        """DDL statements still succeed through the native path."""
+        result = self.helper.execute_query(
+            "SELECT SETSEED(0.42); CREATE TABLE copy AS SELECT * FROM numbers"
+        )
+        self.assertEqual(result["status"], "success")
+        count = self.helper.execute_query("SELECT COUNT(*) AS c FROM copy")
+        self.assertEqual(int(count["data"].iloc[0]["c"]), 250)
+
+
+class TestSQLHelperRegistry(unittest.TestCase):
+    """Test the shared helper registry and the per-session result cache."""
+
+    def setUp(self):
+        """Create a temporary database and start with an empty registry."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "test.db")
+        with duckdb.connect(self.db_path) as conn:
+            conn.execute("CREATE TABLE numbers AS SELECT range AS n FROM range(10)")
+        sql_helper.close_all_helpers()
+
+    def tearDown(self):
+        """Close shared helpers and remove the temporary database."""
+        sql_helper.close_all_helpers()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_registry_reuses_lazy_helper(self):
+        """The same helper is returned per path and connects on first query."""
+        helper = sql_helper.get_sql_helper(self.db_path)
+        self.assertIsNone(helper.conn)
+        self.assertIs(helper, sql_helper.get_sql_helper(self.db_path))
+
+        sql_helper.run_sql("SELECT * FROM numbers", db_path=self.db_path)
+        self.assertIsNotNone(helper.conn)
+
+        sql_helper.close_all_helpers()
+        self.assertIsNone(helper.conn)
+        self.assertIsNot(helper, sql_helper.get_sql_helper(self.db_path))
+
+    def test_result_cache(self):
+        """Repeated reads hit the cache and writes invalidate it."""
+        sql_helper.enable_result_cache(db_path=self.db_path)
+        helper = sql_helper.get_sql_helper(self.db_path)
+
+        first = helper.execute_query("SELECT COUNT(*) AS c FROM numbers")
+        second = helper.execute_query("SELECT COUNT(*) AS c FROM numbers")
+        self.assertFalse(first["cache_hit"])
+        self.assertTrue(second["cache_hit"])
+
+        helper.execute_query("INSERT INTO numbers VALUES (10)")
+        third = helper.execute_query("SELECT COUNT(*) AS c FROM numbers")
+        self.assertFalse(third["cache_hit"])
+        self.assertEqual(int(third["data"].iloc[0]["c"]), 11)
+
+    def test_cached_results_are_isolated_from_callers(self):
+        """Mutating a returned DataFrame does not change later cache hits."""
+        sql_helper.enable_result_cache(db_path=self.db_path)
+        helper = sql_helper.get_sql_helper(self.db_path)
+        query = "SELECT n FROM numbers ORDER BY n"
+
+        first = helper.execute_query(query)
+        first["data"].loc[0, "n"] = -1
+        second = helper.execute_query(query)
+        second["data"].loc[1, "n"] = -1
+        third = helper.execute_query(query)
+
+        self.assertTrue(third["cache_hit"])
+        self.assertEqual(third["data"]["n"].tolist(), list(range(10)))
+
+    def test_cache_disabled_by_default(self):
+        """Without opting in, every query is executed."""
+        helper = sql_helper.get_sql_helper(self.db_path)
+        helper.execute_query("SELECT * FROM numbers")
+        result = helper.execute_query("SELECT * FROM numbers")
+        self.assertFalse(result["cache_hit"])
+
+
 def main():
     """Run comprehensive tests on SQL helper function."""
     print("🧪 COMPREHENSIVE SQL HELPER TESTING")
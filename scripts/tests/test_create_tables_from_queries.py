@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Tests for the dependency-aware table builder.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import duckdb
+
+from scripts.data_schema_generation import build_manifest
+from scripts.data_schema_generation.build_manifest import (
+    BuildManifest,
+    cached_fingerprint,
+    fingerprint_table,
+)
+from scripts.data_schema_generation.create_tables_from_queries import (
+    build_table_query,
+    build_tables,
+    critical_path,
+    layout_statements,
+    load_table_queries,
+    plan_builds,
+    table_dependencies,
+    topological_order,
+    transitive_dependents,
+)
+
+
+class TableDefinitionsTestCase(unittest.TestCase):
+    """Source data and table definitions shared by the builder tests."""
+
+    def setUp(self):
+        """Create a source table and a movies-style set of definitions."""
+        self.conn = duckdb.connect()
+        self.conn.execute(
+            "CREATE TABLE source AS SELECT range AS id, range % 3 AS lang "
+            "FROM range(1000)"
+        )
+        self.tables = {
+            "movies": {"query": "CREATE TABLE movies AS SELECT id FROM source"},
+            "languages": {
+                "query": "CREATE TABLE languages AS SELECT DISTINCT lang FROM source"
+            },
+            "movie_languages": {
+                "query": "CREATE TABLE movie_languages AS "
+                "WITH m AS (SELECT * FROM movies) "
+                "SELECT m.id, s.lang FROM m JOIN source s ON m.id = s.id "
+                "JOIN languages l ON l.lang = s.lang"
+            },
+            "report": {
+                "query": "CREATE TABLE report AS SELECT 1 AS done",
+                "depends_on": ["movie_languages"],
+            },
+        }
+
+    def tearDown(self):
+        """Close the connection."""
+        self.conn.close()
+
+
+class TestTableBuildGraph(TableDefinitionsTestCase):
+    """Test cases for dependency inference and concurrent builds."""
+
+    def test_dependencies_come_from_references_and_depends_on(self):
+        """Referenced file tables and declared dependencies are both found."""
+        dependencies = table_dependencies(self.tables)
+
+        self.assertEqual(dependencies["movies"], set())
+        self.assertEqual(dependencies["movie_languages"], {"movies", "languages"})
+        self.assertEqual(dependencies["report"], {"movie_languages"})
+        self.assertEqual(
+            topological_order(dependencies),
+            ["movies", "languages", "movie_languages", "report"],
+        )
+
+    def test_cycles_and_unknown_dependencies_are_rejected(self):
+        """Definitions that cannot be ordered raise a ValueError."""
+        self.tables["movies"]["depends_on"] = ["report"]
+        with self.assertRaises(ValueError):
+            table_dependencies(self.tables)
+
+        self.tables["movies"]["depends_on"] = ["missing"]
+        with self.assertRaises(ValueError):
+            table_dependencies(self.tables)
+
+    def test_build_runs_dependencies_first_and_skips_after_failures(self):
+        """Tables are built after their dependencies; failures propagate."""
+        dependencies = table_dependencies(self.tables)
+        queries = {name: info["query"] for name, info in self.tables.items()}
+
+        results = build_tables(self.conn, queries, dependencies, jobs=2, verbose=False)
+
+        self.assertEqual(results["movie_languages"]["row_count"], 1000)
+        self.assertGreaterEqual(
+            results["movie_languages"]["start"], results["movies"]["end"]
+        )
+        path, total = critical_path(dependencies, results)
+        self.assertEqual(path[-2:], ["movie_languages", "report"])
+        self.assertGreater(total, 0)
+
+        for name in queries:
+            self.conn.execute(f"DROP TABLE {name}")
+        queries["languages"] = "CREATE TABLE languages AS SELECT * FROM nowhere"
+        results = build_tables(self.conn, queries, dependencies, verbose=False)
+
+        self.assertEqual(results["movies"]["status"], "success")
+        self.assertEqual(results["languages"]["status"], "error")
+        self.assertEqual(results["movie_languages"]["status"], "skipped")
+        self.assertEqual(results["report"]["status"], "skipped")
+
+    def test_dependents_of_invalid_definitions_are_found(self):
+        """Direct and indirect dependents are skipped with the invalid table."""
+        dependencies = table_dependencies(self.tables)
+
+        self.assertEqual(
+            transitive_dependents(dependencies, {"languages"}),
+            {"movie_languages", "report"},
+        )
+        self.assertEqual(transitive_dependents(dependencies, {"report"}), set())
+
+
+class TestIncrementalBuilds(TableDefinitionsTestCase):
+    """Test cases for build manifest driven rebuilds."""
+
+    def _build(self, force_recreate=False):
+        """Build stale tables as execute_table_creation does; return the plan."""
+        dependencies = table_dependencies(self.tables)
+        queries = {name: info["query"] for name, info in self.tables.items()}
+        existing = {row[0] for row in self.conn.execute("SHOW TABLES").fetchall()}
+        manifest = BuildManifest(self.conn)
+        plan = plan_builds(
+            self.conn,
+            queries,
+            dependencies,
+            manifest.entries(),
+            existing,
+            force_recreate=force_recreate,
+        )
+        stale = {name: queries[name] for name in queries if plan[name]["rebuild"]}
+        for name in stale:
+            self.conn.execute(f"DROP TABLE IF EXISTS {name}")
+        results = build_tables(self.conn, stale, dependencies, verbose=False)
+        for name, result in results.items():
+            manifest.record(
+                name,
+                plan[name]["query_hash"],
+                plan[name]["inputs"],
+                result["row_count"],
+                result["end"] - result["start"],
+            )
+        return {name for name in queries if plan[name]["rebuild"]}
+
+    def test_only_changed_tables_and_dependents_are_rebuilt(self):
+        """Query and source changes rebuild exactly the affected tables."""
+        self.assertEqual(self._build(), set(self.tables))
+        self.assertEqual(self._build(), set())
+
+        self.tables["languages"]["query"] += " WHERE lang IS NOT NULL"
+        self.assertEqual(self._build(), {"languages", "movie_languages", "report"})
+
+        self.conn.execute("UPDATE source SET lang = 5 WHERE id = 7")
+        self.assertEqual(
+            self._build(), {"movies", "languages", "movie_languages", "report"}
+        )
+
+        self.conn.execute("DROP TABLE report")
+        self.assertEqual(self._build(), {"report"})
+        self.assertEqual(self._build(force_recreate=True), set(self.tables))
+
+    def test_manifest_records_inputs(self):
+        """Records hold the query hash and fingerprints of every input."""
+        self._build()
+
+        entries = BuildManifest(self.conn).entries()
+
+        self.assertEqual(set(entries), set(self.tables))
+        self.assertEqual(
+            set(entries["movie_languages"]["input_fingerprints"]),
+            {"movies", "languages", "source"},
+        )
+        self.assertEqual(entries["movies"]["row_count"], 1000)
+
+
+class TestTableLayout(TableDefinitionsTestCase):
+    """Test cases for layout declarations."""
+
+    def test_layout_sorts_rows_and_creates_indexes(self):
+        """Rows are stored in sort order and declared indexes exist."""
+        self.tables["movies"]["layout"] = {
+            "sort_by": ["id % 10", "id"],
+            "indexes": [["id"]],
+        }
+        queries = {"movies": build_table_query(self.tables["movies"])}
+        post_build = {
+            "movies": layout_statements("movies", self.tables["movies"]["layout"])
+        }
+
+        results = build_tables(
+            self.conn, queries, {"movies": set()}, verbose=False, post_build=post_build
+        )
+
+        self.assertEqual(results["movies"]["row_count"], 1000)
+        first_ids = self.conn.execute("SELECT id FROM movies LIMIT 3").fetchall()
+        self.assertEqual(first_ids, [(0,), (10,), (20,)])
+        indexes = self.conn.execute(
+            "SELECT index_name FROM duckdb_indexes() WHERE table_name = 'movies'"
+        ).fetchall()
+        self.assertEqual(indexes, [("movies_id_idx",)])
+
+    def test_layout_changes_trigger_rebuilds(self):
+        """Changing only the indexes of a table makes it stale."""
+        queries = {"movies": build_table_query(self.tables["movies"])}
+        dependencies = {"movies": set()}
+        build_tables(self.conn, queries, dependencies, verbose=False)
+        plan = plan_builds(self.conn, queries, dependencies, {}, {"movies"})
+        manifest = BuildManifest(self.conn)
+        manifest.record(
+            "movies", plan["movies"]["query_hash"], plan["movies"]["inputs"], 1000, 0.1
+        )
+
+        unchanged = plan_builds(
+            self.conn, queries, dependencies, manifest.entries(), {"movies"}
+        )
+        indexed = plan_builds(
+            self.conn,
+            queries,
+            dependencies,
+            manifest.entries(),
+            {"movies"},
+            post_build={"movies": layout_statements("movies", {"indexes": ["id"]})},
+        )
+
+        self.assertFalse(unchanged["movies"]["rebuild"])
+        self.assertEqual(indexed["movies"]["reason"], "query changed")
+
+
+class TestSourceFingerprintCache(unittest.TestCase):
+    """Test cases for reusing source fingerprints between runs."""
+
+    def setUp(self):
+        """Create a checkpointed database file with a source table."""
+        self.work_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.work_dir, "data_demo.db")
+        with duckdb.connect(self.db_path) as conn:
+            conn.execute(
+                "CREATE TABLE source AS SELECT range AS id, 'row ' || range AS text "
+                "FROM range(200000)"
+            )
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def _fingerprint(self):
+        """Return the cached fingerprint and whether the table was scanned."""
+        with mock.patch.object(
+            build_manifest, "fingerprint_table", wraps=fingerprint_table
+        ) as scan:
+            with duckdb.connect(self.db_path) as conn:
+                fingerprint = cached_fingerprint(conn, "source")
+                expected = fingerprint_table(conn, "source")
+        self.assertEqual(fingerprint, expected)
+        return fingerprint, scan.called
+
+    def _change(self, statement):
+        with duckdb.connect(self.db_path) as conn:
+            conn.execute(statement)
+
+    def test_fingerprint_recomputed_only_after_changes(self):
+        """Unchanged sources are not scanned again; edits and deletes are seen."""
+        first, scanned = self._fingerprint()
+        self.assertTrue(scanned)
+        self.assertEqual(self._fingerprint(), (first, False))
+
+        self._change("UPDATE source SET text = 'row 6' WHERE id = 5")
+        updated, scanned = self._fingerprint()
+        self.assertTrue(scanned)
+        self.assertNotEqual(updated, first)
+
+        self._change("DELETE FROM source WHERE id = 3")
+        deleted, scanned = self._fingerprint()
+        self.assertTrue(scanned)
+        self.assertNotEqual(deleted, updated)
+        self.assertEqual(self._fingerprint(), (deleted, False))
+
+
+class TestMovieJunctionTables(unittest.TestCase):
+    """Test cases for the movies dataset's surrogate-key junction tables."""
+
+    def setUp(self):
+        """Create a raw movies table in which many titles repeat."""
+        self.conn = duckdb.connect()
+        self.conn.execute(
+            """
+            CREATE TABLE movies_dataset AS
+            SELECT 'Movie ' || (range % 50) AS Title,
+                   (2000 + range % 20)::VARCHAR || '-01-01' AS Release_Date,
+                   'overview ' || range AS Overview,
+                   (range * 1.5)::VARCHAR AS Popularity,
+                   range::VARCHAR AS Vote_Count,
+                   ((range % 9) + 1)::VARCHAR || '.5' AS Vote_Average,
+                   ['en', 'fr', 'ja'][range % 3 + 1] AS Original_Language,
+                   'u' AS Poster_Url
+            FROM range(1000)
+            """
+        )
+        self.definitions = load_table_queries("data_movies_dataset")
+
+    def tearDown(self):
+        """Close the connection."""
+        self.conn.close()
+
+    def _build_movie_tables(self):
+        """Build every table of the movies definitions; return the results."""
+        tables = self.definitions["tables"]
+        queries = {
+            name: build_table_query(info, self.definitions["metadata"])
+            for name, info in tables.items()
+        }
+        dependencies = table_dependencies(tables, self.definitions["metadata"])
+        return build_tables(self.conn, queries, dependencies, verbose=False)
+
+    def test_sample_does_not_depend_on_source_load_order(self):
+        """Reloading the raw rows in another order gives the same tables."""
+        self._build_movie_tables()
+        contents = "SELECT * FROM {} ORDER BY ALL"
+        before = {
+            name: self.conn.execute(contents.format(name)).fetchall()
+            for name in ("movies", "movie_languages", "movie_ratings")
+        }
+
+        self.conn.execute(
+            "CREATE OR REPLACE TABLE movies_dataset AS "
+            "SELECT * FROM movies_dataset ORDER BY hash(Overview)"
+        )
+        self._build_movie_tables()
+
+        for name, rows in before.items():
+            self.assertEqual(
+                self.conn.execute(contents.format(name)).fetchall(), rows, name
+            )
+
+    def test_junction_rows_match_movies_exactly(self):
+        """Exactly 95% of movies are sampled, each with one language and rating."""
+        results = self._build_movie_tables()
+
+        movie_count = results["movies"]["row_count"]
+        self.assertEqual(movie_count, 950)
+        for junction in ("movie_languages", "movie_ratings"):
+            rows, movies = self.conn.execute(
+                f"SELECT COUNT(*), COUNT(DISTINCT movie_id) FROM {junction}"
+            ).fetchone()
+            self.assertEqual((rows, movies), (movie_count, movie_count))
+        # Overviews are unique, so they identify each movie's source row
+        languages_match = self.conn.execute(
+            "SELECT bool_and(l.language_code = raw.Original_Language) "
+            "FROM movie_languages ml "
+            "JOIN languages l USING (language_id) "
+            "JOIN movies m USING (movie_id) "
+            "JOIN movies_dataset raw ON raw.Overview = m.overview"
+        ).fetchone()[0]
+        self.assertTrue(languages_match)
+
+        movie_columns = [
+            row[0] for row in self.conn.execute("DESCRIBE movies").fetchall()
+        ]
+        self.assertEqual(
+            movie_columns,
+            [
+                "movie_id",
+                "title",
+                "release_date",
+                "overview",
+                "popularity",
+                "vote_count",
+                "poster_url",
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
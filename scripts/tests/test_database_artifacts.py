@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests for prebuilt database artifacts.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import duckdb
+
+from scripts.utilities.database_artifacts import (
+    build_key,
+    find_artifact,
+    install_database,
+    package_database,
+)
+
+
+class TestDatabaseArtifacts(unittest.TestCase):
+    """Test cases for packaging and installing databases."""
+
+    def setUp(self):
+        """Create a built database and an artifact directory."""
+        self.work_dir = tempfile.mkdtemp()
+        self.artifact_dir = os.path.join(self.work_dir, "artifacts")
+        self.db_path = os.path.join(self.work_dir, "data_demo.db")
+        conn = duckdb.connect(self.db_path)
+        conn.execute(
+            "CREATE TABLE postings AS SELECT range AS posting_id FROM range(2000)"
+        )
+        conn.close()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def test_package_and_install_round_trip(self):
+        """An installed artifact is the packaged database, byte for byte."""
+        manifest = package_database("data_demo", self.db_path, self.artifact_dir)
+        self.assertEqual(manifest["build_key"], build_key("data_demo"))
+        self.assertEqual(manifest["tables"], {"postings": 2000})
+        leftovers = [
+            name for name in os.listdir(self.artifact_dir) if name.endswith(".tmp")
+        ]
+        self.assertEqual(leftovers, [])
+
+        target = os.path.join(self.work_dir, "installed", "data_demo.db")
+        missing_dir = os.path.join(self.work_dir, "missing")
+        self.assertTrue(
+            install_database("data_demo", target, [missing_dir, self.artifact_dir])
+        )
+
+        conn = duckdb.connect(target, read_only=True)
+        count = conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0]
+        conn.close()
+        self.assertEqual(count, 2000)
+
+    def test_corrupt_or_missing_artifacts_are_misses(self):
+        """Checksum mismatches and unknown datasets fall back to building."""
+        manifest = package_database("data_demo", self.db_path, self.artifact_dir)
+        target = os.path.join(self.work_dir, "installed.db")
+
+        self.assertFalse(install_database("data_other", target, [self.artifact_dir]))
+
+        with open(os.path.join(self.artifact_dir, manifest["artifact"]), "ab") as f:
+            f.write(b"\0")
+        self.assertIsNone(find_artifact("data_demo", [self.artifact_dir]))
+        self.assertFalse(install_database("data_demo", target, [self.artifact_dir]))
+        self.assertFalse(os.path.exists(target))
+
+
+if __name__ == "__main__":
+    unittest.main()
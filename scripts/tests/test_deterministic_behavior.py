@@ -2,21 +2,26 @@
 """
 Test script to verify deterministic behavior of table creation queries.
 
-This test ensures that the same queries produce identical results across multiple runs,
-which is crucial for consistent exercise generation and testing.
+This test ensures that the same queries produce identical results across multiple runs
+and DuckDB thread counts, which is crucial for consistent exercise generation and testing.
 """
 
 import hashlib
 import json
 import os
-import sqlite3
 import sys
 import tempfile
 from pathlib import Path
 
+import duckdb
+
 # Add the scripts directory to the Python path
 sys.path.append(str(Path(__file__).parent.parent))
 
+from scripts.data_schema_generation.create_tables_from_queries import (  # noqa: E402
+    build_table_query,
+)
+
 
 def load_table_creation_queries():
     """Load table creation queries from the configuration file."""
@@ -34,8 +39,9 @@ def create_test_database():
     # Create temporary database
     fd, db_path = tempfile.mkstemp(suffix=".db")
     os.close(fd)
+    os.unlink(db_path)
 
-    conn = sqlite3.connect(db_path)
+    conn = duckdb.connect(db_path)
     cursor = conn.cursor()
 
     # Create sample data_jobs table for testing
@@ -109,39 +115,25 @@ def create_test_database():
     return db_path, conn
 
 
-def sqlite_compatible_query(query):
-    """Convert query to SQLite-compatible format."""
-    # Remove SETSEED since SQLite doesn't support it
-    sqlite_query = query.replace("SELECT SETSEED(0.42); ", "")
-    # Replace ORDER BY RANDOM() with ORDER BY ROWID for deterministic results in test
-    sqlite_query = sqlite_query.replace("ORDER BY RANDOM()", "ORDER BY ROWID")
-    return sqlite_query
-
-
-def execute_table_creation_queries(conn, queries_config):
+def execute_table_creation_queries(conn, queries_config, threads=1):
     """Execute all table creation queries and return table data."""
     cursor = conn.cursor()
+    cursor.execute(f"SET threads = {threads}")
     results = {}
 
     for table_name, table_info in queries_config["tables"].items():
-        query = table_info["query"]
-
-        # Convert to SQLite-compatible query
-        sqlite_query = sqlite_compatible_query(query)
+        query = build_table_query(table_info, queries_config["metadata"])
 
         # Drop table if exists
         cursor.execute(f"DROP TABLE IF EXISTS {table_name}")
 
         # Execute the creation query
-        cursor.execute(sqlite_query)
+        cursor.execute(query)
 
-        # Get the created table data
-        cursor.execute(f"SELECT * FROM {table_name} ORDER BY 1")
+        # Get the created table data in storage order
+        cursor.execute(f"SELECT * FROM {table_name}")
         rows = cursor.fetchall()
-
-        # Get column names
-        cursor.execute(f"PRAGMA table_info({table_name})")
-        columns = [col[1] for col in cursor.fetchall()]
+        columns = [col[0] for col in cursor.description]
 
         results[table_name] = {"columns": columns, "rows": rows, "row_count": len(rows)}
 
@@ -157,9 +149,7 @@ def calculate_hash(data):
 def test_deterministic_behavior():
     """Test that table creation queries produce deterministic results."""
     print("Testing deterministic behavior of table creation queries...")
-    print(
-        "Note: Using SQLite-compatible queries for testing (SETSEED -> ROWID ordering)"
-    )
+    print("Note: Runs the expanded queries at 1 and 4 DuckDB threads")
 
     # Load configuration
     queries_config = load_table_creation_queries()
@@ -169,13 +159,13 @@ def test_deterministic_behavior():
 
     try:
         # Run queries first time
-        print("Running table creation queries (first time)...")
-        results_1 = execute_table_creation_queries(conn, queries_config)
+        print("Running table creation queries (first time, 1 thread)...")
+        results_1 = execute_table_creation_queries(conn, queries_config, threads=1)
         hash_1 = calculate_hash(results_1)
 
         # Run queries second time
-        print("Running table creation queries (second time)...")
-        results_2 = execute_table_creation_queries(conn, queries_config)
+        print("Running table creation queries (second time, 4 threads)...")
+        results_2 = execute_table_creation_queries(conn, queries_config, threads=4)
         hash_2 = calculate_hash(results_2)
 
         # Compare results
@@ -185,7 +175,6 @@ def test_deterministic_behavior():
 
         if hash_1 == hash_2:
             print("✅ SUCCESS: Table creation queries are deterministic!")
-            print("   (SQLite-compatible version - actual production uses SETSEED)")
 
             # Print summary statistics
             print("\nTable creation summary:")
@@ -212,6 +201,58 @@ def test_deterministic_behavior():
         os.unlink(db_path)
 
 
+def test_hash_sampling_is_thread_count_invariant():
+    """Limit and fraction samples keep the same rows and ids at any thread count."""
+    conn = duckdb.connect()
+    conn.execute(
+        "CREATE TABLE events AS SELECT range % 50000 AS user_id, range % 7 AS kind "
+        "FROM range(300000)"
+    )
+    samples = {
+        "top_users": {"key": ["user_id"], "limit": 20000, "id_column": "sample_id"},
+        "some_events": {"key": "*", "fraction": 0.3, "id_column": "event_id"},
+        "share_of_users": {
+            "key": ["user_id"],
+            "fraction": 0.95,
+            "exact": True,
+            "id_column": "sample_id",
+        },
+    }
+    queries = {
+        "top_users": "CREATE TABLE top_users AS "
+        "SELECT user_id, COUNT(*) AS events FROM events GROUP BY user_id",
+        "some_events": "CREATE TABLE some_events AS SELECT * FROM events",
+        "share_of_users": "CREATE TABLE share_of_users AS "
+        "SELECT DISTINCT user_id FROM events",
+    }
+
+    try:
+        runs = []
+        for threads in (1, 4):
+            conn.execute(f"SET threads = {threads}")
+            tables = {}
+            for name, query in queries.items():
+                conn.execute(f"DROP TABLE IF EXISTS {name}")
+                conn.execute(
+                    build_table_query(
+                        {"query": query, "sampling": samples[name]},
+                        {"sampling_seed": 42},
+                    )
+                )
+                tables[name] = conn.execute(f"SELECT * FROM {name}").fetchall()
+            runs.append(tables)
+
+        assert runs[0] == runs[1]
+        assert len(runs[0]["top_users"]) == 20000
+        assert [row[0] for row in runs[0]["top_users"][:3]] == [1, 2, 3]
+        # Duplicated rows are all kept or all dropped, near the requested share
+        assert 0.28 < len(runs[0]["some_events"]) / 300000 < 0.32
+        # Exact fractions keep round(fraction * rows) rows
+        assert len(runs[0]["share_of_users"]) == 47500
+    finally:
+        conn.close()
+
+
 if __name__ == "__main__":
     success = test_deterministic_behavior()
     sys.exit(0 if success else 1)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Tests for batched catalog introspection in schema generation.
+"""
+
+import unittest
+
+import duckdb
+
+from scripts.data_schema_generation.generate_data_schema_generic import (
+    fetch_columns,
+    fetch_row_counts,
+    fetch_samples,
+    foreign_key_tables,
+)
+
+
+class TestCatalogIntrospection(unittest.TestCase):
+    """Test cases for fetching table metadata in batches."""
+
+    def setUp(self):
+        """Create tables with keys, nullable columns and no rows."""
+        self.conn = duckdb.connect()
+        self.conn.execute(
+            "CREATE TABLE companies (company_id INTEGER PRIMARY KEY, "
+            "company_name VARCHAR NOT NULL, rating DECIMAL(3,1))"
+        )
+        self.conn.execute(
+            "INSERT INTO companies SELECT range, 'company_' || range, NULL "
+            "FROM range(10)"
+        )
+        self.conn.execute("CREATE TABLE empty_table (note VARCHAR)")
+        self.tables = ["companies", "empty_table"]
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.conn.close()
+
+    def test_columns_match_describe(self):
+        """Catalog columns agree with DESCRIBE for every table."""
+        columns = fetch_columns(self.conn, self.tables)
+
+        for table_name in self.tables:
+            described = [
+                {
+                    "column_name": name,
+                    "column_type": column_type,
+                    "nullable": null == "YES",
+                    "primary_key": key == "PRI",
+                }
+                for name, column_type, null, key, *_ in self.conn.execute(
+                    f"DESCRIBE {table_name}"
+                ).fetchall()
+            ]
+            self.assertEqual(columns[table_name], described)
+
+    def test_row_counts_and_samples(self):
+        """Counts are exact and samples hold a few rows as strings."""
+        self.assertEqual(
+            fetch_row_counts(self.conn, self.tables),
+            {"companies": 10, "empty_table": 0},
+        )
+
+        samples = fetch_samples(self.conn, self.tables, workers=2)
+
+        self.assertEqual(len(samples["companies"]), 3)
+        self.assertEqual(samples["companies"][0]["company_id"], "0")
+        self.assertEqual(samples["empty_table"], [])
+
+    def test_foreign_keys_searched_in_derived_tables_only(self):
+        """The raw source table is left out when the queries are known."""
+        tables = ["companies", "data_demo", "postings"]
+        artifacts = {"table_queries": {"tables": {"postings": {}, "companies": {}}}}
+
+        self.assertEqual(
+            foreign_key_tables(tables, artifacts), ["companies", "postings"]
+        )
+        self.assertEqual(foreign_key_tables(tables, {}), tables)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for the practice app's query profiling endpoint.
+"""
+
+import importlib
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import duckdb
+
+from scripts.practice_app.data_service import DataService
+from scripts.practice_app.sql_service import SQLService
+
+
+class TestProfileEndpoint(unittest.TestCase):
+    """Test cases for POST /api/profile through the Flask test client."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Import the app against a small database, without telemetry."""
+        cls.work_dir = tempfile.mkdtemp()
+        cls.db_path = os.path.join(cls.work_dir, "data_demo.db")
+        with duckdb.connect(cls.db_path) as conn:
+            conn.execute(
+                "CREATE TABLE postings AS SELECT range AS posting_id, "
+                "range % 4 AS company_id FROM range(1000)"
+            )
+
+        patches = [
+            mock.patch.dict(os.environ, {"SQL_TELEMETRY": "0", "SQL_WEEK": "4"}),
+            mock.patch.object(sys, "argv", ["app.py"]),
+            mock.patch.object(
+                DataService, "get_database_path", return_value=cls.db_path
+            ),
+            mock.patch.object(
+                DataService, "get_current_dataset", return_value="data_demo"
+            ),
+        ]
+        for patch in patches:
+            patch.start()
+        try:
+            sys.modules.pop("app", None)
+            cls.app_module = importlib.import_module("app")
+        finally:
+            for patch in reversed(patches):
+                patch.stop()
+        cls.app_module.sql_service = SQLService(cls.db_path, read_only=True)
+        cls.client = cls.app_module.app.test_client()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up test fixtures."""
+        sys.modules.pop("app", None)
+        shutil.rmtree(cls.work_dir, ignore_errors=True)
+
+    def test_profile_returns_plan_tree(self):
+        """The endpoint returns the rows along with the operator tree."""
+        response = self.client.post(
+            "/api/profile",
+            json={
+                "query": "SELECT company_id, COUNT(*) AS postings "
+                "FROM postings GROUP BY company_id"
+            },
+        )
+
+        self.assertEqual(response.status_code, 200)
+        result = response.get_json()
+        self.assertTrue(result["success"])
+        self.assertEqual(result["row_count"], 4)
+        profile = result["profile"]
+        self.assertEqual(profile["rows_returned"], 4)
+        self.assertTrue(profile["plan"])
+
+        def operators(node):
+            yield node
+            for child in node["children"]:
+                yield from operators(child)
+
+        names = [
+            operator["name"] for root in profile["plan"] for operator in operators(root)
+        ]
+        self.assertTrue(any("SCAN" in name for name in names), names)
+
+    def test_profile_errors_use_the_error_envelope(self):
+        """Failing queries and profiler failures come back like /api/execute."""
+        invalid = self.client.post(
+            "/api/profile", json={"query": "SELECT * FROM missing_table"}
+        ).get_json()
+        with mock.patch(
+            "scripts.practice_app.sql_service.run_with_profile",
+            side_effect=RuntimeError("profile output unreadable"),
+        ):
+            broken = self.client.post(
+                "/api/profile", json={"query": "SELECT 1 AS one"}
+            ).get_json()
+
+        for result, error_type in (
+            (invalid, "CatalogException"),
+            (broken, "RuntimeError"),
+        ):
+            self.assertFalse(result["success"])
+            self.assertEqual(result["error_type"], error_type)
+            self.assertEqual(result["data"], [])
+            self.assertEqual(result["row_count"], 0)
+            self.assertNotIn("profile", result)
+        self.assertEqual(broken["error"], "profile output unreadable")
+
+
+if __name__ == "__main__":
+    unittest.main()
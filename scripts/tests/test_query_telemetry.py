@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for the practice app's query telemetry log.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import duckdb
+
+from scripts.practice_app.telemetry import QueryTelemetry
+
+RESULT = {"success": True, "execution_time": 0.01, "row_count": 3}
+
+
+class TestQueryTelemetry(unittest.TestCase):
+    """Test cases for buffering and flushing query events."""
+
+    def setUp(self):
+        """Create a telemetry log that only flushes when asked."""
+        self.log_dir = tempfile.mkdtemp()
+        self.telemetry = QueryTelemetry(self.log_dir, flush_interval=3600)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.telemetry.close()
+        shutil.rmtree(self.log_dir, ignore_errors=True)
+
+    def _exercise_ids(self):
+        pattern = os.path.join(self.log_dir, "*.parquet").replace("'", "''")
+        return duckdb.execute(
+            f"SELECT exercise_id FROM read_parquet('{pattern}') ORDER BY event_time"
+        ).fetchall()
+
+    def test_client_exercise_ids_are_coerced(self):
+        """Ids that are not integers are logged as NULL instead of failing."""
+        for exercise_id in (3, "4", 5.0, "abc", 1.5, "1.5", 2**40, None):
+            self.telemetry.record("SELECT 1", RESULT, exercise_id=exercise_id)
+
+        self.assertEqual(self.telemetry.flush(), 8)
+        self.assertEqual(
+            self._exercise_ids(),
+            [(3,), (4,), (5,), (None,), (None,), (None,), (None,), (None,)],
+        )
+
+    def test_events_are_logged_by_fingerprint(self):
+        """Queries differing only in literals share a fingerprint."""
+        self.telemetry.record("SELECT * FROM t WHERE id = 1", RESULT, 7)
+        self.telemetry.record(
+            "select * from t where id = 2",
+            {"success": False, "execution_time": 0.5, "error_type": "CatalogException"},
+            7,
+            source="solution",
+        )
+        self.assertEqual(self.telemetry.flush(), 2)
+
+        pattern = os.path.join(self.log_dir, "*.parquet").replace("'", "''")
+        rows = duckdb.execute(
+            "SELECT fingerprint, source, latency_ms, success, error_class "
+            f"FROM read_parquet('{pattern}') ORDER BY event_time"
+        ).fetchall()
+        self.assertEqual(rows[0][0], rows[1][0])
+        self.assertEqual(
+            [row[1:] for row in rows],
+            [
+                ("student", 10.0, True, None),
+                ("solution", 500.0, False, "CatalogException"),
+            ],
+        )
+
+    def test_close_reports_a_failed_flush(self):
+        """Closing at exit never raises, even when the last batch fails."""
+        self.telemetry.record("SELECT 1", RESULT, exercise_id=1)
+        with patch.object(
+            QueryTelemetry, "_write_batch", side_effect=OSError("disk full")
+        ):
+            self.telemetry.close()
+
+    def test_failed_batch_is_retried(self):
+        """Events of a batch that fails to write stay buffered."""
+        self.telemetry.record("SELECT 1", RESULT, exercise_id=1)
+        with patch.object(
+            QueryTelemetry, "_write_batch", side_effect=OSError("disk full")
+        ):
+            with self.assertRaises(OSError):
+                self.telemetry.flush()
+        self.telemetry.record("SELECT 2", RESULT, exercise_id=2)
+
+        self.assertEqual(self.telemetry.flush(), 2)
+        self.assertEqual(self._exercise_ids(), [(1,), (2,)])
+
+
+if __name__ == "__main__":
+    unittest.main()
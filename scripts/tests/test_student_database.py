@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Tests for slim student database builds.
+"""
+
+import json
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+from unittest import mock
+
+import duckdb
+
+from scripts.data_schema_generation.build_manifest import BuildManifest
+from scripts.practice_app import data_service as data_service_module
+from scripts.practice_app.data_service import DataService
+from scripts.utilities.student_database import (
+    build_student_database,
+    load_manifest,
+    student_database_path,
+    verify_student_database,
+)
+
+
+class TestStudentDatabase(unittest.TestCase):
+    """Test cases for building and serving the slim database."""
+
+    def setUp(self):
+        """Create a project with a full database and a week's exercise file."""
+        self.base_path = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.base_path, "datasets"))
+        os.makedirs(os.path.join(self.base_path, "exercises", "week_9"))
+
+        self.source_path = os.path.join(self.base_path, "datasets", "data_demo.db")
+        conn = duckdb.connect(self.source_path)
+        conn.execute(
+            "CREATE TABLE data_demo AS SELECT range AS id, 'row ' || range AS text "
+            "FROM range(5000)"
+        )
+        conn.execute(
+            "CREATE TABLE companies AS SELECT range + 1 AS company_id FROM range(50)"
+        )
+        conn.execute(
+            "CREATE TABLE postings AS "
+            "SELECT id AS posting_id, id % 50 + 1 AS company_id FROM data_demo"
+        )
+        BuildManifest(conn).record("postings", "hash_v1", {"data_demo": "a"}, 5000, 0.1)
+        conn.close()
+
+        exercises = {
+            "metadata": {
+                "week": 9,
+                "database": "data_demo.db",
+                "schema_tables": ["companies", "postings"],
+            },
+            "exercises": [],
+        }
+        exercise_file = os.path.join(
+            self.base_path, "exercises", "week_9", "week_9_key_v1.json"
+        )
+        with open(exercise_file, "w") as f:
+            json.dump(exercises, f)
+
+        self.output_path = student_database_path(self.base_path, 9)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        if os.path.exists(self.output_path):
+            os.chmod(self.output_path, 0o644)
+        shutil.rmtree(self.base_path, ignore_errors=True)
+
+    def test_build_copies_only_schema_tables(self):
+        """The slim database holds the listed tables, read-only, with a manifest."""
+        manifest = build_student_database(
+            self.source_path, ["companies", "postings"], self.output_path
+        )
+
+        conn = duckdb.connect(self.output_path, read_only=True)
+        tables = {row[0] for row in conn.execute("SHOW TABLES").fetchall()}
+        first_rows = conn.execute("SELECT * FROM postings LIMIT 3").fetchall()
+        conn.close()
+
+        self.assertEqual(tables, {"companies", "postings"})
+        self.assertEqual(first_rows, [(0, 1), (1, 2), (2, 3)])
+        self.assertEqual(manifest["tables"]["postings"]["row_count"], 5000)
+        self.assertEqual(load_manifest(self.output_path), manifest)
+        self.assertFalse(os.stat(self.output_path).st_mode & stat.S_IWUSR)
+        self.assertTrue(verify_student_database(self.output_path, ["companies"]))
+        self.assertFalse(verify_student_database(self.output_path, ["data_demo"]))
+
+    def test_rebuild_replaces_previous_build(self):
+        """Building again overwrites the read-only file of the last build."""
+        build_student_database(self.source_path, ["companies"], self.output_path)
+
+        manifest = build_student_database(
+            self.source_path, ["companies", "postings"], self.output_path
+        )
+
+        self.assertEqual(set(manifest["tables"]), {"companies", "postings"})
+        self.assertTrue(verify_student_database(self.output_path))
+
+    def test_app_serves_verified_slim_database(self):
+        """The data service prefers a valid slim database and rejects a tampered one."""
+        data_service = DataService(base_path=self.base_path, week=9)
+        self.assertEqual(data_service.get_database_path(), self.source_path)
+        self.assertFalse(data_service.using_student_database)
+
+        build_student_database(
+            self.source_path, ["companies", "postings"], self.output_path
+        )
+        self.assertEqual(data_service.get_database_path(), self.output_path)
+        self.assertTrue(data_service.using_student_database)
+
+        os.chmod(self.output_path, 0o644)
+        with open(self.output_path, "ab") as f:
+            f.write(b"\0")
+        self.assertEqual(data_service.get_database_path(), self.source_path)
+
+    def test_tables_changed_in_full_database_make_slim_database_stale(self):
+        """Rebuilt or edited source tables invalidate the copy made before."""
+        build_student_database(
+            self.source_path, ["companies", "postings"], self.output_path
+        )
+        self.assertTrue(
+            verify_student_database(self.output_path, source_path=self.source_path)
+        )
+
+        conn = duckdb.connect(self.source_path)
+        BuildManifest(conn).record("postings", "hash_v2", {"data_demo": "a"}, 5000, 0.1)
+        conn.close()
+        self.assertFalse(
+            verify_student_database(self.output_path, source_path=self.source_path)
+        )
+
+        build_student_database(
+            self.source_path, ["companies", "postings"], self.output_path
+        )
+        conn = duckdb.connect(self.source_path)
+        conn.execute("DELETE FROM companies WHERE company_id = 50")
+        conn.close()
+        self.assertFalse(
+            verify_student_database(self.output_path, source_path=self.source_path)
+        )
+
+    def test_app_reuses_verification_until_files_change(self):
+        """The slim database is verified again only after a file changes."""
+        build_student_database(
+            self.source_path, ["companies", "postings"], self.output_path
+        )
+        data_service = DataService(base_path=self.base_path, week=9)
+
+        with mock.patch.object(
+            data_service_module,
+            "verify_student_database",
+            wraps=data_service_module.verify_student_database,
+        ) as verify:
+            self.assertEqual(data_service.get_database_path(), self.output_path)
+            self.assertEqual(data_service.get_database_path(), self.output_path)
+            self.assertEqual(verify.call_count, 1)
+
+            conn = duckdb.connect(self.source_path)
+            BuildManifest(conn).record(
+                "postings", "hash_v2", {"data_demo": "a"}, 5000, 0.1
+            )
+            conn.close()
+            self.assertEqual(data_service.get_database_path(), self.source_path)
+            self.assertEqual(verify.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Tests for Parquet snapshots of derived tables.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import duckdb
+
+from scripts.data_schema_generation import table_snapshots
+from scripts.data_schema_generation.build_manifest import BuildManifest
+from scripts.data_schema_generation.table_snapshots import (
+    create_snapshot_views,
+    diff_snapshots,
+    export_snapshot,
+    import_snapshot,
+)
+from scripts.practice_app.sql_service import SQLService
+
+
+class TestTableSnapshots(unittest.TestCase):
+    """Test cases for exporting, restoring, diffing and serving snapshots."""
+
+    def setUp(self):
+        """Create derived tables, one of them partitioned in the snapshot."""
+        self.work_dir = tempfile.mkdtemp()
+        self.conn = duckdb.connect()
+        self.conn.execute(
+            "CREATE TABLE postings AS SELECT range AS posting_id, "
+            "CASE WHEN range % 5 = 0 THEN NULL ELSE 'role_' || range % 3 END "
+            "AS role, (range * 7) % 1000 AS salary FROM range(3000)"
+        )
+        self.conn.execute("CREATE TABLE roles AS SELECT range AS role_id FROM range(3)")
+        BuildManifest(self.conn).record("roles", "abc", {}, 3, 0.1)
+        self.tables = {
+            "postings": {"snapshot": {"partition_by": ["role"]}},
+            "roles": {},
+        }
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.conn.close()
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def test_round_trip_restores_rows_types_and_build_records(self):
+        """Restored tables match the originals, in order, with their records."""
+        snapshot_dir = os.path.join(self.work_dir, "snapshot")
+        manifest = export_snapshot(self.conn, self.tables, snapshot_dir)
+        self.assertEqual(len(manifest["tables"]["postings"]["files"]), 4)
+        expected = self.conn.execute("SELECT * FROM postings").fetchall()
+        schema = self.conn.execute("DESCRIBE postings").fetchall()
+
+        target = duckdb.connect()
+        restored = import_snapshot(target, snapshot_dir)
+
+        self.assertEqual(restored, {"postings": 3000, "roles": 3})
+        self.assertEqual(target.execute("SELECT * FROM postings").fetchall(), expected)
+        self.assertEqual(target.execute("DESCRIBE postings").fetchall(), schema)
+        self.assertEqual(BuildManifest(target).entries()["roles"]["query_hash"], "abc")
+        target.close()
+
+    def test_diff_reports_changed_rows(self):
+        """Diffs count rows only present in either snapshot."""
+        old_dir = os.path.join(self.work_dir, "old")
+        new_dir = os.path.join(self.work_dir, "new")
+        export_snapshot(self.conn, self.tables, old_dir)
+        self.conn.execute("UPDATE postings SET salary = -1 WHERE posting_id < 4")
+        export_snapshot(self.conn, {"postings": self.tables["postings"]}, new_dir)
+
+        diff = diff_snapshots(old_dir, new_dir)
+
+        self.assertEqual(diff["roles"], {"status": "removed", "old_rows": 3})
+        self.assertEqual(diff["postings"]["status"], "changed")
+        self.assertEqual(diff["postings"]["only_in_old"], 4)
+        self.assertEqual(diff["postings"]["only_in_new"], 4)
+        self.assertEqual(
+            diff_snapshots(old_dir, old_dir)["postings"]["status"], "unchanged"
+        )
+
+    def test_views_serve_snapshot_tables(self):
+        """Snapshot views answer queries without a database file."""
+        snapshot_dir = os.path.join(self.work_dir, "snapshot")
+        export_snapshot(self.conn, self.tables, snapshot_dir)
+
+        views = duckdb.connect()
+        self.assertEqual(
+            create_snapshot_views(views, snapshot_dir), ["postings", "roles"]
+        )
+        count = views.execute(
+            "SELECT COUNT(*) FROM postings WHERE role = 'role_1'"
+        ).fetchone()[0]
+        views.close()
+
+        expected = self.conn.execute(
+            "SELECT COUNT(*) FROM postings WHERE role = 'role_1'"
+        ).fetchone()[0]
+        self.assertEqual(count, expected)
+
+    def test_sql_service_creates_snapshot_views_once(self):
+        """Every request is served from the views created at startup."""
+        snapshot_dir = os.path.join(self.work_dir, "snapshot")
+        export_snapshot(self.conn, self.tables, snapshot_dir)
+
+        with mock.patch(
+            "scripts.practice_app.sql_service.create_snapshot_views",
+            wraps=table_snapshots.create_snapshot_views,
+        ) as create_views:
+            service = SQLService("unused.db", snapshot_dir=snapshot_dir)
+            first = service.execute_query("SELECT COUNT(*) AS n FROM roles")
+            second = service.execute_query("SELECT COUNT(*) AS n FROM postings")
+            tables = [table["name"] for table in service.get_table_info()]
+            service.close()
+
+        self.assertEqual(create_views.call_count, 1)
+        self.assertEqual(first["data"], [{"n": 3}])
+        self.assertEqual(second["data"], [{"n": 3000}])
+        self.assertEqual(tables, ["postings", "roles"])
+
+    def test_sql_service_snapshot_views_survive_student_queries(self):
+        """Queries cannot drop or replace the views other requests read."""
+        snapshot_dir = os.path.join(self.work_dir, "snapshot")
+        export_snapshot(self.conn, self.tables, snapshot_dir)
+        service = SQLService("unused.db", snapshot_dir=snapshot_dir)
+
+        dropped = service.execute_query("DROP VIEW roles")
+        replaced = service.execute_query(
+            "CREATE OR REPLACE VIEW postings AS SELECT 1 AS posting_id"
+        )
+        after = service.execute_query("SELECT COUNT(*) AS n FROM postings")
+        roles = service.execute_query("SELECT COUNT(*) AS n FROM roles")
+        service.close()
+
+        self.assertFalse(dropped["success"])
+        self.assertFalse(replaced["success"])
+        self.assertEqual(after["data"], [{"n": 3000}])
+        self.assertEqual(roles["data"], [{"n": 3}])
+
+
+if __name__ == "__main__":
+    unittest.main()
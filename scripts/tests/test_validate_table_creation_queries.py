@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Tests for validating table creation queries in a scratch database.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import duckdb
+
+from scripts.core.sql_helper import SQLHelper
+from scripts.data_schema_generation.validate_table_creation_queries import (
+    TableCreationValidator,
+    open_scratch_database,
+)
+
+
+class TestScratchValidation(unittest.TestCase):
+    """Test cases for validating without touching the source database."""
+
+    def setUp(self):
+        """Create a source database and a table creation JSON over it."""
+        self.work_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.work_dir, "data_demo.db")
+        conn = duckdb.connect(self.db_path)
+        conn.execute(
+            "CREATE TABLE raw_postings AS SELECT range AS id, "
+            "'company_' || range % 10 AS company FROM range(1000)"
+        )
+        conn.close()
+
+        self.input_file = os.path.join(self.work_dir, "queries.json")
+        self._write_queries(
+            {
+                "companies": {
+                    "description": "Distinct companies",
+                    "query": "CREATE TABLE companies AS SELECT DISTINCT "
+                    "company FROM raw_postings",
+                    "layout": {"indexes": [["company"]]},
+                },
+                "company_postings": {
+                    "description": "Postings per company",
+                    "depends_on": ["companies"],
+                    "query": "CREATE TABLE company_postings AS SELECT "
+                    "c.company, COUNT(*) AS postings FROM companies c "
+                    "JOIN raw_postings r USING (company) GROUP BY 1",
+                },
+                "broken": {
+                    "description": "Fails to build",
+                    "query": "CREATE TABLE broken AS SELECT * FROM missing",
+                },
+            }
+        )
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def _write_queries(self, tables):
+        with open(self.input_file, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "metadata": {
+                        "dataset": "data_demo",
+                        "source_table": "raw_postings",
+                        "description": "Demo tables",
+                    },
+                    "tables": tables,
+                },
+                f,
+            )
+
+    def _checksum(self):
+        with open(self.db_path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    def test_validation_leaves_source_database_untouched(self):
+        """Tables are built in the scratch database, never in the source."""
+        checksum = self._checksum()
+
+        results = TableCreationValidator(
+            self.input_file, self.db_path, jobs=2
+        ).validate_all()
+
+        query_results = results["query_results"]
+        self.assertEqual(query_results["companies"]["row_count"], 10)
+        self.assertEqual(query_results["company_postings"]["row_count"], 10)
+        self.assertEqual(
+            query_results["company_postings"]["columns"], ["company", "postings"]
+        )
+        self.assertEqual(query_results["broken"]["status"], "error")
+        self.assertFalse(results["query_validation"]["passed"])
+
+        self.assertEqual(self._checksum(), checksum)
+        conn = duckdb.connect(self.db_path, read_only=True)
+        tables = [row[0] for row in conn.execute("SHOW TABLES").fetchall()]
+        conn.close()
+        self.assertEqual(tables, ["raw_postings"])
+
+    def test_available_rows_derived_from_any_query(self):
+        """Sampled tables are counted by stripping their sampling or LIMIT."""
+        self._write_queries(
+            {
+                "companies": {
+                    "query": "CREATE TABLE companies AS SELECT company, "
+                    "COUNT(*) AS postings FROM raw_postings GROUP BY company",
+                    "sampling": {"key": ["company"], "limit": 8},
+                },
+                "postings": {
+                    "query": "CREATE TABLE postings AS SELECT * FROM raw_postings "
+                    "WHERE id % 2 = 0",
+                    "sampling": {"fraction": 0.9},
+                },
+                "recent_postings": {
+                    "query": "SELECT SETSEED(0.5); CREATE TABLE recent_postings AS "
+                    "SELECT * FROM raw_postings ORDER BY RANDOM() LIMIT 100",
+                },
+                "company_names": {
+                    "query": "CREATE TABLE company_names AS SELECT company "
+                    "FROM companies",
+                },
+            }
+        )
+        validator = TableCreationValidator(self.input_file, self.db_path)
+        results = validator.validate_all()
+
+        self.assertEqual(results["query_results"]["company_names"]["row_count"], 8)
+        errors = [
+            error
+            for error in results["schema_validation"]["errors"]
+            if "of available data" in error
+        ]
+        self.assertEqual(
+            errors,
+            [
+                "Table 'recent_postings' only uses 10.0% of available data (minimum: 75%)"
+            ],
+        )
+
+        validator = TableCreationValidator(self.input_file)
+        validator.sql_helper = SQLHelper.from_connection(
+            open_scratch_database(self.db_path)
+        )
+        with open(self.input_file, encoding="utf-8") as f:
+            data = json.load(f)
+        estimated = validator.preview_row_counts(data)
+        validator.validation_results["query_results"] = results["query_results"]
+        built = validator.preview_row_counts(data)
+        validator.sql_helper.close()
+
+        self.assertEqual(estimated["companies"]["available_count"], 10)
+        self.assertEqual(estimated["companies"]["expected_count"], 8)
+        self.assertEqual(estimated["postings"]["available_count"], 500)
+        self.assertEqual(estimated["postings"]["expected_count"], 450)
+        self.assertEqual(estimated["recent_postings"]["available_count"], 1000)
+        self.assertNotIn("company_names", estimated)
+        self.assertEqual(
+            built["postings"]["expected_count"],
+            results["query_results"]["postings"]["row_count"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
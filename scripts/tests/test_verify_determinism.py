@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for verifying that table builds are deterministic.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import duckdb
+
+from scripts.data_schema_generation.verify_determinism import verify_determinism
+
+
+class TestVerifyDeterminism(unittest.TestCase):
+    """Test cases for comparing two builds of the same tables."""
+
+    def setUp(self):
+        """Create a source database."""
+        self.work_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.work_dir, "data_demo.db")
+        conn = duckdb.connect(self.db_path)
+        conn.execute(
+            "CREATE TABLE raw_postings AS SELECT range AS id, "
+            "'company_' || range % 50 AS company FROM range(200000)"
+        )
+        conn.close()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def test_hash_sampled_tables_match_across_thread_counts(self):
+        """Seeded hash samples are identical at one and four threads."""
+        tables = {
+            "postings": {
+                "query": "CREATE TABLE postings AS SELECT * FROM raw_postings",
+                "sampling": {"key": ["id"], "limit": 150000, "id_column": "job_id"},
+            },
+            "companies": {
+                "query": "CREATE TABLE companies AS SELECT DISTINCT company "
+                "FROM postings",
+            },
+        }
+
+        verification = verify_determinism(self.db_path, tables, threads=(1, 4))
+
+        self.assertIsNone(verification["first_difference"])
+        self.assertEqual(
+            verification["tables"]["postings"],
+            {"status": "identical", "row_counts": [150000, 150000]},
+        )
+        self.assertEqual(verification["tables"]["companies"]["status"], "identical")
+
+    def test_first_nondeterministic_table_is_pinpointed(self):
+        """Tables built from a nondeterministic one are not blamed for it."""
+        tables = {
+            "companies": {
+                "query": "CREATE TABLE companies AS SELECT DISTINCT company "
+                "FROM raw_postings",
+            },
+            "sampled": {
+                "query": "CREATE TABLE sampled AS SELECT * FROM raw_postings "
+                "WHERE random() < 0.5",
+            },
+            "sampled_companies": {
+                "query": "CREATE TABLE sampled_companies AS SELECT company, "
+                "COUNT(*) AS postings FROM sampled GROUP BY company",
+            },
+        }
+
+        verification = verify_determinism(self.db_path, tables)
+
+        self.assertEqual(verification["first_difference"], "sampled")
+        statuses = {
+            name: result["status"] for name, result in verification["tables"].items()
+        }
+        self.assertEqual(
+            statuses,
+            {
+                "companies": "identical",
+                "sampled": "different",
+                "sampled_companies": "different",
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
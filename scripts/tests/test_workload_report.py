@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests for the workload report built from query telemetry.
+"""
+
+import shutil
+import tempfile
+import unittest
+
+from scripts.analytics.workload_report import (
+    generate_markdown_report,
+    group_by_exercise,
+    load_workload,
+    summarize_tables,
+)
+from scripts.practice_app.telemetry import QueryTelemetry
+
+
+class TestWorkloadReport(unittest.TestCase):
+    """Test cases for aggregating telemetry into a workload report."""
+
+    def setUp(self):
+        """Log the same query shape in two exercises and a failing query."""
+        self.log_dir = tempfile.mkdtemp()
+        telemetry = QueryTelemetry(self.log_dir, flush_interval=3600)
+        for exercise_id, salary in ((1, 100), (1, 200), (2, 300)):
+            telemetry.record(
+                f"SELECT * FROM job_postings WHERE salary > {salary}",
+                {"success": True, "execution_time": 0.01, "row_count": 5},
+                exercise_id=exercise_id,
+            )
+        telemetry.record(
+            "SELECT * FROM job_postings JOIN companies USING (company_id)",
+            {"success": False, "execution_time": 0.03, "error_type": "BinderError"},
+            exercise_id=2,
+        )
+        telemetry.close()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.log_dir, ignore_errors=True)
+
+    def test_shapes_are_grouped_per_exercise(self):
+        """Literals collapse into one shape per exercise, heaviest first."""
+        shapes = load_workload(self.log_dir)
+        report = group_by_exercise(shapes)
+
+        self.assertEqual(len(shapes), 3)
+        self.assertEqual(report["Exercise 1"]["executions"], 2)
+        self.assertEqual(report["Exercise 1"]["shapes"], 1)
+        self.assertEqual(report["Exercise 2"]["errors"], 1)
+        self.assertEqual(
+            report["Exercise 2"]["heaviest"][0]["error_classes"], ["BinderError"]
+        )
+        self.assertEqual(load_workload(self.log_dir, source="solution"), [])
+
+    def test_table_load_counts_distinct_shapes(self):
+        """A shape run in two exercises counts once per table."""
+        shapes = load_workload(self.log_dir)
+        tables = {table["table"]: table for table in summarize_tables(shapes)}
+
+        self.assertEqual(tables["job_postings"]["shapes"], 2)
+        self.assertEqual(tables["job_postings"]["executions"], 4)
+        self.assertEqual(tables["companies"]["shapes"], 1)
+
+        markdown = generate_markdown_report(
+            group_by_exercise(shapes), summarize_tables(shapes)
+        )
+        self.assertIn("| job_postings | 2 | 4 |", markdown)
+        self.assertIn("## Exercise 2", markdown)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Prebuilt database artifacts.
+
+Building a week's database means downloading the dataset from HuggingFace,
+loading it into DuckDB and running every table creation query. Once one
+machine has done that, ``package-db`` compresses the checkpointed database
+into a versioned artifact with a manifest, and ``setup.py`` installs it on
+other machines from a local or shared artifact directory instead of
+building.
+
+An artifact's version is a build key derived from the dataset name, the
+table creation queries and the DuckDB storage version, so an artifact is
+only installed while it matches what the current checkout would build. The
+archive and the database inside it are both checked against the SHA-256
+checksums in the manifest.
+
+Usage:
+    python scripts/utilities/database_artifacts.py package-db --dataset data_jobs
+    python scripts/utilities/database_artifacts.py install --dataset data_jobs
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import duckdb
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.utilities.student_database import sha256_file  # noqa: E402
+
+# Default artifact directory; SQL_ARTIFACT_DIR adds a shared location
+DEFAULT_ARTIFACT_DIR = str(PROJECT_ROOT / "artifacts")
+ARTIFACT_DIR_ENV = "SQL_ARTIFACT_DIR"
+
+# Bumped when the artifact layout changes
+ARTIFACT_FORMAT_VERSION = 1
+
+# Characters of the build key used in artifact file names
+_KEY_LENGTH = 16
+
+# Bytes copied at a time while compressing
+_COPY_CHUNK_BYTES = 1024 * 1024
+
+
+def _table_queries_file(dataset_name: str) -> Path:
+    return (
+        PROJECT_ROOT
+        / "scripts"
+        / "data_schema_generation"
+        / f"table_creation_queries_{dataset_name}.json"
+    )
+
+
+def build_key(dataset_name: str) -> str:
+    """
+    Version of the database the current checkout builds for a dataset.
+
+    Args:
+        dataset_name: Database name without extension (e.g. "data_jobs")
+
+    Returns:
+        str: Hex key; changes with the table creation queries or DuckDB's
+            storage version
+    """
+    queries_file = _table_queries_file(dataset_name)
+    queries = None
+    if queries_file.exists():
+        with open(queries_file, encoding="utf-8") as f:
+            queries = json.load(f)
+
+    major, minor = duckdb.__version__.split(".")[:2]
+    key_parts = {
+        "format": ARTIFACT_FORMAT_VERSION,
+        "dataset": dataset_name,
+        "table_queries": queries,
+        "duckdb": f"{major}.{minor}",
+    }
+    encoded = json.dumps(key_parts, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:_KEY_LENGTH]
+
+
+def artifact_dirs(extra_dir: Optional[str] = None) -> List[str]:
+    """
+    Directories searched for artifacts, most specific first.
+
+    Args:
+        extra_dir: Directory given on the command line
+
+    Returns:
+        list: Existing and non-existing candidate directories, without duplicates
+    """
+    candidates = [extra_dir, os.environ.get(ARTIFACT_DIR_ENV), DEFAULT_ARTIFACT_DIR]
+    dirs = []
+    for candidate in candidates:
+        if candidate and candidate not in dirs:
+            dirs.append(candidate)
+    return dirs
+
+
+def _manifest_name(dataset_name: str, key: str) -> str:
+    return f"{dataset_name}-{key}.manifest.json"
+
+
+def package_database(
+    dataset_name: str, db_path: str, artifact_dir: str = DEFAULT_ARTIFACT_DIR
+) -> Dict[str, Any]:
+    """
+    Compress a built database into a versioned artifact with a manifest.
+
+    The database is checkpointed first so the artifact is a single file.
+
+    Args:
+        dataset_name: Database name without extension (e.g. "data_jobs")
+        db_path: Built database to package
+        artifact_dir: Directory receiving the artifact and manifest
+
+    Returns:
+        dict: The manifest that was written
+    """
+    conn = duckdb.connect(str(db_path))
+    try:
+        conn.execute("CHECKPOINT")
+        tables = {
+            name: conn.execute(f'SELECT COUNT(*) FROM "{name}"').fetchone()[0]
+            for (name,) in conn.execute("SHOW TABLES").fetchall()
+        }
+    finally:
+        conn.close()
+
+    key = build_key(dataset_name)
+    os.makedirs(artifact_dir, exist_ok=True)
+    archive_name = f"{dataset_name}-{key}.db.gz"
+    archive_path = os.path.join(artifact_dir, archive_name)
+
+    fd, temp_path = tempfile.mkstemp(dir=artifact_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as raw, gzip.GzipFile(
+            filename="", mode="wb", fileobj=raw, mtime=0
+        ) as compressed, open(db_path, "rb") as source:
+            shutil.copyfileobj(source, compressed, _COPY_CHUNK_BYTES)
+        # Checksum the file being published, not whatever a concurrent
+        # packager may have put at the final path
+        archive_sha256 = sha256_file(temp_path)
+        archive_size = os.path.getsize(temp_path)
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, archive_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+    manifest = {
+        "format_version": ARTIFACT_FORMAT_VERSION,
+        "dataset": dataset_name,
+        "build_key": key,
+        "artifact": archive_name,
+        "sha256": archive_sha256,
+        "size_bytes": archive_size,
+        "database_sha256": sha256_file(str(db_path)),
+        "database_size_bytes": os.path.getsize(db_path),
+        "duckdb_version": duckdb.__version__,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "tables": tables,
+    }
+    manifest_path = os.path.join(artifact_dir, _manifest_name(dataset_name, key))
+    fd, temp_path = tempfile.mkstemp(dir=artifact_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, manifest_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+    return manifest
+
+
+def find_artifact(dataset_name: str, dirs: List[str]) -> Optional[Dict[str, Any]]:
+    """
+    Find an artifact matching the current build key whose archive checksum matches.
+
+    Args:
+        dataset_name: Database name without extension
+        dirs: Directories to search, in order
+
+    Returns:
+        dict: The manifest with an added "archive_path", or None
+    """
+    manifest_name = _manifest_name(dataset_name, build_key(dataset_name))
+    for directory in dirs:
+        manifest_path = os.path.join(directory, manifest_name)
+        try:
+            with open(manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            continue
+
+        archive_path = os.path.join(directory, manifest["artifact"])
+        if not os.path.exists(archive_path):
+            continue
+        if sha256_file(archive_path) != manifest["sha256"]:
+            print(f"⚠️  Checksum mismatch for {archive_path}; ignoring it")
+            continue
+        return {**manifest, "archive_path": archive_path}
+    return None
+
+
+def install_database(dataset_name: str, db_path: str, dirs: List[str]) -> bool:
+    """
+    Install a prebuilt database from the first matching artifact.
+
+    Args:
+        dataset_name: Database name without extension
+        db_path: Where the database is installed
+        dirs: Directories to search, in order
+
+    Returns:
+        bool: True if a verified database was installed
+    """
+    manifest = find_artifact(dataset_name, dirs)
+    if manifest is None:
+        return False
+
+    target_dir = os.path.dirname(os.path.abspath(db_path))
+    os.makedirs(target_dir, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=target_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as target, gzip.open(
+            manifest["archive_path"], "rb"
+        ) as archive:
+            shutil.copyfileobj(archive, target, _COPY_CHUNK_BYTES)
+        if sha256_file(temp_path) != manifest["database_sha256"]:
+            print(f"⚠️  Database in {manifest['archive_path']} is corrupt")
+            os.unlink(temp_path)
+            return False
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, db_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+    print(f"📦 Installed {db_path} from {manifest['archive_path']}")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Package built databases as artifacts, or install them"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    package_parser = subparsers.add_parser(
+        "package-db", help="Compress a built database into a versioned artifact"
+    )
+    install_parser = subparsers.add_parser(
+        "install", help="Install a database from a matching artifact"
+    )
+    for subparser in (package_parser, install_parser):
+        subparser.add_argument(
+            "--dataset", required=True, help="Database name (e.g., data_jobs)"
+        )
+        subparser.add_argument(
+            "--artifact-dir",
+            default=None,
+            help=f"Artifact directory (default: ${ARTIFACT_DIR_ENV} or artifacts/)",
+        )
+
+    args = parser.parse_args()
+    db_path = PROJECT_ROOT / "datasets" / f"{args.dataset}.db"
+
+    if args.command == "package-db":
+        if not db_path.exists():
+            print(f"❌ Database not found: {db_path}")
+            sys.exit(1)
+        artifact_dir = artifact_dirs(args.artifact_dir)[0]
+        manifest = package_database(args.dataset, str(db_path), artifact_dir)
+        print(f"✅ Packaged {db_path} as {manifest['artifact']}")
+        print(
+            f"   📏 {manifest['size_bytes'] / 1e6:.1f} MB compressed "
+            f"({manifest['database_size_bytes'] / 1e6:.1f} MB database)"
+        )
+        print(f"   🔑 Build key: {manifest['build_key']}")
+        print(f"   🔐 SHA-256: {manifest['sha256']}")
+    else:
+        if not install_database(
+            args.dataset, str(db_path), artifact_dirs(args.artifact_dir)
+        ):
+            print(f"❌ No matching artifact for {args.dataset}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
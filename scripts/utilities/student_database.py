@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Slim student database builds.
+
+The databases built by setup.py keep the raw dataset table next to the
+derived tables, although students only ever query the week's schema_tables.
+This script copies just those tables into a compact, checkpointed DuckDB
+file that is written once and then opened read-only by the practice app.
+
+A manifest next to the database records its SHA-256 checksum and the row
+count, columns and content fingerprint of each table, along with the build
+record each table had in the full database. The app only serves from the
+slim database while the checksum matches and none of its tables has been
+rebuilt in the full database since the copy was made.
+
+Usage:
+    python scripts/utilities/student_database.py --week 4
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import stat
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import duckdb
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from scripts.data_schema_generation.build_manifest import (  # noqa: E402
+    BUILD_MANIFEST_TABLE,
+    fingerprint_table,
+)
+
+# Directory under the project root holding the slim databases
+STUDENT_DATABASE_DIR = os.path.join("datasets", "student")
+
+# Bumped when the manifest layout changes
+MANIFEST_VERSION = 2
+
+# Bytes read at a time when computing checksums
+_CHECKSUM_CHUNK_BYTES = 1024 * 1024
+
+
+def student_database_path(base_path: str, week: int) -> str:
+    """
+    Location of a week's slim student database.
+
+    Args:
+        base_path: Project root
+        week: Week number
+
+    Returns:
+        str: Path of the database file
+    """
+    return os.path.join(base_path, STUDENT_DATABASE_DIR, f"week_{week}.db")
+
+
+def manifest_path(database_path: str) -> str:
+    """
+    Location of the manifest describing a slim database.
+
+    Args:
+        database_path: Path of the database file
+
+    Returns:
+        str: Path of the manifest JSON file
+    """
+    return f"{os.path.splitext(database_path)[0]}.manifest.json"
+
+
+def sha256_file(path: str) -> str:
+    """
+    Checksum a file.
+
+    Args:
+        path: File to hash
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHECKSUM_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_json_atomically(path: str, data: Dict[str, Any]) -> None:
+    """Write JSON through a temporary file so readers never see a partial file."""
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, default=str)
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def _build_signatures(
+    conn: duckdb.DuckDBPyConnection, catalog: str, tables: List[str]
+) -> Dict[str, Optional[str]]:
+    """
+    Hash each table's build record in a database's _build_manifest.
+
+    The signature covers the query hash, input fingerprints and build time,
+    so it changes whenever the table is rebuilt.
+
+    Args:
+        conn: Connection the database is attached to
+        catalog: Name the database is attached as
+        tables: Tables to look up
+
+    Returns:
+        dict: Table name -> signature, or None for tables without a record
+    """
+    signatures: Dict[str, Optional[str]] = dict.fromkeys(tables)
+    has_manifest = conn.execute(
+        "SELECT COUNT(*) FROM duckdb_tables() "
+        "WHERE database_name = ? AND schema_name = 'main' AND table_name = ?",
+        [catalog, BUILD_MANIFEST_TABLE],
+    ).fetchone()[0]
+    if not has_manifest or not tables:
+        return signatures
+
+    rows = conn.execute(
+        f"SELECT table_name, query_hash, input_fingerprints, built_at::VARCHAR "
+        f'FROM "{catalog}".main.{BUILD_MANIFEST_TABLE} '
+        f"WHERE table_name IN ({', '.join('?' for _ in tables)})",
+        list(tables),
+    ).fetchall()
+    for table_name, *record in rows:
+        signatures[table_name] = hashlib.sha256(
+            json.dumps(record).encode("utf-8")
+        ).hexdigest()
+    return signatures
+
+
+def build_student_database(
+    source_path: str,
+    tables: List[str],
+    output_path: str,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Copy tables into a new, checkpointed database and write its manifest.
+
+    Tables keep their row order. The finished file is made read-only and
+    replaces any previous build atomically.
+
+    Args:
+        source_path: Database holding the built tables
+        tables: Tables to copy
+        output_path: Path of the slim database
+        metadata: Extra fields for the manifest (week, dataset, ...)
+
+    Returns:
+        dict: The manifest that was written
+    """
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    os.makedirs(output_dir, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=output_dir, suffix=".db")
+    os.close(fd)
+    os.unlink(temp_path)
+
+    try:
+        conn = duckdb.connect(temp_path)
+        try:
+            escaped_source = str(source_path).replace("'", "''")
+            conn.execute(f"ATTACH '{escaped_source}' AS source (READ_ONLY)")
+            source_builds = _build_signatures(conn, "source", tables)
+            table_info = {}
+            for table_name in tables:
+                conn.execute(
+                    f'CREATE TABLE "{table_name}" AS '
+                    f'SELECT * FROM source.main."{table_name}"'
+                )
+                columns = conn.execute(f'DESCRIBE "{table_name}"').fetchall()
+                table_info[table_name] = {
+                    "row_count": conn.execute(
+                        f'SELECT COUNT(*) FROM "{table_name}"'
+                    ).fetchone()[0],
+                    "columns": [[column[0], column[1]] for column in columns],
+                    "fingerprint": fingerprint_table(conn, table_name),
+                    "source_build": source_builds[table_name],
+                }
+            conn.execute("DETACH source")
+            conn.execute("CHECKPOINT")
+        finally:
+            conn.close()
+
+        os.chmod(temp_path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+        if os.path.exists(output_path):
+            os.chmod(output_path, stat.S_IRUSR | stat.S_IWUSR)
+        os.replace(temp_path, output_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+    manifest = {
+        "manifest_version": MANIFEST_VERSION,
+        **(metadata or {}),
+        "database": os.path.basename(output_path),
+        "source_database": os.path.basename(str(source_path)),
+        "sha256": sha256_file(output_path),
+        "size_bytes": os.path.getsize(output_path),
+        "duckdb_version": duckdb.__version__,
+        "built_at": datetime.now().isoformat(timespec="seconds"),
+        "tables": table_info,
+    }
+    _write_json_atomically(manifest_path(output_path), manifest)
+    return manifest
+
+
+def load_manifest(database_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Load the manifest of a slim database.
+
+    Args:
+        database_path: Path of the database file
+
+    Returns:
+        dict: The manifest, or None if it is missing or unreadable
+    """
+    try:
+        with open(manifest_path(database_path), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def stale_tables(manifest: Dict[str, Any], source_path: str) -> List[str]:
+    """
+    Find the tables of a slim database that changed in the full database.
+
+    Tables the full database has a build record for are compared by that
+    record; other tables are compared by content fingerprint.
+
+    Args:
+        manifest: Manifest of the slim database
+        source_path: Full database the tables were copied from
+
+    Returns:
+        list: Names of tables rebuilt or missing since the copy was made
+
+    Raises:
+        duckdb.Error: If the full database cannot be opened
+    """
+    tables = manifest.get("tables", {})
+    conn = duckdb.connect(source_path, read_only=True)
+    try:
+        catalog = conn.execute("SELECT current_database()").fetchone()[0]
+        current_builds = _build_signatures(conn, catalog, list(tables))
+        stale = []
+        for table_name, info in tables.items():
+            if "source_build" not in info:
+                stale.append(table_name)
+            elif info["source_build"] is not None:
+                if current_builds[table_name] != info["source_build"]:
+                    stale.append(table_name)
+            elif current_builds[table_name] is not None:
+                stale.append(table_name)
+            else:
+                try:
+                    fingerprint = fingerprint_table(conn, table_name)
+                except duckdb.Error:
+                    fingerprint = None
+                if fingerprint != info.get("fingerprint"):
+                    stale.append(table_name)
+        return stale
+    finally:
+        conn.close()
+
+
+def verify_student_database(
+    database_path: str,
+    required_tables: Optional[List[str]] = None,
+    source_path: Optional[str] = None,
+) -> bool:
+    """
+    Check a slim database against its manifest.
+
+    Args:
+        database_path: Path of the database file
+        required_tables: Tables the database must contain
+        source_path: Full database the tables were copied from; when given,
+            tables rebuilt there since the copy make the slim database stale
+
+    Returns:
+        bool: True if the checksum matches, all required tables are listed
+            and none of them is stale
+    """
+    manifest = load_manifest(database_path)
+    if manifest is None or not os.path.exists(database_path):
+        return False
+
+    if sha256_file(database_path) != manifest.get("sha256"):
+        print(f"⚠️  Checksum mismatch for {database_path}; rebuild it")
+        return False
+
+    missing = set(required_tables or []) - set(manifest.get("tables", {}))
+    if missing:
+        print(f"⚠️  {database_path} lacks tables: {', '.join(sorted(missing))}")
+        return False
+
+    if source_path is not None:
+        try:
+            stale = stale_tables(manifest, source_path)
+        except duckdb.Error as e:
+            print(f"⚠️  Cannot compare {database_path} with {source_path}: {e}")
+            return False
+        if stale:
+            print(
+                f"⚠️  {database_path} is out of date for tables: "
+                f"{', '.join(stale)}; rebuild it"
+            )
+            return False
+
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build a slim read-only database with a week's schema tables"
+    )
+    parser.add_argument("--week", type=int, default=4, help="Week number (default: 4)")
+    parser.add_argument(
+        "--base-path",
+        default=str(Path(__file__).resolve().parent.parent.parent),
+        help="Project root (default: this repository)",
+    )
+    args = parser.parse_args()
+
+    from scripts.practice_app.data_service import DataService
+
+    data_service = DataService(base_path=args.base_path, week=args.week)
+    try:
+        exercises = data_service.load_exercises()
+        source_path = data_service.get_source_database_path()
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    tables = exercises.get("metadata", {}).get("schema_tables", [])
+    if not tables:
+        print(f"❌ Week {args.week} exercise metadata has no schema_tables")
+        sys.exit(1)
+
+    output_path = student_database_path(args.base_path, args.week)
+    print(f"📦 Building slim database for Week {args.week}: {', '.join(tables)}")
+    try:
+        manifest = build_student_database(
+            source_path,
+            tables,
+            output_path,
+            metadata={"week": args.week, "dataset": data_service.current_dataset},
+        )
+    except duckdb.Error as e:
+        print(f"❌ Failed to build slim database: {e}")
+        sys.exit(1)
+
+    source_size = os.path.getsize(source_path)
+    print(f"✅ Wrote {output_path}")
+    print(
+        f"   📏 {manifest['size_bytes'] / 1e6:.1f} MB "
+        f"(full database: {source_size / 1e6:.1f} MB)"
+    )
+    print(f"   🔐 SHA-256: {manifest['sha256']}")
+    for table_name, info in manifest["tables"].items():
+        print(f"   • {table_name}: {info['row_count']} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,8 @@ This script sets up the complete environment for practicing SQL with any week/da
 1. Creates or activates the virtual environment
 2. Installs dependencies
 3. Reads the chosen week's exercise file to determine the dataset
-4. Downloads the dataset from HuggingFace
+4. Installs a matching prebuilt database artifact, or downloads the dataset
+   from HuggingFace
 5. Creates the database tables using the defined table creation queries
 6. Starts the Flask practice app
 
@@ -17,6 +18,7 @@ Examples:
     python setup.py       # Uses Week 4 (default)
     python setup.py 5     # Uses Week 5
     SQL_WEEK=5 python setup.py  # Uses Week 5 via environment variable
+    python setup.py 5 --artifact-dir=/shared/sql-artifacts  # Prebuilt databases
 """
 
 import json
@@ -121,7 +123,8 @@ def setup_virtual_environment():
 
 def get_week_config():
     """Get week configuration from command line args or environment variables."""
-    force_recreate = True  # Default to True for setup script (fresh start)
+    force_recreate = False  # Tables are rebuilt only when their build manifest is stale
+    artifact_dir = None
     week = None
 
     # Parse command line arguments
@@ -130,6 +133,8 @@ def get_week_config():
             force_recreate = False  # Don't recreate tables if this flag is present
         elif arg == "--force":
             force_recreate = True  # Explicitly recreate tables
+        elif arg.startswith("--artifact-dir="):
+            artifact_dir = arg.split("=", 1)[1]  # Extra prebuilt database location
         elif arg.startswith("--"):
             continue  # Skip other options
         else:
@@ -149,7 +154,7 @@ def get_week_config():
             )
             week = 4
 
-    return week, force_recreate
+    return week, force_recreate, artifact_dir
 
 
 def find_exercise_file(week):
@@ -195,18 +200,16 @@ def load_exercise_metadata(exercise_file):
     }
 
 
-def setup_environment(week, force_recreate=False):
+def setup_environment(week, force_recreate=False, artifact_dir=None):
     """Complete environment setup for the given week."""
     print(f"🚀 Setting up SQL Study Group environment for Week {week}")
     if force_recreate:
         print("🔄 Fresh setup mode: existing tables will be recreated for clean start")
     else:
         print(
-            "📋 Preserve mode: existing tables will be kept (use --keep-tables to preserve)"
+            "📋 Incremental mode: only tables whose query or source data changed are rebuilt"
         )
-    print(
-        "💡 Tip: Use --keep-tables to preserve existing data, or --force to ensure fresh tables"
-    )
+    print("💡 Tip: Use --force to rebuild every table")
     print("=" * 60)
 
     # Step 1: Find and load exercise file
@@ -248,6 +251,19 @@ def setup_environment(week, force_recreate=False):
     # Create datasets directory if it doesn't exist
     Path("datasets").mkdir(exist_ok=True)
 
+    if not db_path.exists() and not force_recreate:
+        # A prebuilt artifact skips the download and every table build
+        from scripts.utilities.database_artifacts import (
+            artifact_dirs,
+            install_database,
+        )
+
+        print("🔍 Looking for a prebuilt database artifact...")
+        if not install_database(
+            metadata["dataset_name"], str(db_path), artifact_dirs(artifact_dir)
+        ):
+            print("💡 No matching artifact, building the database instead")
+
     if not db_path.exists():
         print("📥 Database not found, creating from HuggingFace dataset...")
         try:
@@ -264,7 +280,9 @@ def setup_environment(week, force_recreate=False):
             )
             print(f"📥 Downloading dataset: {hf_dataset}")
 
-            explorer = DatasetExplorer(hf_dataset)
+            # The duckdb engine keeps the Arrow table and streams it into the
+            # database without a pandas copy
+            explorer = DatasetExplorer(hf_dataset, engine="duckdb")
             if not explorer.load_dataset():
                 print("❌ Failed to load dataset")
                 return False
@@ -407,8 +425,10 @@ def main():
         print(__doc__)
         print("Environment Variables:")
         print("  SQL_WEEK=N    Set week number (default: 4)")
+        print("  SQL_ARTIFACT_DIR=DIR  Shared prebuilt database artifacts")
         print("\nOptions:")
-        print("  --force       Recreate database tables if they already exist")
+        print("  --force       Recreate database tables even if they are up to date")
+        print("  --artifact-dir=DIR  Install matching prebuilt databases from DIR")
         print(
             "\nThis script will automatically detect the dataset from exercise metadata."
         )
@@ -425,11 +445,11 @@ def main():
         return
 
     # Now proceed with the actual setup
-    week, force_recreate = get_week_config()
+    week, force_recreate, artifact_dir = get_week_config()
     if week is None:  # Help was requested (shouldn't happen here)
         return
 
-    success = setup_environment(week, force_recreate)
+    success = setup_environment(week, force_recreate, artifact_dir)
     if not success:
         sys.exit(1)
 